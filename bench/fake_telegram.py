@@ -0,0 +1,389 @@
+"""
+Backend do Telegram falso, em memoria, para medir o Cloner sem conta real.
+
+FakeTelegram e um pyrogram.Client que nunca conecta: as chamadas que o
+Cloner e o TelegramClient fazem (historico, copy/send_*, resolve_peer,
+invoke de ForwardMessages, get_dialogs, download/upload de midia) sao
+respondidas com objetos raw de verdade, entao o parse do Pyrogram roda como
+em producao. Latencia, FloodWait, conteudo protegido e tamanho das midias
+sao configuraveis.
+"""
+import asyncio
+import math
+import os
+import random
+import time
+from collections import Counter
+from pyrogram import Client, raw, types
+from pyrogram.enums import ChatType
+from pyrogram.errors import ChatForwardsRestricted, FloodWait, PeerIdInvalid
+
+# Ids de midia carregam o canal de origem: (indice do canal << MEDIA_SHIFT) | id da mensagem
+MEDIA_SHIFT = 32
+
+# Albuns sinteticos ocupam blocos fixos de ids (ate o limite de 10 itens do Telegram)
+ALBUM_SIZE = 10
+
+# Data da mensagem de origem: BASE_DATE + id * DATE_STEP (permite testar recortes por data)
+BASE_DATE = 1_700_000_000
+DATE_STEP = 60
+
+# Filtro do messages.Search -> tipos aceitos
+SEARCH_FILTERS = {
+    raw.types.InputMessagesFilterPhotos: {"photo"},
+    raw.types.InputMessagesFilterVideo: {"video"},
+    raw.types.InputMessagesFilterPhotoVideo: {"photo", "video"},
+}
+
+# Pedacos de download (stream_media) e de upload (save_file), como no Pyrogram
+DOWNLOAD_CHUNK = 1024 * 1024
+UPLOAD_PART = 512 * 1024
+
+
+class FakeChannel:
+    """
+    Canal sintetico. As mensagens de origem sao geradas sob demanda a partir
+    do id (nada fica na memoria); as recebidas ficam numa lista compacta.
+    """
+
+    def __init__(self, index, title, size=0, media_ratio=0.3, protected=False, album_ratio=0.0):
+        self.index = index
+        self.channel_id = 1_000_000_000 + index
+        self.chat_id = -1_000_000_000_000 - self.channel_id
+        self.access_hash = index * 7919
+        self.title = title
+        self.size = size
+        self.media_ratio = media_ratio
+        self.protected = protected
+        self.album_ratio = album_ratio  # Fracao dos blocos de ALBUM_SIZE ids que sao albuns
+        self.received = []  # (texto, media_id, tipo, album) das mensagens enviadas para ca
+        # id -> classe de erro que o ForwardMessages levanta com essa mensagem no lote
+        self.forward_errors = {}
+
+    @property
+    def last_id(self):
+        return self.size + len(self.received)
+
+    def album_of(self, msg_id):
+        """Id do album (grouped_id) da mensagem de origem, ou None."""
+        block = (msg_id - 1) // ALBUM_SIZE
+        if random.Random(self.index * 7_000_003 + block).random() < self.album_ratio:
+            return self.index * 1_000_000 + block + 1
+        return None
+
+    def kind_of(self, msg_id):
+        """Tipo deterministico da mensagem de origem: text, photo ou video."""
+        r = random.Random(self.index * 1_000_003 + msg_id).random()
+        if self.album_of(msg_id):
+            return "photo" if r < 0.7 else "video"
+        if r < self.media_ratio * 0.7:
+            return "photo"
+        if r < self.media_ratio:
+            return "video"
+        return "text"
+
+    def raw_channel(self):
+        return raw.types.Channel(
+            id=self.channel_id,
+            title=self.title,
+            photo=raw.types.ChatPhotoEmpty(),
+            date=0,
+            access_hash=self.access_hash,
+            broadcast=True,
+            noforwards=self.protected,
+            restriction_reason=[],
+        )
+
+    def input_peer(self):
+        return raw.types.InputPeerChannel(channel_id=self.channel_id, access_hash=self.access_hash)
+
+
+def _raw_media(kind, media_id, size):
+    if kind == "photo":
+        return raw.types.MessageMediaPhoto(
+            photo=raw.types.Photo(
+                id=media_id, access_hash=media_id, file_reference=b"", date=0, dc_id=2,
+                sizes=[raw.types.PhotoSize(type="y", w=1280, h=720, size=size)],
+            )
+        )
+    if kind == "video":
+        return raw.types.MessageMediaDocument(
+            document=raw.types.Document(
+                id=media_id, access_hash=media_id, file_reference=b"", date=0, dc_id=2,
+                mime_type="video/mp4", size=size, thumbs=[],
+                attributes=[
+                    raw.types.DocumentAttributeVideo(duration=30, w=1280, h=720),
+                    raw.types.DocumentAttributeFilename(file_name=f"video_{media_id}.mp4"),
+                ],
+            )
+        )
+    return None
+
+
+class FakeTelegram(Client):
+    """
+    Client falso com canais sinteticos.
+
+    latency: segundos por chamada (mais `jitter` aleatorio).
+    flood_every: a cada N envios, um FloodWait de `flood_seconds` (0 desliga).
+    photo_size / video_size: bytes das midias sinteticas (o download gera esse volume).
+    calls: Counter com o numero de chamadas por tipo, para medir chamadas/mensagem.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, flood_every=0, flood_seconds=1,
+                 photo_size=200_000, video_size=5_000_000):
+        super().__init__("fake_telegram", api_id=1, api_hash="fake", in_memory=True, no_updates=True)
+        self.latency = latency
+        self.jitter = jitter
+        self.flood_every = flood_every
+        self.flood_seconds = flood_seconds
+        self.media_sizes = {"photo": photo_size, "video": video_size}
+        self.calls = Counter()
+        self.channels = {}  # chat_id -> FakeChannel
+        self._by_channel_id = {}
+        self._by_index = {}
+        self._sends = 0
+        self._pts = 0
+        self._uploads = 0
+        self._albums = 0
+        self.is_initialized = True
+
+    # --- Montagem do cenario ---
+
+    def add_channel(self, title, size=0, media_ratio=0.3, protected=False, album_ratio=0.0):
+        channel = FakeChannel(len(self.channels) + 1, title, size, media_ratio, protected, album_ratio)
+        self.channels[channel.chat_id] = channel
+        self._by_channel_id[channel.channel_id] = channel
+        self._by_index[channel.index] = channel
+        return channel
+
+    def _channel(self, chat_id):
+        if isinstance(chat_id, (raw.types.InputPeerChannel, raw.types.InputChannel, raw.types.PeerChannel)):
+            channel = self._by_channel_id.get(chat_id.channel_id)
+        else:
+            channel = self.channels.get(chat_id)
+        if channel is None:
+            raise PeerIdInvalid()
+        return channel
+
+    async def _delay(self, name):
+        self.calls[name] += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + random.random() * self.jitter)
+
+    # --- Mensagens sinteticas ---
+
+    def _raw_message(self, channel, msg_id):
+        if msg_id <= channel.size:
+            kind = channel.kind_of(msg_id)
+            media_id = (channel.index << MEDIA_SHIFT) | msg_id
+            text = f"Mensagem {msg_id} de {channel.title}"
+            album = channel.album_of(msg_id)
+            date = BASE_DATE + msg_id * DATE_STEP
+        else:
+            text, media_id, kind, album = channel.received[msg_id - channel.size - 1]
+            date = int(time.time())
+        return raw.types.Message(
+            id=msg_id,
+            peer_id=raw.types.PeerChannel(channel_id=channel.channel_id),
+            date=date,
+            message=text,
+            entities=[],
+            post=True,
+            noforwards=channel.protected or None,
+            grouped_id=album,
+            media=_raw_media(kind, media_id, self.media_sizes.get(kind, 0)),
+        )
+
+    def _store(self, channel, text, media_id, kind, album=None):
+        channel.received.append((text, media_id, kind, album))
+        return self._raw_message(channel, channel.last_id)
+
+    def _source_of_media(self, media_id):
+        return self._by_index.get(media_id >> MEDIA_SHIFT)
+
+    async def _count_send(self):
+        self._sends += 1
+        if self.flood_every and self._sends % self.flood_every == 0:
+            raise FloodWait(value=self.flood_seconds)
+
+    def _updates(self, channel, sent, random_ids):
+        updates = []
+        for message, random_id in zip(sent, random_ids):
+            self._pts += 1
+            updates.append(raw.types.UpdateMessageID(id=message.id, random_id=random_id))
+            updates.append(raw.types.UpdateNewChannelMessage(message=message, pts=self._pts, pts_count=1))
+        return raw.types.Updates(updates=updates, users=[], chats=[channel.raw_channel()], date=int(time.time()), seq=0)
+
+    # --- Superficie do Client usada pelo Cloner / TelegramClient ---
+
+    async def resolve_peer(self, peer_id):
+        # No Pyrogram real vem do storage local, sem chamada de API
+        return self._channel(peer_id).input_peer()
+
+    async def get_chat(self, chat_id):
+        await self._delay("get_chat")
+        channel = self._channel(chat_id)
+        return types.Chat(
+            id=channel.chat_id,
+            type=ChatType.CHANNEL,
+            title=channel.title,
+            has_protected_content=channel.protected,
+            client=self,
+        )
+
+    async def get_chat_history_count(self, chat_id):
+        await self._delay("get_chat_history_count")
+        return self._channel(chat_id).last_id
+
+    async def get_dialogs(self, limit=0):
+        ordered = sorted(self.channels.values(), key=lambda c: c.last_id, reverse=True)
+        for i, channel in enumerate(ordered):
+            if limit and i >= limit:
+                return
+            if i % 100 == 0:
+                await self._delay("get_dialogs")
+            chat = types.Chat(id=channel.chat_id, type=ChatType.CHANNEL, title=channel.title, client=self)
+            top = types.Message(id=channel.last_id, chat=chat) if channel.last_id else None
+            yield types.Dialog(
+                chat=chat, top_message=top, unread_messages_count=0, unread_mentions_count=0,
+                unread_mark=False, is_pinned=False, client=self,
+            )
+
+    async def stream_media(self, message, limit=0, offset=0):
+        # Download em pedacos de 1 MiB; conteudo protegido pode ser baixado
+        media = getattr(message, message.media.value)
+        remaining = media.file_size
+        while remaining > 0:
+            await self._delay("GetFile")
+            size = min(DOWNLOAD_CHUNK, remaining)
+            remaining -= size
+            yield bytes(size)
+
+    async def save_file(self, path, file_id=None, file_part=0, progress=None, progress_args=()):
+        if path is None:
+            return None
+        size = os.path.getsize(path)
+        parts = max(1, math.ceil(size / UPLOAD_PART))
+        with open(path, "rb") as f:
+            while f.read(UPLOAD_PART):
+                await self._delay("SaveFilePart")
+        file_id = file_id or random.getrandbits(63)
+        if size > 10 * 1024 * 1024:
+            return raw.types.InputFileBig(id=file_id, parts=parts, name=os.path.basename(path))
+        return raw.types.InputFile(id=file_id, parts=parts, name=os.path.basename(path), md5_checksum="")
+
+    async def invoke(self, query, *args, **kwargs):
+        name = type(query).__name__
+        await self._delay(name)
+        handler = getattr(self, f"_invoke_{name}", None)
+        if handler is None:
+            raise NotImplementedError(f"FakeTelegram nao implementa {name}")
+        return await handler(query)
+
+    async def _invoke_GetHistory(self, q):
+        channel = self._channel(q.peer)
+        # Mesma semantica usada pelo HistoryReader: offset_id + add_offset negativo
+        start = max(q.min_id + 1, q.offset_id + q.add_offset) if q.offset_id else max(1, channel.last_id - q.limit + 1)
+        end = min(channel.last_id, start + q.limit - 1)
+        if q.max_id:
+            end = min(end, q.max_id - 1)
+        messages = [self._raw_message(channel, i) for i in range(end, start - 1, -1)]
+        return raw.types.messages.Messages(messages=messages, chats=[channel.raw_channel()], users=[])
+
+    def _matches(self, channel, msg_id, q):
+        if q.min_date and BASE_DATE + msg_id * DATE_STEP < q.min_date:
+            return False
+        if q.max_date and BASE_DATE + msg_id * DATE_STEP > q.max_date:
+            return False
+        kinds = SEARCH_FILTERS.get(type(q.filter))
+        if kinds is None and not isinstance(q.filter, raw.types.InputMessagesFilterEmpty):
+            raise NotImplementedError(f"FakeTelegram nao implementa o filtro {type(q.filter).__name__}")
+        if kinds and channel.kind_of(msg_id) not in kinds:
+            return False
+        return not q.q or q.q.lower() in f"Mensagem {msg_id} de {channel.title}".lower()
+
+    async def _invoke_Search(self, q):
+        # So as mensagens de origem; mesma paginacao do GetHistory (offset_id + add_offset negativo)
+        channel = self._channel(q.peer)
+        last = min(channel.size, q.max_id - 1) if q.max_id else channel.size
+        start = max(q.min_id + 1, q.offset_id + q.add_offset if q.offset_id else 1)
+        matching = [i for i in range(max(1, q.min_id + 1), last + 1) if self._matches(channel, i, q)]
+        if q.offset_id:
+            page = [i for i in matching if i >= start][:q.limit]
+        else:
+            page = matching[-q.limit:] if q.limit else []
+        messages = [self._raw_message(channel, i) for i in reversed(page)]
+        return raw.types.messages.MessagesSlice(
+            count=len(matching), messages=messages, chats=[channel.raw_channel()], users=[]
+        )
+
+    async def _invoke_GetMessages(self, q):
+        channel = self._channel(q.channel)
+        messages = [
+            self._raw_message(channel, m.id) if 0 < m.id <= channel.last_id else raw.types.MessageEmpty(id=m.id)
+            for m in q.id
+        ]
+        return raw.types.messages.Messages(messages=messages, chats=[channel.raw_channel()], users=[])
+
+    async def _invoke_ForwardMessages(self, q):
+        source = self._channel(q.from_peer)
+        dest = self._channel(q.to_peer)
+        if source.protected:
+            raise ChatForwardsRestricted()
+        for msg_id in q.id:
+            if msg_id in source.forward_errors:
+                raise source.forward_errors[msg_id]()
+        await self._count_send()
+        sent = []
+        for msg_id in q.id:
+            original = self._raw_message(source, msg_id)
+            kind = source.kind_of(msg_id) if msg_id <= source.size else "text"
+            media_id = (source.index << MEDIA_SHIFT) | msg_id if kind != "text" else 0
+            sent.append(self._store(dest, original.message, media_id, kind, original.grouped_id))
+        return self._updates(dest, sent, q.random_id)
+
+    async def _invoke_SendMessage(self, q):
+        dest = self._channel(q.peer)
+        await self._count_send()
+        return self._updates(dest, [self._store(dest, q.message, 0, "text")], [q.random_id])
+
+    async def _invoke_SendMedia(self, q):
+        dest = self._channel(q.peer)
+        media_id, kind = self._input_media(dest, q.media)
+        await self._count_send()
+        return self._updates(dest, [self._store(dest, q.message, media_id, kind)], [q.random_id])
+
+    def _input_media(self, dest, media):
+        """(media_id, tipo) de uma midia de envio; conteudo protegido e recusado."""
+        if isinstance(media, raw.types.InputMediaPhoto):
+            media_id, kind = media.id.id, "photo"
+        elif isinstance(media, raw.types.InputMediaDocument):
+            media_id, kind = media.id.id, "video"
+        elif isinstance(media, (raw.types.InputMediaUploadedPhoto, raw.types.InputMediaUploadedDocument)):
+            # Arquivo novo: a midia passa a pertencer ao destino, sem restricao
+            kind = "photo" if isinstance(media, raw.types.InputMediaUploadedPhoto) else "video"
+            media_id = (dest.index << MEDIA_SHIFT) | (dest.last_id + 1)
+        else:
+            raise NotImplementedError(f"FakeTelegram nao implementa midia {type(media).__name__}")
+        source = self._source_of_media(media_id)
+        if source is not None and source.protected:
+            raise ChatForwardsRestricted()
+        return media_id, kind
+
+    async def _invoke_UploadMedia(self, q):
+        # Midia subida sem mensagem (itens de album): ids fora dos canais (indice 0)
+        self._uploads += 1
+        kind = "photo" if isinstance(q.media, raw.types.InputMediaUploadedPhoto) else "video"
+        return _raw_media(kind, self._uploads, self.media_sizes[kind])
+
+    async def _invoke_SendMultiMedia(self, q):
+        dest = self._channel(q.peer)
+        items = [self._input_media(dest, single.media) for single in q.multi_media]
+        await self._count_send()
+        self._albums += 1
+        sent = [
+            self._store(dest, single.message, media_id, kind, self._albums)
+            for single, (media_id, kind) in zip(q.multi_media, items)
+        ]
+        return self._updates(dest, sent, [single.random_id for single in q.multi_media])
@@ -0,0 +1,163 @@
+"""
+Benchmarks de vazao do Cloner contra o FakeTelegram (sem conta real).
+
+    python -m bench.run_benchmarks                      # todos os cenarios
+    python -m bench.run_benchmarks texto_lote misto_lote  # so alguns
+    python -m bench.run_benchmarks --save atual.json
+    python -m bench.run_benchmarks --compare base.json  # acusa regressoes
+
+Para cada cenario: mensagens/s, chamadas de API por mensagem e pico de
+memoria (tracemalloc) do clone_chat.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from bench.fake_telegram import FakeTelegram
+from src.core.cloner import Cloner
+from src.core.dedup import DedupIndex
+from src.core.filters import CloneFilter
+from src.core.journal import CloneJournal
+from src.core.media_cache import MediaCache
+from src.core.ratelimit import RateLimiter
+from src.utils.logger import get_logger
+
+# Variacao tolerada antes de acusar regressao no --compare
+REGRESSION_THRESHOLD = 0.10
+
+# Limites altos: o benchmark mede o codigo, nao o rate limiter
+UNLIMITED_RATE = 1_000_000.0
+
+SCENARIOS = {
+    "texto_lote": dict(size=5000, media_ratio=0.0, batch=True),
+    "misto_lote": dict(size=5000, media_ratio=0.4, batch=True),
+    "misto_individual": dict(size=2000, media_ratio=0.4, batch=False),
+    # Origem protegida: midias baixadas e enviadas de novo (reupload)
+    "protegido": dict(size=1000, media_ratio=0.4, protected=True, video_size=1_000_000),
+    # Dois destinos: cada midia e baixada uma vez so (cache de midia)
+    "protegido_2_destinos": dict(size=500, media_ratio=0.4, protected=True, video_size=1_000_000, destinations=2),
+    # Metade dos blocos de 10 ids sao albuns: um envio por album
+    "albuns_individual": dict(size=2000, media_ratio=0.4, batch=False, album_ratio=0.5),
+    "albuns_protegido": dict(size=500, media_ratio=0.4, protected=True, video_size=1_000_000, album_ratio=0.5),
+    # So videos: o messages.Search traz apenas eles, o resto nem e buscado
+    "filtro_video": dict(size=5000, media_ratio=0.4, batch=True, filters=dict(media_types={"video"})),
+    "floodwait": dict(size=1000, media_ratio=0.4, batch=False, flood_every=200),
+    "latencia_5ms": dict(size=1000, media_ratio=0.4, batch=True, latency=0.005),
+}
+
+
+async def run_scenario(name, size, media_ratio=0.3, batch=True, protected=False,
+                       latency=0.0, flood_every=0, dedup=False, video_size=5_000_000, destinations=1,
+                       album_ratio=0.0, filters=None):
+    fake = FakeTelegram(latency=latency, flood_every=flood_every, flood_seconds=1, video_size=video_size)
+    origin = fake.add_channel(
+        f"origem_{name}", size=size, media_ratio=media_ratio, protected=protected, album_ratio=album_ratio
+    )
+    dests = [fake.add_channel(f"destino_{name}_{i}") for i in range(destinations)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cloner = Cloner(
+            fake,
+            rate_limiter=RateLimiter(text_rate=UNLIMITED_RATE, media_rate=UNLIMITED_RATE),
+            journal=CloneJournal(os.path.join(tmp, "journal.db")),
+            dedup_index=DedupIndex(os.path.join(tmp, "dedup.db")),
+            media_cache=MediaCache(os.path.join(tmp, "media_cache")),
+        )
+        cloner.use_batch_forward = batch
+        cloner.deduplicate = dedup
+        cloner.filters = CloneFilter(**filters) if filters else None
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        if destinations > 1:
+            await cloner.clone_to_many(origin.chat_id, [d.chat_id for d in dests])
+        else:
+            await cloner.clone_chat(origin.chat_id, dests[0].chat_id)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        cloner.journal.close()
+        cloner.dedup_index.close()
+        cloner.media_cache.close()
+
+    copied = cloner.result["copied"]
+    api_calls = sum(fake.calls.values())
+    return {
+        "messages": size * destinations,
+        "copied": copied,
+        "seconds": round(elapsed, 3),
+        "messages_per_second": round(copied / elapsed, 1) if elapsed else 0.0,
+        "api_calls_per_message": round(api_calls / copied, 3) if copied else None,
+        "peak_memory_mb": round(peak / 2**20, 2),
+        "calls": dict(fake.calls),
+    }
+
+
+def compare(results, baseline):
+    """Lista de regressoes alem de REGRESSION_THRESHOLD em relacao ao baseline."""
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if r["messages_per_second"] < base["messages_per_second"] * (1 - REGRESSION_THRESHOLD):
+            regressions.append(f"{name}: msgs/s {base['messages_per_second']} -> {r['messages_per_second']}")
+        for key in ("api_calls_per_message", "peak_memory_mb"):
+            if base.get(key) and r.get(key) and r[key] > base[key] * (1 + REGRESSION_THRESHOLD):
+                regressions.append(f"{name}: {key} {base[key]} -> {r[key]}")
+    return regressions
+
+
+def print_table(results):
+    print(f"{'cenario':<18} {'msgs':>6} {'copiadas':>8} {'s':>8} {'msgs/s':>9} {'api/msg':>8} {'pico MB':>8}")
+    for name, r in results.items():
+        print(
+            f"{name:<18} {r['messages']:>6} {r['copied']:>8} {r['seconds']:>8} "
+            f"{r['messages_per_second']:>9} {r['api_calls_per_message'] or '-':>8} {r['peak_memory_mb']:>8}"
+        )
+
+
+async def main_async(names):
+    results = {}
+    for name in names:
+        results[name] = await run_scenario(name, **SCENARIOS[name])
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do Cloner com o Telegram falso")
+    parser.add_argument("scenarios", nargs="*", help=f"Cenarios (padrao: todos): {', '.join(SCENARIOS)}")
+    parser.add_argument("--save", help="Grava os resultados em JSON")
+    parser.add_argument("--compare", help="JSON de uma execucao anterior para detectar regressoes")
+    args = parser.parse_args(argv)
+    unknown = [n for n in args.scenarios if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"cenario desconhecido: {', '.join(unknown)}")
+
+    # Log por mensagem distorce a medida
+    get_logger().setLevel(logging.WARNING)
+
+    results = asyncio.run(main_async(args.scenarios or list(SCENARIOS)))
+    print_table(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f))
+        for line in regressions:
+            print(f"REGRESSAO {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
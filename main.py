@@ -1,7 +1,11 @@
+from src.utils.startup import startup_timer
 import flet as ft
+startup_timer.mark("import do Flet")
 from src.ui.app import DarkoGramApp
+startup_timer.mark("import da interface")
 
 def main(page: ft.Page):
+    startup_timer.mark("janela aberta")
     app = DarkoGramApp(page)
 
 if __name__ == "__main__":
@@ -0,0 +1,231 @@
+"""
+Modo linha de comando do DarkoGram: clona sem interface grafica, para
+servidores e cron. Nao importa o Flet.
+
+    python cli.py ORIGEM DESTINO [DESTINO ...] [--rate N] [--media-rate N]
+                  [--no-resume] [--dedup] [--retry-failed] [--json]
+                  [--min-id N] [--max-id N] [--since AAAA-MM-DD] [--until AAAA-MM-DD]
+                  [--types photo,video] [--keyword TEXTO] [--regex EXPR]
+
+Usa a sessao ja autenticada pela interface (telegram_clone_session).
+"""
+import argparse
+import asyncio
+import json
+import signal
+import time
+from datetime import datetime, timedelta
+from src.core.filters import MEDIA_TYPES, CloneFilter
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+# Codigos de saida
+EXIT_OK = 0
+EXIT_PARTIAL = 1  # Terminou, mas algumas mensagens falharam
+EXIT_USAGE = 2  # Argumentos invalidos (mesmo codigo do argparse)
+EXIT_AUTH = 3  # Credenciais ausentes ou sessao sem login
+EXIT_ERROR = 4  # Erro critico durante a clonagem
+EXIT_CANCELLED = 130
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="darkogram",
+        description="Clona mensagens de um canal do Telegram para um ou mais destinos.",
+    )
+    parser.add_argument("origin", type=int, help="ID do canal de origem")
+    parser.add_argument("destinations", type=int, nargs="+", help="ID(s) do(s) canal(is) de destino")
+    parser.add_argument("--rate", type=float, default=2.0, help="Envios de texto por segundo (padrao: 2.0)")
+    parser.add_argument("--media-rate", type=float, default=1.0, help="Envios de midia por segundo (padrao: 1.0)")
+    parser.add_argument("--no-resume", action="store_true", help="Recomeca do zero, ignorando o diario")
+    parser.add_argument("--dedup", action="store_true", help="Pula conteudo que ja existe no destino")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="So reprocessa a fila de falhas de execucoes anteriores")
+    parser.add_argument("--json", action="store_true", help="Saida em JSON lines (um evento por linha)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Porta local das metricas Prometheus (padrao: METRICS_PORT; 0 desliga)")
+
+    recorte = parser.add_argument_group("recorte", "Clona so parte da origem (filtrado no servidor quando possivel)")
+    recorte.add_argument("--min-id", type=int, help="Primeiro id de mensagem (inclusivo)")
+    recorte.add_argument("--max-id", type=int, help="Ultimo id de mensagem (inclusivo)")
+    recorte.add_argument("--since", type=_date, help="Desde esta data (AAAA-MM-DD)")
+    recorte.add_argument("--until", type=_date, help="Ate esta data, inclusive (AAAA-MM-DD)")
+    recorte.add_argument("--types", type=_media_types,
+                         help=f"Tipos separados por virgula: {','.join(MEDIA_TYPES)}")
+    recorte.add_argument("--keyword", help="Palavra-chave no texto ou legenda")
+    recorte.add_argument("--regex", help="Expressao regular no texto ou legenda")
+    return parser
+
+
+def _date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"data invalida: {value} (use AAAA-MM-DD)")
+
+
+def _media_types(value):
+    types = {t.strip() for t in value.split(",") if t.strip()}
+    unknown = types - set(MEDIA_TYPES)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"tipos desconhecidos: {', '.join(sorted(unknown))}")
+    return types
+
+
+def build_filter(args):
+    """CloneFilter dos argumentos de recorte, ou None se nenhum foi passado."""
+    clone_filter = CloneFilter(
+        min_id=args.min_id,
+        max_id=args.max_id,
+        date_from=args.since,
+        # --until e o dia inteiro
+        date_to=args.until + timedelta(days=1, seconds=-1) if args.until else None,
+        media_types=args.types,
+        keyword=args.keyword,
+        regex=args.regex,
+    )
+    return clone_filter if clone_filter.active else None
+
+
+class Reporter:
+    """Escreve progresso e log no stdout, como texto ou JSON lines."""
+
+    def __init__(self, as_json=False):
+        self.as_json = as_json
+        self._last_percent = {}
+
+    def emit(self, event, **fields):
+        if self.as_json:
+            print(json.dumps({"event": event, "time": round(time.time(), 3), **fields}, ensure_ascii=False), flush=True)
+
+    async def log(self, mensagem, nivel="info"):
+        if self.as_json:
+            self.emit("log", level=nivel, message=mensagem)
+        else:
+            print(f"[{nivel.upper()}] {mensagem}", flush=True)
+
+    async def progress(self, current, total, destination=None):
+        if self.as_json:
+            self.emit("progress", destination=destination, current=current, total=total)
+            return
+        # Em texto, uma linha por ponto percentual para nao poluir logs de cron
+        percent = int(current * 100 / total) if total else 100
+        if self._last_percent.get(destination) != percent:
+            self._last_percent[destination] = percent
+            prefix = f"[{destination}] " if destination is not None else ""
+            print(f"{prefix}{current}/{total} ({percent}%)", flush=True)
+
+    def result(self, result, code):
+        if self.as_json:
+            self.emit("result", exit_code=code, **result)
+        else:
+            print(
+                f"Resultado: copiadas={result['copied']} falhas={result['failed']} "
+                f"puladas={result['skipped']} codigo={code}",
+                flush=True,
+            )
+
+
+def exit_code_for(result):
+    if result is None or result["error"]:
+        return EXIT_ERROR
+    if result["cancelled"]:
+        return EXIT_CANCELLED
+    if result["failed"]:
+        return EXIT_PARTIAL
+    return EXIT_OK
+
+
+async def run(args, reporter):
+    # Imports de rede so aqui: --help e erros de argumento saem sem carregar o Pyrogram
+    from src.core.client import TelegramClient
+    from src.core.cloner import Cloner
+    from src.core.metrics import MetricsExporter, get_metrics
+    from src.core.ratelimit import RateLimiter
+    from src.utils.config import METRICS_PORT, METRICS_SNAPSHOT_INTERVAL
+
+    try:
+        client = TelegramClient()
+    except ValueError as e:
+        await reporter.log(str(e), "error")
+        return EXIT_AUTH
+
+    me = await client.try_connect()
+    if not me:
+        await reporter.log("Sessao sem login. Faca o login uma vez pela interface (python main.py).", "error")
+        await client.disconnect()
+        return EXIT_AUTH
+
+    exporter = MetricsExporter(
+        get_metrics(),
+        port=METRICS_PORT if args.metrics_port is None else args.metrics_port,
+        interval=METRICS_SNAPSHOT_INTERVAL,
+    )
+    await exporter.start()
+
+    try:
+        cloner = Cloner(client.app, rate_limiter=RateLimiter(text_rate=args.rate, media_rate=args.media_rate))
+        cloner.deduplicate = args.dedup
+        cloner.filters = args.clone_filter
+
+        pool = await client.start_pool()
+        if pool.healthy_count > 1:
+            cloner.pool = pool
+            await reporter.log(f"Pool de envio com {pool.healthy_count} sessoes")
+
+        # Ctrl+C / SIGTERM param com o diario gravado, permitindo retomar depois
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, cloner.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        resume_job = not args.no_resume
+        if args.retry_failed:
+            results = []
+            for destination in args.destinations:
+                await cloner.retry_failed(args.origin, destination, log_callback=reporter.log)
+                results.append(cloner.result)
+            cloner.result = cloner.merge_results(results)
+        elif len(args.destinations) > 1:
+            await cloner.clone_to_many(
+                args.origin,
+                args.destinations,
+                progress_callback=reporter.progress,
+                log_callback=reporter.log,
+                resume_job=resume_job,
+            )
+        else:
+            await cloner.clone_chat(
+                args.origin,
+                args.destinations[0],
+                progress_callback=reporter.progress,
+                log_callback=reporter.log,
+                resume_job=resume_job,
+            )
+
+        code = exit_code_for(cloner.result)
+        reporter.result(cloner.result or {"copied": 0, "failed": 0, "skipped": 0}, code)
+        return code
+    finally:
+        await exporter.stop()
+        await client.disconnect()
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.clone_filter = build_filter(args)
+    except ValueError as e:
+        parser.error(str(e))
+    reporter = Reporter(as_json=args.json)
+    try:
+        return asyncio.run(run(args, reporter))
+    except KeyboardInterrupt:
+        return EXIT_CANCELLED
+    except Exception as e:
+        logger.error(f"Erro no modo linha de comando: {e}")
+        return EXIT_ERROR
@@ -0,0 +1,153 @@
+from pyrogram import Client, raw, utils
+from pyrogram.enums import ParseMode
+from src.core.reupload import media_of
+
+# Tipos de midia que o Telegram aceita num album
+ALBUM_ATTRS = ("photo", "video", "audio", "document")
+
+
+def group_albums(messages):
+    """Agrupa mensagens consecutivas do mesmo album (media_group_id); as demais ficam sozinhas."""
+    groups = []
+    for msg in messages:
+        if msg.media_group_id and groups and groups[-1][-1].media_group_id == msg.media_group_id:
+            groups[-1].append(msg)
+        else:
+            groups.append([msg])
+    return groups
+
+
+def album_batches(messages, size):
+    """Fatias de ate `size` mensagens sem cortar album no meio."""
+    batches = []
+    batch = []
+    for group in group_albums(messages):
+        if batch and len(batch) + len(group) > size:
+            batches.append(batch)
+            batch = []
+        batch.extend(group)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def album_split_point(messages):
+    """Posicao mais perto do meio onde da para dividir sem cortar album (o meio, se nao houver)."""
+    middle = len(messages) // 2
+    edges = []
+    position = 0
+    for group in group_albums(messages)[:-1]:
+        position += len(group)
+        edges.append(position)
+    if not edges:
+        return middle
+    return min(edges, key=lambda edge: abs(edge - middle))
+
+
+async def whole_albums(pages):
+    """
+    Repassa as paginas do historico sem cortar albuns: o album que fecha
+    uma pagina segura e vai junto com a pagina seguinte.
+    """
+    held = []
+    async for page in pages:
+        page = held + list(page)
+        held = []
+        cut = len(page)
+        group = page[-1].media_group_id if page else None
+        if group:
+            while cut > 0 and page[cut - 1].media_group_id == group:
+                cut -= 1
+            held = page[cut:]
+            page = page[:cut]
+        if page:
+            yield page
+    if held:
+        yield held
+
+
+def albumable(msg):
+    return any(getattr(msg, attr, None) is not None for attr in ALBUM_ATTRS)
+
+
+async def upload_album_media(client: Client, peer, msg, path):
+    """
+    Sobe o arquivo local de um item de album (messages.UploadMedia) e
+    devolve a midia raw pronta para o SendMultiMedia, com os atributos
+    (duracao, dimensoes, nome) da mensagem original.
+    """
+    file = await client.save_file(path)
+    if msg.photo:
+        uploaded = await client.invoke(
+            raw.functions.messages.UploadMedia(peer=peer, media=raw.types.InputMediaUploadedPhoto(file=file))
+        )
+        photo = uploaded.photo
+        return raw.types.InputMediaPhoto(
+            id=raw.types.InputPhoto(id=photo.id, access_hash=photo.access_hash, file_reference=photo.file_reference)
+        )
+
+    media = media_of(msg)
+    attributes = []
+    if msg.video:
+        attributes.append(raw.types.DocumentAttributeVideo(
+            duration=media.duration or 0,
+            w=media.width or 0,
+            h=media.height or 0,
+            supports_streaming=media.supports_streaming or None,
+        ))
+    elif msg.audio:
+        attributes.append(raw.types.DocumentAttributeAudio(
+            duration=media.duration or 0,
+            performer=media.performer,
+            title=media.title,
+        ))
+    if getattr(media, "file_name", None):
+        attributes.append(raw.types.DocumentAttributeFilename(file_name=media.file_name))
+
+    uploaded = await client.invoke(
+        raw.functions.messages.UploadMedia(
+            peer=peer,
+            media=raw.types.InputMediaUploadedDocument(
+                mime_type=getattr(media, "mime_type", None) or "application/octet-stream",
+                file=file,
+                attributes=attributes,
+            ),
+        )
+    )
+    document = uploaded.document
+    return raw.types.InputMediaDocument(
+        id=raw.types.InputDocument(id=document.id, access_hash=document.access_hash, file_reference=document.file_reference)
+    )
+
+
+def input_media_from_message(msg, file_id=None):
+    """Midia raw do item pelo file_id (o da propria mensagem, por padrao)."""
+    return utils.get_input_media_from_file_id(file_id or media_of(msg).file_id)
+
+
+async def send_album(client: Client, peer, messages, media):
+    """
+    Envia o album numa unica chamada (messages.SendMultiMedia), com a
+    legenda e as entidades de cada mensagem. `media` e a midia raw de cada
+    item, na ordem de `messages`. Retorna as mensagens criadas, na ordem.
+
+    O send_media_group do Pyrogram reinterpreta a legenda como markdown e
+    descarta caption_entities, por isso o envio e montado aqui.
+    """
+    multi_media = []
+    for msg, item in zip(messages, media):
+        text = await utils.parse_text_entities(client, msg.caption or "", ParseMode.DISABLED, msg.caption_entities)
+        multi_media.append(raw.types.InputSingleMedia(media=item, random_id=client.rnd_id(), **text))
+
+    updates = await client.invoke(raw.functions.messages.SendMultiMedia(peer=peer, multi_media=multi_media))
+    return await utils.parse_messages(
+        client,
+        raw.types.messages.Messages(
+            messages=[
+                u.message for u in updates.updates
+                if isinstance(u, (raw.types.UpdateNewMessage, raw.types.UpdateNewChannelMessage))
+            ],
+            users=updates.users,
+            chats=updates.chats,
+        ),
+    )
@@ -0,0 +1,64 @@
+import json
+import os
+import time
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+CHANNEL_CACHE_FILE = "channels_cache_{account}.json"
+
+# Apos este intervalo a proxima atualizacao percorre todos os dialogos
+# (pega canais removidos ou que sairam da ordem por atividade)
+FULL_REFRESH_INTERVAL = 24 * 3600
+
+# Dialogos seguidos sem mudanca para encerrar a atualizacao incremental
+UNCHANGED_STREAK = 20
+
+
+class ChannelCache:
+    """
+    Lista de canais de uma conta guardada em disco, para o dashboard abrir
+    preenchido. Alem dos canais guarda o id da ultima mensagem de cada
+    dialogo: como o Telegram ordena os dialogos por atividade, a atualizacao
+    pode parar quando encontra uma sequencia de dialogos que nao mudaram.
+    """
+
+    def __init__(self, account_id, path=None):
+        self.path = path or CHANNEL_CACHE_FILE.format(account=account_id)
+        self.channels = {}  # id -> info, na ordem dos dialogos
+        self.tops = {}  # id do dialogo -> id da ultima mensagem
+        self.full_refresh_at = 0.0
+
+    def load(self):
+        """Le o cache do disco. Retorna a lista de canais (vazia se nao houver cache)."""
+        if not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.channels = {c["id"]: c for c in data.get("channels", [])}
+            self.tops = {int(k): v for k, v in data.get("tops", {}).items()}
+            self.full_refresh_at = data.get("full_refresh_at", 0.0)
+        except Exception as e:
+            logger.warning(f"Cache de canais invalido, ignorado: {e}")
+            self.channels, self.tops, self.full_refresh_at = {}, {}, 0.0
+        return list(self.channels.values())
+
+    @property
+    def needs_full_refresh(self):
+        return time.time() - self.full_refresh_at > FULL_REFRESH_INTERVAL
+
+    def save(self):
+        """Grava em arquivo temporario e troca, para nunca deixar um cache pela metade."""
+        data = {
+            "channels": list(self.channels.values()),
+            "tops": self.tops,
+            "full_refresh_at": self.full_refresh_at,
+        }
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            logger.error(f"Erro ao gravar cache de canais: {e}")
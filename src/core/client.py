@@ -1,9 +1,12 @@
 import asyncio
 import os
 import sqlite3
+import time
 from pyrogram import Client
 from pyrogram.enums import ChatType
-from src.utils.config import API_ID, API_HASH
+from src.core.channel_cache import ChannelCache, UNCHANGED_STREAK
+from src.core.pool import SessionPool
+from src.utils.config import API_ID, API_HASH, EXTRA_SESSIONS, require_credentials
 from src.utils.logger import get_logger
 
 logger = get_logger()
@@ -13,6 +16,7 @@ SESSION_NAME = "telegram_clone_session"
 
 class TelegramClient:
     def __init__(self):
+        require_credentials()
         self.app = Client(
             SESSION_NAME,
             api_id=API_ID,
@@ -20,10 +24,12 @@ class TelegramClient:
         )
         self.is_connected = False
         self.is_authorized = False
+        self.extra_clients = []
+        self.pool = None
 
-    def _has_valid_session(self):
+    def _has_valid_session(self, session_name=SESSION_NAME):
         """Verifica se existe uma sessao com usuario autenticado."""
-        session_file = f"{SESSION_NAME}.session"
+        session_file = f"{session_name}.session"
         if not os.path.exists(session_file):
             return False
         try:
@@ -40,7 +46,8 @@ class TelegramClient:
     async def try_connect(self):
         """Conecta ao Telegram. Retorna usuario se ja autenticado."""
 
-        has_session = self._has_valid_session()
+        # Consulta sqlite fora do event loop para nao travar a interface
+        has_session = await asyncio.to_thread(self._has_valid_session)
 
         if has_session:
             # Tem sessao valida, tenta start() para reautenticar
@@ -95,8 +102,41 @@ class TelegramClient:
                 except Exception as e:
                     logger.error(f"Erro ao remover {f}: {e}")
 
+    async def start_pool(self, budget=None):
+        """
+        Inicia as sessoes extras de EXTRA_SESSIONS e monta o pool de envio com
+        a sessao principal. Sessoes sem login valido sao ignoradas.
+        `budget` e o SendBudget ja usado pela conta principal (ex: o do
+        agendador); cada sessao extra ganha o seu.
+        """
+        pool = SessionPool()
+        pool.add(SESSION_NAME, self.app, budget)
+        for name in EXTRA_SESSIONS:
+            if not await asyncio.to_thread(self._has_valid_session, name):
+                logger.warning(f"Sessao extra '{name}' sem login valido, ignorada")
+                continue
+            client = Client(name, api_id=API_ID, api_hash=API_HASH)
+            try:
+                await client.start()
+            except Exception as e:
+                logger.error(f"Falha ao iniciar sessao extra '{name}': {e}")
+                continue
+            self.extra_clients.append(client)
+            pool.add(name, client)
+            logger.info(f"Sessao extra '{name}' adicionada ao pool")
+        self.pool = pool
+        return pool
+
     async def disconnect(self):
         """Desconecta do Telegram."""
+        for client in self.extra_clients:
+            try:
+                await client.stop()
+            except Exception:
+                pass
+        self.extra_clients = []
+        self.pool = None
+
         if self.is_connected:
             try:
                 if self.is_authorized:
@@ -109,23 +149,67 @@ class TelegramClient:
             self.is_authorized = False
             logger.info("Desconectado do Telegram")
 
-    async def get_channels(self):
-        """Retorna a lista de canais e supergrupos disponiveis."""
+    @staticmethod
+    def _channel_info(chat):
+        return {
+            "id": chat.id,
+            "title": chat.title or "Sem titulo",
+            "type": "Canal" if chat.type == ChatType.CHANNEL else "Grupo",
+            "username": f"@{chat.username}" if chat.username else "Privado",
+            "member_count": chat.members_count or 0
+        }
+
+    async def refresh_channels(self, cache: ChannelCache):
+        """
+        Atualiza o cache de canais percorrendo os dialogos em ordem de atividade.
+        Para apos UNCHANGED_STREAK dialogos (nao fixados) iguais ao cache, a menos
+        que esteja na hora de uma varredura completa. Retorna (canais novos ou
+        alterados na ordem dos dialogos, ids removidos pela varredura completa).
+        """
         if not self.is_authorized:
-            return []
+            return [], []
 
-        channels = []
+        full = cache.needs_full_refresh
+        seen = set()
+        changed = []
+        removed = []
+        streak = 0
         try:
             async for dialog in self.app.get_dialogs():
                 chat = dialog.chat
+                top_id = dialog.top_message.id if dialog.top_message else 0
+                unchanged = cache.tops.get(chat.id) == top_id
+                cache.tops[chat.id] = top_id
+                seen.add(chat.id)
+
                 if chat.type in [ChatType.CHANNEL, ChatType.SUPERGROUP]:
-                    channels.append({
-                        "id": chat.id,
-                        "title": chat.title or "Sem titulo",
-                        "type": "Canal" if chat.type == ChatType.CHANNEL else "Grupo",
-                        "username": f"@{chat.username}" if chat.username else "Privado",
-                        "member_count": chat.members_count or 0
-                    })
+                    info = self._channel_info(chat)
+                    if cache.channels.get(chat.id) != info:
+                        changed.append(info)
+                    cache.channels[chat.id] = info
+
+                # Dialogos fixados ficam no topo fora da ordem de atividade
+                if dialog.is_pinned:
+                    continue
+                streak = streak + 1 if unchanged else 0
+                if not full and streak >= UNCHANGED_STREAK:
+                    break
+            else:
+                # Varredura completa: remove canais que nao aparecem mais
+                for chat_id in list(cache.tops):
+                    if chat_id not in seen:
+                        cache.tops.pop(chat_id, None)
+                        if cache.channels.pop(chat_id, None) is not None:
+                            removed.append(chat_id)
+                cache.full_refresh_at = time.time()
         except Exception as e:
-            logger.error(f"Erro ao carregar canais: {e}")
-        return channels
+            logger.error(f"Erro ao atualizar canais: {e}")
+            return changed, removed
+
+        # Novos primeiro, como na lista de dialogos
+        if changed:
+            order = {c["id"] for c in changed}
+            rest = [c for i, c in cache.channels.items() if i not in order]
+            cache.channels = {c["id"]: c for c in changed + rest}
+        cache.save()
+        return changed, removed
@@ -1,86 +1,496 @@
 import asyncio
+import time
 import traceback
 import random
-from pyrogram import Client
-from pyrogram.raw import functions as raw_functions
+from pyrogram import Client, filters
+from pyrogram.errors import FloodWait, RPCError
+from pyrogram.handlers import MessageHandler
+from src.core.albums import (
+    albumable,
+    group_albums,
+    input_media_from_message,
+    send_album,
+    upload_album_media,
+    whole_albums,
+)
+from src.core.context import JobContext
+from src.core.dedup import DedupIndex, MEDIA_ATTRS, fingerprint
+from src.core.errors import (
+    FAIL_JOB,
+    FAIL_MESSAGE,
+    JUMP,
+    REFETCH,
+    RETRY,
+    REUPLOAD_STRATEGY,
+    SERVER_SIDE_STRATEGIES,
+    STALE_FILE_ID_ERRORS,
+    JobAborted,
+    classify,
+    error_id,
+)
+from src.core.fanout import FanOutFeed, feed_pages
+from src.core.forwarder import BatchForwarder, confirmed_ids, sent_message_id
+from src.core.history import HistoryReader
+from src.core.journal import CloneJournal, MAX_RETRY_ATTEMPTS
+from src.core.media_cache import MediaCache
+from src.core.metrics import get_metrics
+from src.core.pool import SESSION_FATAL_ERRORS
+from src.core.ratelimit import RateLimiter
+from src.core.reupload import MediaReuploader, media_of
+from src.core.strategies import NOT_APPLICABLE, StrategyChain
 from src.utils.logger import get_logger
 
 logger = get_logger()
 
+# Ids por chamada de get_messages na repescagem de falhas
+GET_MESSAGES_LIMIT = 200
+
+# Quanto a repescagem automatica (apos a passada principal) espera pela proxima tentativa agendada
+RETRY_MAX_WAIT = 120.0
+
+# Grupo de handlers reservado ao espelhamento, separado de outros handlers do app
+MIRROR_HANDLER_GROUP = 7
+
 
 class Cloner:
-    def __init__(self, client: Client):
+    def __init__(self, client: Client, rate_limiter=None, journal=None, pool=None, dedup_index=None, reuploader=None,
+                 media_cache=None):
         self.client = client
+        self.pool = pool  # SessionPool opcional para distribuir os envios
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.journal = journal or CloneJournal()
         self.stop_requested = False
         self.pause_requested = False
         self.is_running = False
+        self.history_page_size = 100
+        self.prefetch_pages = 4  # Profundidade da fila entre leitura e envio
+        self.use_batch_forward = True
+        self.forwarder = BatchForwarder(client, rate_limiter=self.rate_limiter)
+        self.strategies = self._build_strategies()
+        self.job = None  # JobContext do job em andamento
+        self.sender_jobs = {}  # JobContext por sessao do pool
+        self.deduplicate = False  # Pular o que ja existe no destino (por conteudo)
+        self.filters = None  # CloneFilter opcional: clona so o recorte pedido
+        self.dedup_index = dedup_index or DedupIndex()
+        self.media_cache = media_cache or MediaCache()  # Midias baixadas e file_ids ja enviados
+        self.reuploader = reuploader or MediaReuploader(client, cache=self.media_cache)  # Spool do reupload (origem protegida)
+        self._children = []  # Cloners por destino no clone para varios destinos
+        self.result = None  # Resumo do ultimo clone: copiadas, falhas, puladas, cancelada, erro
+        self.metrics = get_metrics()
+
+    def _build_strategies(self):
+        """Estrategias de copia, na ordem padrao de tentativa."""
+        chain = StrategyChain()
+        chain.add("copy", self._strategy_copy)
+        chain.add("resend", self._strategy_resend)
+        chain.add(REUPLOAD_STRATEGY, self._strategy_reupload)
+        chain.add("resend_limpo", self._strategy_resend_clean, lossy=True)
+        chain.add("texto_puro", self._strategy_plain_text, lossy=True)
+        chain.add("raw_forward", self._strategy_raw_forward)
+        return chain
+
+    async def prepare_job(self, origin_chat_id, destination_chat_id):
+        """
+        Resolve o contexto do job uma unica vez (peers, metadados, restricoes
+        da origem) e descarta as estrategias que certamente falhariam.
+        """
+        self.job = await JobContext(
+            self.client,
+            origin_chat_id,
+            destination_chat_id,
+            rate_limiter=self.rate_limiter,
+        ).prepare()
+        await self._prepare_senders(origin_chat_id, destination_chat_id)
+        self.strategies.reset()
+        if self.job.source_protected:
+            # Conteudo protegido bloqueia tudo que reaproveita a midia no servidor:
+            # so baixando e subindo de novo
+            for name in SERVER_SIDE_STRATEGIES:
+                self.strategies.skip(name)
+        else:
+            # Baixar e subir e o caminho mais caro; so entra se a origem bloquear o resto
+            self.strategies.skip(REUPLOAD_STRATEGY)
+        return self.job
 
-    async def _copy_message(self, msg, destination_chat_id):
+    async def _prepare_senders(self, origin_chat_id, destination_chat_id):
+        """Um contexto por sessao do pool; sessoes sem acesso ao job ficam de fora."""
+        self.sender_jobs = {}
+        if not self.pool:
+            return
+        for member in self.pool.members:
+            if not member.healthy:
+                continue
+            try:
+                context = await JobContext(
+                    member.client,
+                    origin_chat_id,
+                    destination_chat_id,
+                    # Mesmas taxas, chave e peso do job, mas no orcamento da conta
+                    # da sessao (so se o job tem orcamento). Sem retentativas: em
+                    # FloodWait o pool troca de sessao em vez de esperar
+                    rate_limiter=self.rate_limiter.spawn(
+                        max_retries=0,
+                        gate=member,
+                        budget=member.budget if self.rate_limiter.budget else None,
+                    ),
+                    member=member,
+                ).prepare()
+            except Exception as e:
+                logger.warning(f"Sessao {member.name} sem acesso a origem/destino: {e}")
+                continue
+            self.sender_jobs[member.name] = context
+
+    def _sender_job(self, job):
+        """Contexto da sessao que vai enviar: a do pool da vez, ou o proprio job."""
+        if not self.sender_jobs:
+            return job
+        member = self.pool.pick(names=self.sender_jobs)
+        if member is None:
+            return job
+        return self.sender_jobs[member.name]
+
+    def _batch_failover(self):
+        """
+        failover(sender, erro) para o BatchForwarder: em FloodWait numa sessao
+        do pool, marca a sessao e devolve o contexto da proxima para repetir o
+        mesmo lote (no maximo uma troca por sessao, como nas estrategias).
+        """
+        attempts = 0
+
+        def failover(sender, error):
+            nonlocal attempts
+            if not sender.member or attempts >= len(self.sender_jobs):
+                return None
+            attempts += 1
+            self.pool.report_flood(sender.member, error.value)
+            return self._sender_job(sender)
+
+        return failover
+
+    async def _copy_message(self, msg, job):
+        """Copia uma mensagem e libera o arquivo dela no spool do reupload, se houver."""
+        try:
+            return await self._run_strategies(msg, job)
+        finally:
+            self.reuploader.discard(msg)
+
+    async def _run_strategies(self, msg, job):
         """
         Tenta copiar uma mensagem usando multiplas estrategias.
         ZERO filtros previos - tenta copiar TUDO, igual ao codigo original.
-        Retorna (True, None) se copiou, (False, motivo) se falhou.
+        Retorna (True, id_destino) se copiou, (False, motivo) se falhou.
+        A ordem das estrategias vem do StrategyChain (custo observado no job).
+        Toda chamada passa pelo rate limiter, que absorve FloodWait na propria
+        estrategia em vez de deixar cair para a proxima. Com pool de sessoes,
+        um FloodWait troca a sessao e repete a mesma estrategia.
+        Os demais erros passam pelo classificador (errors.classify), que decide
+        entre repetir, rebuscar a mensagem, pular para um fallback especifico,
+        desistir da mensagem ou encerrar o job (JobAborted).
         """
 
         errors = []
+        job = self._sender_job(job)
+        jump_to = None
 
-        # Estrategia 1: copy() - metodo padrao
-        try:
-            await msg.copy(chat_id=destination_chat_id)
-            return True, None
-        except Exception as e1:
-            errors.append(f"copy: {e1}")
+        for name, strategy in self.strategies.ordered():
+            # Restricoes descobertas durante esta mensagem valem na hora
+            if name in self.strategies.skipped:
+                continue
+            if jump_to and name != jump_to:
+                continue
+            jump_to = None
 
-        # Estrategia 2: Re-enviar com formatacao e markup
-        try:
-            sent = await self._resend_content(msg, destination_chat_id, skip_markup=False)
-            if sent:
-                return True, None
-        except Exception as e3:
-            errors.append(f"resend: {e3}")
+            attempts = 0
+            retries = 0
+            while True:
+                started = time.monotonic()
+                try:
+                    dest_id = await strategy(msg, job)
+                except Exception as e:
+                    if job.member and isinstance(e, FloodWait) and attempts < len(self.sender_jobs):
+                        attempts += 1
+                        self.pool.report_flood(job.member, e.value)
+                        job = self._sender_job(job)
+                        continue
+                    if job.member and isinstance(e, RPCError) and e.ID in SESSION_FATAL_ERRORS:
+                        self.pool.report_dead(job.member, e)
+                        self.sender_jobs.pop(job.member.name, None)
+                        job = self._sender_job(self.job)
+                        continue
 
-        # Estrategia 3: Re-enviar SEM reply_markup
-        try:
-            sent = await self._resend_content(msg, destination_chat_id, skip_markup=True)
-            if sent:
-                return True, None
-        except Exception as e4:
-            errors.append(f"resend_limpo: {e4}")
+                    self._record_strategy(name, False, started)
+                    route = self._route_error(e)
+                    if route.action == RETRY and retries < route.retries:
+                        retries += 1
+                        await asyncio.sleep(route.delay)
+                        continue
+                    if route.action == REFETCH and retries < route.retries:
+                        retries += 1
+                        fresh = await self._refetch(msg)
+                        if fresh is not None:
+                            msg = fresh
+                            continue
+
+                    errors.append(f"{name}: {e}")
+                    if route.action == FAIL_JOB:
+                        raise JobAborted(f"{error_id(e)}: {e}") from e
+                    if route.action == FAIL_MESSAGE:
+                        return False, f"{self._get_msg_info(msg)} -> {' | '.join(errors)}"
+                    if route.action == JUMP:
+                        jump_to = route.strategy
+                    break
+                if dest_id is NOT_APPLICABLE:
+                    break
+                self._record_strategy(name, True, started)
+                if job.member:
+                    self.pool.report_success(job.member)
+                return True, dest_id
 
-        # Estrategia 4: Texto puro sem formatacao
+        # Diagnostico detalhado
+        msg_info = self._get_msg_info(msg)
+        return False, f"{msg_info} -> {' | '.join(errors)}"
+
+    def _route_error(self, error):
+        """Classifica o erro, aplica as restricoes que valem para o job e conta nas metricas."""
+        route = classify(error)
+        for name in route.skip:
+            self.strategies.skip(name)
+        for name in route.enable:
+            self.strategies.allow(name)
+        self.metrics.inc(
+            "darkogram_errors_total",
+            help="Erros das estrategias por tipo e acao tomada",
+            error=error_id(error),
+            action=route.action,
+        )
+        return route
+
+    async def _refetch(self, msg):
+        """Busca a mensagem de novo para renovar o file_reference. None se nao existe mais."""
         try:
-            text = msg.text or msg.caption or ""
-            if text.strip():
-                await self.client.send_message(
-                    chat_id=destination_chat_id,
-                    text=text,
+            fresh = await self.client.get_messages(msg.chat.id, msg.id)
+        except Exception as e:
+            logger.warning(f"Falha ao rebuscar mensagem {msg.id}: {e}")
+            return None
+        return None if fresh.empty else fresh
+
+    def _record_strategy(self, name, success, started, album=False):
+        """
+        Alimenta a ordenacao do job e as metricas globais com o resultado de uma tentativa.
+        Envios de album ficam so nas metricas (rotulo <estrategia>_album): a latencia
+        de um album inteiro distorceria o custo por mensagem da estrategia.
+        """
+        if album:
+            name = f"{name}_album"
+        else:
+            self.strategies.record(name, success, started)
+        self.metrics.observe(
+            "darkogram_strategy_latency_seconds",
+            time.monotonic() - started,
+            help="Latencia de cada tentativa de copia, por estrategia",
+            strategy=name,
+        )
+        self.metrics.inc(
+            "darkogram_strategy_attempts_total",
+            help="Tentativas por estrategia (win = copiou, fail = passou adiante)",
+            strategy=name,
+            result="win" if success else "fail",
+        )
+
+    def _record_sent(self, msg, success):
+        """Metricas por mensagem: copiadas/falhas e bytes de midia movidos."""
+        if not success:
+            self.metrics.inc("darkogram_messages_failed_total", help="Mensagens nao copiadas")
+            return
+        self.metrics.record_copied()
+        for attr in MEDIA_ATTRS:
+            media = getattr(msg, attr, None)
+            if media is not None:
+                self.metrics.inc(
+                    "darkogram_bytes_moved_total",
+                    getattr(media, "file_size", 0) or 0,
+                    help="Bytes de midia copiados",
+                )
+                break
+
+    async def _strategy_copy(self, msg, job):
+        # copy() - metodo padrao
+        kind = job.rate_limiter.kind_for(msg)
+        if job.client is self.client:
+            sent = await job.rate_limiter.call(kind, msg.copy, chat_id=job.destination_chat_id)
+        else:
+            # Outra sessao do pool: copia pelo id, com o acesso dela a origem
+            sent = await job.rate_limiter.call(
+                kind,
+                job.client.copy_message,
+                chat_id=job.destination_chat_id,
+                from_chat_id=job.origin_chat_id,
+                message_id=msg.id,
+            )
+        return sent.id
+
+    async def _strategy_resend(self, msg, job):
+        # Re-enviar com formatacao e markup
+        kind = job.rate_limiter.kind_for(msg)
+        sent = await job.rate_limiter.call(kind, self._resend_content, job.client, msg, job.destination_chat_id, skip_markup=False)
+        return sent.id if sent else NOT_APPLICABLE
+
+    async def _strategy_resend_clean(self, msg, job):
+        # Re-enviar SEM reply_markup
+        kind = job.rate_limiter.kind_for(msg)
+        sent = await job.rate_limiter.call(kind, self._resend_content, job.client, msg, job.destination_chat_id, skip_markup=True)
+        return sent.id if sent else NOT_APPLICABLE
+
+    async def _strategy_reupload(self, msg, job):
+        # Baixar a midia (spool em disco) e subir como arquivo novo: unico caminho
+        # com a origem protegida. Texto vai direto, com entidades e markup
+        kind = job.rate_limiter.kind_for(msg)
+        media = media_of(msg)
+        if media is None:
+            sent = await job.rate_limiter.call(kind, self._resend_content, job.client, msg, job.destination_chat_id)
+            return sent.id if sent else NOT_APPLICABLE
+
+        # Arquivo que esta conta ja subiu antes: reenvia pelo file_id, sem download nem upload
+        account = job.client.name
+        file_id = self.media_cache.uploaded_file_id(media.file_unique_id, account)
+        if file_id:
+            try:
+                sent = await job.rate_limiter.call(
+                    kind, self._resend_content, job.client, msg, job.destination_chat_id, media=file_id
                 )
-                return True, None
-        except Exception as e5:
-            errors.append(f"texto_puro: {e5}")
+                return sent.id
+            except RPCError as e:
+                if e.ID not in STALE_FILE_ID_ERRORS:
+                    raise
+                self.media_cache.forget_upload(media.file_unique_id, account)
+
+        path = await self.reuploader.take(msg)
+        sent = await job.rate_limiter.call(kind, self._resend_content, job.client, msg, job.destination_chat_id, media=path)
+        uploaded = media_of(sent)
+        if uploaded is not None:
+            self.media_cache.remember_upload(media.file_unique_id, account, uploaded.file_id)
+        return sent.id
+
+    async def _strategy_plain_text(self, msg, job):
+        # Texto puro sem formatacao
+        text = msg.text or msg.caption or ""
+        if not text.strip():
+            return NOT_APPLICABLE
+        sent = await job.rate_limiter.call(
+            "text",
+            job.client.send_message,
+            chat_id=job.destination_chat_id,
+            text=text,
+        )
+        return sent.id
 
-        # Estrategia 5: Forward via API crua COM drop_author=True
+    async def _strategy_raw_forward(self, msg, job):
+        # Forward via API crua COM drop_author=True
         # Encaminha no nivel do protocolo Telegram SEM mostrar origem
+        updates = await job.rate_limiter.call(
+            job.rate_limiter.kind_for(msg),
+            job.client.invoke,
+            job.forward_request([msg.id], [random.randint(-(2**63), 2**63 - 1)]),
+        )
+        return sent_message_id(updates)
+
+    async def _copy_album(self, album, job):
+        """
+        Envia um album inteiro numa chamada, mantendo o agrupamento no destino.
+        As estrategias de album seguem a ordem do StrategyChain; se nenhuma
+        servir, cada item segue sozinho pelas estrategias individuais.
+        Retorna lista de (msg, sucesso, detalhe) como _send_chunk.
+        """
+        album_strategies = {
+            "copy": self._album_resend,
+            "resend": self._album_resend,
+            REUPLOAD_STRATEGY: self._album_reupload,
+            "raw_forward": self._album_forward,
+        }
+        sender = self._sender_job(job)
+        tried = set()
         try:
-            from_peer = await self.client.resolve_peer(msg.chat.id)
-            to_peer = await self.client.resolve_peer(destination_chat_id)
-            await self.client.invoke(
-                raw_functions.messages.ForwardMessages(
-                    from_peer=from_peer,
-                    id=[msg.id],
-                    to_peer=to_peer,
-                    random_id=[random.randint(-(2**63), 2**63 - 1)],
-                    drop_author=True,
-                    silent=True,
-                )
-            )
-            return True, None
-        except Exception as e6:
-            errors.append(f"raw_forward: {e6}")
+            if all(albumable(msg) for msg in album):
+                for name, _ in self.strategies.ordered():
+                    strategy = album_strategies.get(name)
+                    if strategy is None or strategy in tried or name in self.strategies.skipped:
+                        continue
+                    tried.add(strategy)
+                    started = time.monotonic()
+                    try:
+                        dest_ids = await strategy(album, sender)
+                    except Exception as e:
+                        self._record_strategy(name, False, started, album=True)
+                        route = self._route_error(e)
+                        if route.action == FAIL_JOB:
+                            raise JobAborted(f"{error_id(e)}: {e}") from e
+                        logger.warning(f"Album {album[0].media_group_id} nao foi via {name}: {e}")
+                        continue
+                    self._record_strategy(name, True, started, album=True)
+                    return [(msg, True, dest_id) for msg, dest_id in zip(album, dest_ids)]
 
-        # Diagnostico detalhado
-        msg_info = self._get_msg_info(msg)
-        return False, f"{msg_info} -> {' | '.join(errors)}"
+            # Album que nao passou inteiro: cada item segue sozinho
+            results = []
+            for msg in album:
+                success, detail = await self._copy_message(msg, job)
+                results.append((msg, success, detail))
+            return results
+        finally:
+            for msg in album:
+                self.reuploader.discard(msg)
+
+    async def _album_resend(self, album, job):
+        # Mesmos arquivos da origem (file_id) num unico SendMultiMedia
+        media = [input_media_from_message(msg) for msg in album]
+        sent = await job.rate_limiter.call("media", send_album, job.client, job.to_peer, album, media)
+        return [m.id for m in sent]
+
+    async def _album_forward(self, album, job):
+        # Encaminhados na mesma chamada, os itens continuam agrupados
+        random_ids = [random.randint(-(2**63), 2**63 - 1) for _ in album]
+        updates = await job.rate_limiter.call(
+            "media",
+            job.client.invoke,
+            job.forward_request([msg.id for msg in album], random_ids),
+        )
+        confirmed = confirmed_ids(updates)
+        return [confirmed.get(rid) for rid in random_ids]
+
+    async def _album_reupload(self, album, job):
+        # Origem protegida: arquivos do spool (ou file_ids que esta conta ja subiu)
+        account = job.client.name
+        unique_ids = [media_of(msg).file_unique_id for msg in album]
+        cached = [self.media_cache.uploaded_file_id(uid, account) for uid in unique_ids]
+        if any(cached):
+            try:
+                return await self._send_reuploaded_album(album, job, cached, unique_ids)
+            except RPCError as e:
+                if e.ID not in STALE_FILE_ID_ERRORS:
+                    raise
+                for uid, file_id in zip(unique_ids, cached):
+                    if file_id:
+                        self.media_cache.forget_upload(uid, account)
+        return await self._send_reuploaded_album(album, job, [None] * len(album), unique_ids)
+
+    async def _send_reuploaded_album(self, album, job, cached, unique_ids):
+        # Downloads antes do rate limiter: a vez de enviar nao fica parada esperando disco/rede
+        paths = [None if file_id else await self.reuploader.take(msg) for msg, file_id in zip(album, cached)]
+
+        async def upload_and_send():
+            media = []
+            for msg, file_id, path in zip(album, cached, paths):
+                if file_id:
+                    media.append(input_media_from_message(msg, file_id))
+                else:
+                    media.append(await upload_album_media(job.client, job.to_peer, msg, path))
+            return await send_album(job.client, job.to_peer, album, media)
+
+        sent = await job.rate_limiter.call("media", upload_and_send)
+        for uid, path, msg in zip(unique_ids, paths, sent):
+            uploaded = media_of(msg)
+            if path and uploaded is not None:
+                self.media_cache.remember_upload(uid, job.client.name, uploaded.file_id)
+        return [msg.id for msg in sent]
 
     def _get_msg_info(self, msg):
         """Retorna info de diagnostico sobre a mensagem."""
@@ -106,88 +516,86 @@ class Cloner:
             parts.append("forwarded=True")
         return "[" + ", ".join(parts) + "]"
 
-    async def _resend_content(self, msg, destination_chat_id, skip_markup=False):
-        """Re-envia o conteudo da mensagem preservando formatacao."""
+    async def _resend_content(self, client, msg, destination_chat_id, skip_markup=False, media=None):
+        """
+        Re-envia o conteudo da mensagem preservando formatacao.
+        media: arquivo local ou file_id ja enviado para usar no lugar da midia original (reupload).
+        Retorna a mensagem enviada, ou None se nao havia conteudo reenviavel.
+        """
 
         caption = msg.caption or ""
         caption_entities = msg.caption_entities if not skip_markup else None
         reply_markup = None if skip_markup else msg.reply_markup
+        # Arquivo novo nao carrega os atributos da midia original: vao explicitos
+        upload = self._upload_attrs(msg) if media else {}
 
         # Foto
         if msg.photo:
-            kwargs = {"chat_id": destination_chat_id, "photo": msg.photo.file_id, "caption": caption}
+            kwargs = {"chat_id": destination_chat_id, "photo": media or msg.photo.file_id, "caption": caption, **upload}
             if caption_entities:
                 kwargs["caption_entities"] = caption_entities
             if reply_markup:
                 kwargs["reply_markup"] = reply_markup
-            await self.client.send_photo(**kwargs)
-            return True
+            return await client.send_photo(**kwargs)
 
         # Video
         if msg.video:
-            kwargs = {"chat_id": destination_chat_id, "video": msg.video.file_id, "caption": caption}
+            kwargs = {"chat_id": destination_chat_id, "video": media or msg.video.file_id, "caption": caption, **upload}
             if caption_entities:
                 kwargs["caption_entities"] = caption_entities
             if reply_markup:
                 kwargs["reply_markup"] = reply_markup
-            await self.client.send_video(**kwargs)
-            return True
+            return await client.send_video(**kwargs)
 
         # Documento
         if msg.document:
-            kwargs = {"chat_id": destination_chat_id, "document": msg.document.file_id, "caption": caption}
+            kwargs = {"chat_id": destination_chat_id, "document": media or msg.document.file_id, "caption": caption, **upload}
             if caption_entities:
                 kwargs["caption_entities"] = caption_entities
             if reply_markup:
                 kwargs["reply_markup"] = reply_markup
-            await self.client.send_document(**kwargs)
-            return True
+            return await client.send_document(**kwargs)
 
         # Audio
         if msg.audio:
-            kwargs = {"chat_id": destination_chat_id, "audio": msg.audio.file_id, "caption": caption}
+            kwargs = {"chat_id": destination_chat_id, "audio": media or msg.audio.file_id, "caption": caption, **upload}
             if caption_entities:
                 kwargs["caption_entities"] = caption_entities
             if reply_markup:
                 kwargs["reply_markup"] = reply_markup
-            await self.client.send_audio(**kwargs)
-            return True
+            return await client.send_audio(**kwargs)
 
         # Voz
         if msg.voice:
-            kwargs = {"chat_id": destination_chat_id, "voice": msg.voice.file_id, "caption": caption}
+            kwargs = {"chat_id": destination_chat_id, "voice": media or msg.voice.file_id, "caption": caption, **upload}
             if caption_entities:
                 kwargs["caption_entities"] = caption_entities
             if reply_markup:
                 kwargs["reply_markup"] = reply_markup
-            await self.client.send_voice(**kwargs)
-            return True
+            return await client.send_voice(**kwargs)
 
         # Sticker
         if msg.sticker:
-            kwargs = {"chat_id": destination_chat_id, "sticker": msg.sticker.file_id}
+            kwargs = {"chat_id": destination_chat_id, "sticker": media or msg.sticker.file_id, **upload}
             if reply_markup:
                 kwargs["reply_markup"] = reply_markup
-            await self.client.send_sticker(**kwargs)
-            return True
+            return await client.send_sticker(**kwargs)
 
         # Video nota (bolinha)
         if msg.video_note:
-            kwargs = {"chat_id": destination_chat_id, "video_note": msg.video_note.file_id}
+            kwargs = {"chat_id": destination_chat_id, "video_note": media or msg.video_note.file_id, **upload}
             if reply_markup:
                 kwargs["reply_markup"] = reply_markup
-            await self.client.send_video_note(**kwargs)
-            return True
+            return await client.send_video_note(**kwargs)
 
         # Animacao (GIF)
         if msg.animation:
-            kwargs = {"chat_id": destination_chat_id, "animation": msg.animation.file_id, "caption": caption}
+            kwargs = {"chat_id": destination_chat_id, "animation": media or msg.animation.file_id, "caption": caption, **upload}
             if caption_entities:
                 kwargs["caption_entities"] = caption_entities
             if reply_markup:
                 kwargs["reply_markup"] = reply_markup
-            await self.client.send_animation(**kwargs)
-            return True
+            return await client.send_animation(**kwargs)
 
         # Texto COM entidades (hashtags, bold, links)
         if msg.text:
@@ -196,21 +604,64 @@ class Cloner:
                 kwargs["entities"] = msg.entities
             if reply_markup:
                 kwargs["reply_markup"] = reply_markup
-            await self.client.send_message(**kwargs)
-            return True
+            return await client.send_message(**kwargs)
 
-        return False
+        return None
 
-    async def clone_chat(self,
-                         origin_chat_id: int,
-                         destination_chat_id: int,
-                         progress_callback=None,
-                         log_callback=None):
-        """Clona mensagens da origem para o destino."""
-        self.stop_requested = False
-        self.pause_requested = False
-        self.is_running = True
+    @staticmethod
+    def _upload_attrs(msg):
+        """Duracao, dimensoes e nome que o Telegram nao consegue tirar de um upload cru."""
+        if msg.video:
+            v = msg.video
+            return {"duration": v.duration, "width": v.width, "height": v.height,
+                    "file_name": v.file_name, "supports_streaming": bool(v.supports_streaming)}
+        if msg.animation:
+            a = msg.animation
+            return {"duration": a.duration, "width": a.width, "height": a.height, "file_name": a.file_name}
+        if msg.audio:
+            a = msg.audio
+            return {"duration": a.duration, "performer": a.performer, "title": a.title, "file_name": a.file_name}
+        if msg.voice:
+            return {"duration": msg.voice.duration}
+        if msg.video_note:
+            return {"duration": msg.video_note.duration, "length": msg.video_note.length}
+        if msg.document:
+            return {"file_name": msg.document.file_name}
+        return {}
+
+    async def _send_chunk(self, chunk, job, batch_mode):
+        """Envia um grupo de mensagens. Retorna lista de (msg, sucesso, detalhe)."""
+        if batch_mode:
+            async def fallback(msg, error):
+                # Mensagem que o lote nao encaminhou segue pelas estrategias individuais,
+                # a menos que o erro do lote ja diga que nao adianta
+                if error is not None:
+                    route = self._route_error(error)
+                    if route.action == FAIL_JOB:
+                        raise JobAborted(f"{error_id(error)}: {error}") from error
+                    if route.action == FAIL_MESSAGE:
+                        return False, f"{self._get_msg_info(msg)} -> lote: {error}"
+                return await self._copy_message(msg, job)
+
+            started = time.monotonic()
+            failover = self._batch_failover() if self.sender_jobs else None
+            results = await self.forwarder.forward(self._sender_job(job), chunk, fallback, failover=failover)
+            self.metrics.observe(
+                "darkogram_batch_latency_seconds",
+                time.monotonic() - started,
+                help="Latencia de cada lote encaminhado (incluindo fallbacks)",
+            )
+            return results
+
+        if len(chunk) > 1:
+            return await self._copy_album(chunk, job)
+
+        msg = chunk[0]
+        success, detail = await self._copy_message(msg, job)
+        return [(msg, success, detail)]
 
+    def _make_log(self, log_callback):
+        """Cria a funcao de log que envia para a UI e para o logger."""
         async def log(msg, level="info"):
             if log_callback:
                 await log_callback(msg, level)
@@ -219,83 +670,223 @@ class Cloner:
             else:
                 logger.info(msg)
 
+        return log
+
+    async def clone_chat(self,
+                         origin_chat_id: int,
+                         destination_chat_id: int,
+                         progress_callback=None,
+                         log_callback=None,
+                         resume_job=True,
+                         page_source=None):
+        """
+        Clona mensagens da origem para o destino.
+        Com resume_job=True, continua a partir da ultima mensagem registrada no
+        diario para este par origem/destino; com False, recomeca do zero.
+        page_source(reader) permite receber as paginas de outro leitor (usado
+        no clone para varios destinos); por padrao o job le a origem sozinho.
+        Com self.filters (CloneFilter) so o recorte pedido e lido e copiado.
+        """
+        self.stop_requested = False
+        self.pause_requested = False
+        self.is_running = True
+        log = self._make_log(log_callback)
+        copied_count = 0
+        failed_count = 0
+        skipped_count = 0
+        filtered_count = 0
+        error = None
+
         try:
             await log("Analisando canal de origem...")
 
-            # Contar total de mensagens
-            total_messages = 0
-            async for _ in self.client.get_chat_history(origin_chat_id):
-                total_messages += 1
+            # Peers, metadados e restricoes da origem resolvidos uma vez por job
+            job = await self.prepare_job(origin_chat_id, destination_chat_id)
+
+            # Retomada: pula tudo que o diario ja registrou como copiado
+            if not resume_job:
+                self.journal.reset(origin_chat_id, destination_chat_id)
+            # Cada filtro retoma do proprio ponto; o que outro filtro ja copiou e pulado pelo id
+            scope = self._journal_scope()
+            last_copied_id = self.journal.last_id(origin_chat_id, destination_chat_id, scope)
+            other_scopes = self.journal.last_id(origin_chat_id, destination_chat_id, scope=None) > last_copied_id
+            if other_scopes:
+                await log(
+                    "O diario deste destino tem copias feitas com outro filtro: "
+                    "retomando do ponto deste filtro e pulando as ja copiadas",
+                    "warning",
+                )
+
+            # Recorte: o que o servidor filtra nem e buscado; o resto e checado aqui
+            query, keep = self._filter_plan()
+            if query:
+                await log(f"Filtro: {self.filters.describe()}")
+
+            # Total via contagem do servidor, sem percorrer o historico
+            reader = HistoryReader(
+                self.client,
+                origin_chat_id,
+                page_size=self.history_page_size,
+                min_id=last_copied_id,
+                peer=job.from_peer,
+                query=query,
+            )
+            total_messages = await reader.count()
 
             await log(f"Encontradas {total_messages} mensagens para clonar.")
 
             if total_messages == 0:
-                await log("Canal de origem esta vazio!", "warning")
+                if query:
+                    await log("Nenhuma mensagem da origem passa no filtro!", "warning")
+                else:
+                    await log("Canal de origem esta vazio!", "warning")
                 self.is_running = False
                 return
 
-            # Coletar mensagens
-            await log("Coletando mensagens...")
-            messages = []
-            async for msg in self.client.get_chat_history(origin_chat_id):
-                messages.append(msg)
+            if job.source_protected:
+                await log("Origem com conteudo protegido: midias serao baixadas e enviadas de novo", "warning")
+
+            # Encaminhamento em lote so funciona se a origem permite encaminhar
+            batch_mode = self.use_batch_forward and not job.source_protected
+            if batch_mode:
+                await log(f"Origem permite encaminhamento: lotes de ate {self.forwarder.batch_size} mensagens")
 
-            # Inverter para enviar da mais antiga para a mais recente
-            messages.reverse()
+            # Indice do que ja existe no destino: varre so o que mudou desde a ultima vez
+            if self.deduplicate:
+                await log("Indexando conteudo do destino para evitar duplicatas...")
+                scanned = await self.dedup_index.scan(self.client, destination_chat_id, peer=job.to_peer)
+                await log(f"Destino indexado ({scanned} mensagens novas escaneadas)")
+
+            # Mensagens chegam da mais antiga para a mais recente, pagina por pagina
             await log("Iniciando clonagem...")
 
-            copied_count = 0
-            failed_count = 0
             failed_details = []
+            processed = 0
+            cancelled = False
 
-            for i, msg in enumerate(messages):
-                # Verificar cancelamento
-                if self.stop_requested:
-                    await log(f"Clonagem cancelada! Copiadas: {copied_count}", "warning")
-                    break
+            if last_copied_id:
+                processed = min(self.journal.count(origin_chat_id, destination_chat_id, scope), total_messages)
+                await log(f"Retomando apos a mensagem {last_copied_id} ({processed} ja copiadas)")
 
-                # Verificar pausa
-                while self.pause_requested:
-                    await asyncio.sleep(0.5)
+            # Produtor baixa paginas em background enquanto este loop envia
+            if page_source:
+                pages = page_source(reader)
+            else:
+                pages = reader.prefetch(self.prefetch_pages)
+            # Album no fim de uma pagina espera a seguinte para sair inteiro
+            pages = whole_albums(pages)
+
+            async for page in pages:
+                # Leitura compartilhada pode comecar antes do ponto de retomada deste destino
+                page = [msg for msg in page if msg.id > last_copied_id]
+                if keep:
+                    kept = [msg for msg in page if keep(msg)]
+                    filtered_count += len(page) - len(kept)
+                    processed += len(page) - len(kept)
+                    page = kept
+                if other_scopes and page:
+                    done = self.journal.copied_ids(origin_chat_id, destination_chat_id, (msg.id for msg in page))
+                    if done:
+                        page = [msg for msg in page if msg.id not in done]
+                        processed += len(done)
+                if self.deduplicate:
+                    unique = self._skip_duplicates(page, origin_chat_id, destination_chat_id, scope)
+                    skipped_count += len(page) - len(unique)
+                    processed += len(page) - len(unique)
+                    page = unique
+                if not page:
+                    continue
+                # Encaminhamento bloqueado no meio do job (classificador desativou raw_forward)
+                batch_mode = batch_mode and "raw_forward" not in self.strategies.skipped
+                # Fora do lote, cada album vira um envio unico e o resto sai uma a uma
+                chunks = [page] if batch_mode else group_albums(page)
+                # Com reupload ativo as midias da pagina baixam enquanto as anteriores sobem
+                if not batch_mode and REUPLOAD_STRATEGY not in self.strategies.skipped:
+                    self.reuploader.prefetch(page, account=job.client.name)
+
+                for chunk in chunks:
+                    # Verificar cancelamento
                     if self.stop_requested:
-                        await log("Clonagem cancelada durante pausa!", "warning")
-                        self.is_running = False
-                        return
+                        await log(f"Clonagem cancelada! Copiadas: {copied_count}", "warning")
+                        cancelled = True
+                        break
 
-                try:
-                    success, reason = await self._copy_message(msg, destination_chat_id)
+                    # Verificar pausa
+                    while self.pause_requested:
+                        await asyncio.sleep(0.5)
+                        if self.stop_requested:
+                            await log("Clonagem cancelada durante pausa!", "warning")
+                            self.is_running = False
+                            return
 
-                    if success:
-                        copied_count += 1
-                    else:
-                        failed_count += 1
-                        if len(failed_details) < 15:
-                            failed_details.append(reason)
-                        logger.warning(f"Mensagem nao copiada: {reason}")
+                    try:
+                        results = await self._send_chunk(chunk, job, batch_mode)
+                    except JobAborted:
+                        raise
+                    except Exception as e:
+                        failed_count += len(chunk)
+                        processed += len(chunk)
+                        logger.error(f"Excecao inesperada msgs {chunk[0].id}-{chunk[-1].id}: {traceback.format_exc()}")
+                        for msg in chunk:
+                            self.journal.record_failure(origin_chat_id, destination_chat_id, msg.id, f"Excecao inesperada: {e}")
+                        continue
+
+                    previous_copied = copied_count
+                    for msg, success, detail in results:
+                        self._record_sent(msg, success)
+                        if success:
+                            copied_count += 1
+                            self.journal.record(origin_chat_id, destination_chat_id, msg.id, detail, scope)
+                            if self.deduplicate:
+                                self.dedup_index.add(destination_chat_id, fingerprint(msg))
+                        else:
+                            failed_count += 1
+                            # Segue para a fila de falhas; a repescagem tenta de novo depois
+                            self.journal.record_failure(origin_chat_id, destination_chat_id, msg.id, detail)
+                            if len(failed_details) < 15:
+                                failed_details.append((msg.id, detail))
+                            logger.warning(f"Mensagem nao copiada: {detail}")
 
                     # Atualizar progresso
+                    processed += len(chunk)
                     if progress_callback:
-                        await progress_callback(i + 1, total_messages)
+                        await progress_callback(min(processed, total_messages), total_messages)
 
                     # Log a cada 10 mensagens copiadas
-                    if copied_count > 0 and copied_count % 10 == 0:
+                    if copied_count // 10 > previous_copied // 10:
                         await log(f"Progresso: {copied_count}/{total_messages} mensagens copiadas")
 
-                    # Limite de taxa
-                    await asyncio.sleep(0.5)
+                if cancelled:
+                    break
 
-                except Exception as e:
-                    failed_count += 1
-                    logger.error(f"Excecao inesperada msg {msg.id}: {traceback.format_exc()}")
+            # Repescagem das falhas, sem ter travado a passada principal nelas
+            if failed_count > 0 and not self.stop_requested:
+                recovered, _ = await self._retry_failures(
+                    origin_chat_id, destination_chat_id, job, log,
+                    due_only=True, max_wait=RETRY_MAX_WAIT,
+                )
+                copied_count += recovered
+                failed_count -= recovered
 
             # Resumo final
             summary = f"Copiadas: {copied_count}"
+            if skipped_count > 0:
+                summary += f", Duplicadas puladas: {skipped_count}"
+            if filtered_count > 0:
+                summary += f", Fora do filtro: {filtered_count}"
             if failed_count > 0:
                 summary += f", Falhas: {failed_count}"
 
             if not self.stop_requested:
                 await log(f"Clonagem finalizada! {summary}", "success")
 
+            pending_failures = self.journal.failed_ids(origin_chat_id, destination_chat_id)
+            if pending_failures:
+                await log(f"{len(pending_failures)} mensagens na fila de falhas (use 'Reprocessar falhas')", "warning")
+
+            # So as que continuam falhando depois da repescagem
+            failed_details = [detail for msg_id, detail in failed_details if msg_id in pending_failures]
+
             # Mostrar detalhes das falhas no log
             if failed_details:
                 await log(f"--- Detalhes de {len(failed_details)} mensagens com falha ---", "warning")
@@ -307,17 +898,370 @@ class Cloner:
                 await progress_callback(total_messages, total_messages)
 
         except Exception as e:
+            error = str(e)
+            await log(f"Erro critico: {str(e)}", "error")
+            logger.error(traceback.format_exc())
+        finally:
+            await self.reuploader.close()
+            self.journal.flush()
+            if self.deduplicate:
+                self.dedup_index.flush()
+            self.result = {
+                "copied": copied_count,
+                "failed": failed_count,
+                "skipped": skipped_count,
+                "cancelled": self.stop_requested,
+                "error": error,
+            }
+            self.is_running = False
+
+    async def retry_failed(self, origin_chat_id: int, destination_chat_id: int, log_callback=None):
+        """
+        Repescagem sob demanda: tenta de novo, ja, todas as mensagens da fila
+        de falhas da tarefa que ainda tem tentativas; depois respeita o backoff
+        enquanto a proxima tentativa estiver a ate RETRY_MAX_WAIT.
+        """
+        self.stop_requested = False
+        self.pause_requested = False
+        self.is_running = True
+        log = self._make_log(log_callback)
+        error = None
+        recovered = remaining = 0
+
+        try:
+            job = await self.prepare_job(origin_chat_id, destination_chat_id)
+            recovered, remaining = await self._retry_failures(
+                origin_chat_id, destination_chat_id, job, log,
+                due_only=False, max_wait=RETRY_MAX_WAIT,
+            )
+            await log(f"Repescagem finalizada! Recuperadas: {recovered}, ainda na fila: {remaining}", "success")
+        except Exception as e:
+            error = str(e)
+            await log(f"Erro critico: {str(e)}", "error")
+            logger.error(traceback.format_exc())
+        finally:
+            await self.reuploader.close()
+            self.journal.flush()
+            self.result = {
+                "copied": recovered,
+                "failed": remaining,
+                "skipped": 0,
+                "cancelled": self.stop_requested,
+                "error": error,
+            }
+            self.is_running = False
+
+    async def _retry_failures(self, origin_chat_id, destination_chat_id, job, log, due_only=True, max_wait=0.0):
+        """
+        Rodadas sobre a fila de falhas. Cada rodada busca as mensagens pelo id
+        e passa pelas estrategias de novo; quem falha de novo e reagendado com
+        backoff exponencial. Entre rodadas espera a proxima tentativa agendada,
+        ate max_wait no total. Retorna (recuperadas, ainda na fila).
+        """
+        recovered = 0
+        self.journal.flush()
+
+        while not self.stop_requested:
+            pending = self.journal.failures(origin_chat_id, destination_chat_id, due_only=due_only)
+            if not pending:
+                upcoming = self.journal.failures(origin_chat_id, destination_chat_id)
+                if not upcoming:
+                    break
+                delay = max(0.0, min(r[3] for r in upcoming) - time.time())
+                if delay > max_wait:
+                    break
+                await log(f"Proxima repescagem de {len(upcoming)} falhas em {delay:.0f}s")
+                await asyncio.sleep(delay + 0.01)
+                max_wait -= delay
+                due_only = True
+                continue
+
+            await log(f"Repescagem de {len(pending)} mensagens que falharam...")
+            ids = [r[0] for r in pending]
+            for start in range(0, len(ids), GET_MESSAGES_LIMIT):
+                messages = await self.client.get_messages(origin_chat_id, ids[start:start + GET_MESSAGES_LIMIT])
+                for msg in messages:
+                    if self.stop_requested:
+                        break
+                    while self.pause_requested and not self.stop_requested:
+                        await asyncio.sleep(0.5)
+                    if msg.empty:
+                        self.journal.record_failure(
+                            origin_chat_id, destination_chat_id, msg.id, "Mensagem apagada na origem", final=True
+                        )
+                        continue
+                    success, detail = await self._copy_message(msg, job)
+                    self._record_sent(msg, success)
+                    if success:
+                        recovered += 1
+                        # Fora de qualquer recorte: nao move a retomada
+                        self.journal.record(origin_chat_id, destination_chat_id, msg.id, detail, scope=None)
+                    else:
+                        attempts = self.journal.record_failure(origin_chat_id, destination_chat_id, msg.id, detail)
+                        if attempts >= MAX_RETRY_ATTEMPTS:
+                            await log(f"Desistindo apos {attempts} tentativas: {detail}", "warning")
+            self.journal.flush()
+            due_only = True
+
+        remaining = len(self.journal.failures(origin_chat_id, destination_chat_id))
+        if recovered:
+            await log(f"Repescagem recuperou {recovered} mensagens")
+        return recovered, remaining
+
+    def _filter_plan(self):
+        """(ServerQuery, predicado residual) do filtro do job, ou (None, None) sem filtro."""
+        if not self.filters or not self.filters.active:
+            return None, None
+        return self.filters.plan()
+
+    def _journal_scope(self):
+        """Recorte do job no diario: assinatura do filtro, ou "" sem filtro."""
+        return self.filters.signature() if self.filters else ""
+
+    def _skip_duplicates(self, page, origin_chat_id, destination_chat_id, scope=""):
+        """
+        Remove da pagina o que ja existe no destino. As puladas entram no
+        diario (sem id de destino) para que a retomada tambem as ignore.
+        """
+        unique = []
+        for msg in page:
+            if self.dedup_index.contains(destination_chat_id, fingerprint(msg)):
+                self.journal.record(origin_chat_id, destination_chat_id, msg.id, None, scope)
+            else:
+                unique.append(msg)
+        return unique
+
+    async def mirror_chat(self,
+                          origin_chat_id: int,
+                          destination_chat_id: int,
+                          progress_callback=None,
+                          log_callback=None):
+        """
+        Espelhamento continuo: alcanca a origem a partir do ultimo id copiado
+        e depois copia cada nova mensagem assim que ela chega, ate stop().
+        O handler e registrado ANTES da recuperacao para nao perder mensagens
+        publicadas no meio do caminho.
+        """
+        log = self._make_log(log_callback)
+        incoming = asyncio.Queue()
+
+        async def on_new_message(client, message):
+            incoming.put_nowait(message)
+
+        handler = MessageHandler(on_new_message, filters.chat(origin_chat_id))
+        self.client.add_handler(handler, group=MIRROR_HANDLER_GROUP)
+
+        try:
+            # Updates so sao despachados com o client inicializado
+            if not self.client.is_initialized:
+                await self.client.initialize()
+
+            await self.clone_chat(
+                origin_chat_id,
+                destination_chat_id,
+                progress_callback=progress_callback,
+                log_callback=log_callback,
+                resume_job=True,
+            )
+            if self.stop_requested:
+                return
+            if self.result and self.result["error"]:
+                # Sem a recuperacao nao ha job (peers, estrategias): nada a espelhar
+                await log("Espelhamento cancelado: a recuperacao inicial falhou", "error")
+                return
+
+            self.is_running = True
+            scope = self._journal_scope()
+            last_copied_id = self.journal.last_id(origin_chat_id, destination_chat_id, scope)
+            # Mensagens ao vivo nao passam pelo servidor: o filtro inteiro roda aqui
+            matches = self.filters.compile() if self.filters and self.filters.active else None
+            await log("Espelhamento ativo: aguardando novas mensagens...", "success")
+
+            while not self.stop_requested:
+                try:
+                    msg = await asyncio.wait_for(incoming.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+
+                while self.pause_requested and not self.stop_requested:
+                    await asyncio.sleep(0.5)
+                if self.stop_requested:
+                    break
+
+                # Ja copiada pela recuperacao inicial
+                if msg.id <= last_copied_id:
+                    continue
+                if matches and not matches(msg):
+                    continue
+
+                try:
+                    success, detail = await self._copy_message(msg, self.job)
+                except JobAborted:
+                    raise
+                except Exception:
+                    logger.error(f"Excecao inesperada msg {msg.id}: {traceback.format_exc()}")
+                    continue
+
+                self._record_sent(msg, success)
+                if success:
+                    last_copied_id = msg.id
+                    self.journal.record(origin_chat_id, destination_chat_id, msg.id, detail, scope)
+                    await log(f"Nova mensagem {msg.id} espelhada")
+                else:
+                    self.journal.record_failure(origin_chat_id, destination_chat_id, msg.id, detail)
+                    await log(f"Mensagem nao espelhada: {detail}", "warning")
+
+            await log("Espelhamento encerrado", "warning")
+
+        except Exception as e:
+            await log(f"Erro critico no espelhamento: {str(e)}", "error")
+            logger.error(traceback.format_exc())
+            if self.result:
+                self.result["error"] = str(e)
+        finally:
+            self.client.remove_handler(handler, group=MIRROR_HANDLER_GROUP)
+            await self.reuploader.close()
+            self.journal.flush()
+            self.is_running = False
+
+    async def clone_to_many(self,
+                            origin_chat_id: int,
+                            destination_chat_ids,
+                            progress_callback=None,
+                            log_callback=None,
+                            resume_job=True):
+        """
+        Clona a origem para varios destinos lendo o historico uma unica vez.
+        Cada destino roda num Cloner proprio (rate limiter, estrategias,
+        progresso e diario independentes) alimentado por um FanOutFeed.
+        progress_callback recebe (atual, total, destino).
+        """
+        self.stop_requested = False
+        self.pause_requested = False
+        self.is_running = True
+        log = self._make_log(log_callback)
+        error = None
+
+        try:
+            feeds = []
+            workers = []
+            min_last_id = None
+            self._children = []
+
+            for destination_chat_id in destination_chat_ids:
+                child = Cloner(
+                    self.client,
+                    rate_limiter=self.rate_limiter.spawn(),
+                    journal=self.journal,
+                    pool=self.pool,
+                    media_cache=self.media_cache,
+                )
+                child.history_page_size = self.history_page_size
+                child.prefetch_pages = self.prefetch_pages
+                child.use_batch_forward = self.use_batch_forward
+                child.deduplicate = self.deduplicate
+                child.filters = self.filters
+                child.dedup_index = self.dedup_index
+                self._children.append(child)
+
+                feed = FanOutFeed(max_lag=self.prefetch_pages * 2, blocked_for=child.rate_limiter.blocked_for)
+                feeds.append(feed)
+
+                last_id = 0 if not resume_job else self.journal.last_id(
+                    origin_chat_id, destination_chat_id, self._journal_scope()
+                )
+                min_last_id = last_id if min_last_id is None else min(min_last_id, last_id)
+
+                workers.append(self._run_destination(
+                    child,
+                    feed,
+                    origin_chat_id,
+                    destination_chat_id,
+                    progress_callback=self._destination_progress(progress_callback, destination_chat_id),
+                    log_callback=self._destination_log(log_callback, destination_chat_id),
+                    resume_job=resume_job,
+                ))
+
+            await log(f"Clonando para {len(destination_chat_ids)} destinos com leitura unica da origem")
+
+            # Leitura compartilhada comeca no destino mais atrasado
+            shared_reader = HistoryReader(
+                self.client,
+                origin_chat_id,
+                page_size=self.history_page_size,
+                min_id=min_last_id or 0,
+                query=self._filter_plan()[0],
+            )
+            producer = asyncio.create_task(feed_pages(shared_reader, feeds, self.prefetch_pages))
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                producer.cancel()
+
+        except Exception as e:
+            error = str(e)
             await log(f"Erro critico: {str(e)}", "error")
             logger.error(traceback.format_exc())
         finally:
+            self.result = self.merge_results([c.result for c in self._children if c.result], error)
             self.is_running = False
 
+    def merge_results(self, results, error=None):
+        """Soma os resumos dos destinos; o primeiro erro encontrado representa o conjunto."""
+        errors = [r["error"] for r in results if r["error"]]
+        return {
+            "copied": sum(r["copied"] for r in results),
+            "failed": sum(r["failed"] for r in results),
+            "skipped": sum(r["skipped"] for r in results),
+            "cancelled": self.stop_requested,
+            "error": error or (errors[0] if errors else None),
+        }
+
+    async def _run_destination(self, child, feed, origin_chat_id, destination_chat_id, **kwargs):
+        """Roda o Cloner de um destino consumindo a leitura compartilhada."""
+        try:
+            await child.clone_chat(
+                origin_chat_id,
+                destination_chat_id,
+                page_source=lambda reader: feed.pages(reader, self.prefetch_pages),
+                **kwargs,
+            )
+        finally:
+            # Destino encerrado (ou que nem chegou a ler) nao pode segurar o leitor
+            feed.detach()
+
+    @staticmethod
+    def _destination_progress(progress_callback, destination_chat_id):
+        if not progress_callback:
+            return None
+
+        async def progress(current, total):
+            await progress_callback(current, total, destination_chat_id)
+
+        return progress
+
+    @staticmethod
+    def _destination_log(log_callback, destination_chat_id):
+        if not log_callback:
+            return None
+
+        async def log(msg, level="info"):
+            await log_callback(f"[{destination_chat_id}] {msg}", level)
+
+        return log
+
     def stop(self):
         self.stop_requested = True
         self.pause_requested = False
+        for child in self._children:
+            child.stop()
 
     def pause(self):
         self.pause_requested = True
+        for child in self._children:
+            child.pause()
 
     def resume(self):
         self.pause_requested = False
+        for child in self._children:
+            child.resume()
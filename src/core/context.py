@@ -0,0 +1,45 @@
+import functools
+from pyrogram import Client
+from pyrogram.raw import functions as raw_functions
+
+
+class JobContext:
+    """
+    Dados de um job origem -> destino resolvidos uma unica vez: InputPeers,
+    metadados dos chats, capacidades da origem e o template da requisicao crua
+    de encaminhamento. Compartilhado por todas as estrategias do job, para que
+    o custo por mensagem seja so o envio em si.
+    Os peers sao do ponto de vista de `client`, que tambem e quem envia; com
+    um pool de sessoes existe um contexto por sessao.
+    """
+
+    def __init__(self, client: Client, origin_chat_id, destination_chat_id, rate_limiter=None, member=None):
+        self.client = client
+        self.rate_limiter = rate_limiter
+        self.member = member  # PoolMember dono do contexto, se houver pool
+        self.origin_chat_id = origin_chat_id
+        self.destination_chat_id = destination_chat_id
+        self.from_peer = None
+        self.to_peer = None
+        self.origin_chat = None
+        self.source_protected = False
+        self._forward_template = None
+
+    async def prepare(self):
+        """Resolve peers e metadados. Retorna o proprio contexto."""
+        self.from_peer = await self.client.resolve_peer(self.origin_chat_id)
+        self.to_peer = await self.client.resolve_peer(self.destination_chat_id)
+        self.origin_chat = await self.client.get_chat(self.origin_chat_id)
+        self.source_protected = bool(getattr(self.origin_chat, "has_protected_content", False))
+        self._forward_template = functools.partial(
+            raw_functions.messages.ForwardMessages,
+            from_peer=self.from_peer,
+            to_peer=self.to_peer,
+            drop_author=True,
+            silent=True,
+        )
+        return self
+
+    def forward_request(self, message_ids, random_ids):
+        """ForwardMessages pronto para os ids informados."""
+        return self._forward_template(id=message_ids, random_id=random_ids)
@@ -0,0 +1,145 @@
+import bisect
+import hashlib
+import re
+import sqlite3
+from array import array
+from pyrogram import Client
+from src.core.history import HistoryReader
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+DEDUP_FILE = "dedup_index.db"
+
+MEDIA_ATTRS = (
+    "photo", "video", "document", "audio", "voice",
+    "sticker", "video_note", "animation",
+)
+
+_SPACES = re.compile(r"\s+")
+
+
+def fingerprint(msg):
+    """
+    Impressao digital do conteudo: file_unique_id da midia + hash do texto
+    normalizado (minusculas, espacos colapsados). Retorna um inteiro de 64
+    bits, ou None para mensagens sem conteudo comparavel (ex: servico).
+    """
+    media_id = ""
+    for attr in MEDIA_ATTRS:
+        media = getattr(msg, attr, None)
+        if media is not None:
+            media_id = media.file_unique_id
+            break
+
+    text = msg.text or msg.caption or ""
+    text = _SPACES.sub(" ", text).strip().lower()
+    if not media_id and not text:
+        return None
+
+    digest = hashlib.blake2b(f"{media_id}\x00{text}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class DedupIndex:
+    """
+    Indice de impressoes digitais do que ja existe em cada destino.
+    Em disco: SQLite (destino, fingerprint) + ultimo id escaneado por destino,
+    para que cada nova varredura leia so as mensagens novas.
+    Em memoria: array ordenado de int64 por destino (8 bytes por mensagem).
+    """
+
+    def __init__(self, path=DEDUP_FILE):
+        self.path = path
+        self._conn = None
+        self._loaded = {}
+        self._added = {}
+        self._pending = []
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fingerprints (
+                    dest_chat INTEGER NOT NULL,
+                    fp INTEGER NOT NULL,
+                    PRIMARY KEY (dest_chat, fp)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS scans (
+                    dest_chat INTEGER PRIMARY KEY,
+                    last_id INTEGER NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    async def scan(self, client: Client, dest_chat_id, peer=None):
+        """Indexa as mensagens do destino ainda nao escaneadas. Retorna quantas leu."""
+        conn = self._connect()
+        row = conn.execute("SELECT last_id FROM scans WHERE dest_chat = ?", (dest_chat_id,)).fetchone()
+        last_id = row[0] if row else 0
+
+        scanned = 0
+        reader = HistoryReader(client, dest_chat_id, min_id=last_id, peer=peer)
+        async for page in reader.pages():
+            fps = [(dest_chat_id, fp) for fp in map(fingerprint, page) if fp is not None]
+            with conn:
+                conn.executemany("INSERT OR IGNORE INTO fingerprints (dest_chat, fp) VALUES (?, ?)", fps)
+                conn.execute(
+                    "INSERT OR REPLACE INTO scans (dest_chat, last_id) VALUES (?, ?)",
+                    (dest_chat_id, page[-1].id),
+                )
+            scanned += len(page)
+
+        self._load(dest_chat_id)
+        return scanned
+
+    def _load(self, dest_chat_id):
+        self.flush()
+        rows = self._connect().execute(
+            "SELECT fp FROM fingerprints WHERE dest_chat = ? ORDER BY fp",
+            (dest_chat_id,),
+        )
+        self._loaded[dest_chat_id] = array("q", (r[0] for r in rows))
+        self._added[dest_chat_id] = set()
+
+    def contains(self, dest_chat_id, fp):
+        if fp is None:
+            return False
+        if fp in self._added.get(dest_chat_id, ()):
+            return True
+        loaded = self._loaded.get(dest_chat_id)
+        if not loaded:
+            return False
+        i = bisect.bisect_left(loaded, fp)
+        return i < len(loaded) and loaded[i] == fp
+
+    def add(self, dest_chat_id, fp):
+        """Registra um envio recem-feito para nao repeti-lo. Gravado em disco no flush()."""
+        if fp is None:
+            return
+        self._added.setdefault(dest_chat_id, set()).add(fp)
+        self._pending.append((dest_chat_id, fp))
+        if len(self._pending) >= 100:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        conn = self._connect()
+        with conn:
+            conn.executemany("INSERT OR IGNORE INTO fingerprints (dest_chat, fp) VALUES (?, ?)", self._pending)
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
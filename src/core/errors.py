@@ -0,0 +1,110 @@
+import asyncio
+from pyrogram.errors import (
+    FileReferenceEmpty,
+    FileReferenceExpired,
+    FileReferenceInvalid,
+    Flood,
+    InternalServerError,
+    RPCError,
+    ServiceUnavailable,
+)
+
+# O que fazer com o erro de uma estrategia de copia
+RETRY = "retry"  # Esperar e repetir a MESMA estrategia (erro transitorio)
+REFETCH = "refetch"  # Buscar a mensagem de novo (file_reference vencida) e repetir
+NEXT = "next"  # Tentar a proxima estrategia (comportamento padrao)
+JUMP = "jump"  # Pular direto para uma estrategia especifica
+FAIL_MESSAGE = "fail_message"  # Desistir da mensagem agora (vai para a fila de falhas)
+FAIL_JOB = "fail_job"  # Erro vale para o job inteiro: encerra a clonagem
+
+# Estrategias que reaproveitam o conteudo da origem no servidor; com a origem
+# protegida todas recebem CHAT_FORWARDS_RESTRICTED
+SERVER_SIDE_STRATEGIES = ("copy", "raw_forward", "resend", "resend_limpo")
+
+# Estrategia que baixa e sobe a midia de novo: o que sobra com a origem protegida
+REUPLOAD_STRATEGY = "reupload"
+
+# Sem permissao no destino ou sem acesso a origem: nenhuma mensagem vai passar
+JOB_FATAL_ERRORS = {
+    "CHAT_WRITE_FORBIDDEN",
+    "CHAT_ADMIN_REQUIRED",
+    "CHANNEL_PRIVATE",
+    "CHANNEL_INVALID",
+    "PEER_ID_INVALID",
+    "USER_BANNED_IN_CHANNEL",
+    "CHAT_RESTRICTED",
+    "AUTH_KEY_UNREGISTERED",
+    "SESSION_REVOKED",
+    "USER_DEACTIVATED",
+    "USER_DEACTIVATED_BAN",
+}
+
+# A mensagem em si nao existe mais / nao pode ser copiada por nenhum caminho
+MESSAGE_FATAL_ERRORS = {
+    "MESSAGE_ID_INVALID",
+    "MESSAGE_IDS_EMPTY",
+    "MESSAGE_EMPTY",
+}
+
+# file_id guardado no cache de midia que o Telegram nao aceita mais: sobe o arquivo de novo
+STALE_FILE_ID_ERRORS = {
+    "MEDIA_EMPTY",
+    "FILE_ID_INVALID",
+    "FILE_REFERENCE_EXPIRED",
+    "FILE_REFERENCE_INVALID",
+    "FILE_REFERENCE_EMPTY",
+}
+
+# Erros que tem um fallback certo, sem passar pelos intermediarios
+JUMP_ERRORS = {
+    "REPLY_MARKUP_INVALID": "resend_limpo",
+    "BUTTON_DATA_INVALID": "resend_limpo",
+    "BUTTON_URL_INVALID": "resend_limpo",
+    "BUTTON_TYPE_INVALID": "resend_limpo",
+    "CHAT_SEND_MEDIA_FORBIDDEN": "texto_puro",
+}
+
+
+class JobAborted(Exception):
+    """Erro que impede o job inteiro (ex: sem permissao de escrita no destino)."""
+
+
+class ErrorRoute:
+    """Decisao do classificador para um erro."""
+
+    def __init__(self, action, strategy=None, skip=(), enable=(), delay=0.0, retries=0):
+        self.action = action
+        self.strategy = strategy  # Destino do JUMP
+        self.skip = skip  # Estrategias a desativar no job inteiro
+        self.enable = enable  # Estrategias reservadas que passam a valer no job
+        self.delay = delay  # Espera antes de repetir (RETRY)
+        self.retries = retries  # Maximo de repeticoes da mesma estrategia
+
+
+def error_id(error):
+    """Identificador curto do erro (ID do RPC ou nome da classe)."""
+    return getattr(error, "ID", None) or type(error).__name__
+
+
+def classify(error):
+    """Mapeia um erro do Pyrogram/rede para a acao do Cloner."""
+    if isinstance(error, Flood):
+        # O rate limiter ja esperou e repetiu: insistir so piora o flood
+        return ErrorRoute(FAIL_MESSAGE)
+    if isinstance(error, (FileReferenceExpired, FileReferenceInvalid, FileReferenceEmpty)):
+        return ErrorRoute(REFETCH, retries=1)
+    if isinstance(error, (InternalServerError, ServiceUnavailable, asyncio.TimeoutError, ConnectionError)):
+        return ErrorRoute(RETRY, delay=2.0, retries=2)
+    if not isinstance(error, RPCError):
+        return ErrorRoute(NEXT)
+
+    eid = error.ID
+    if eid == "CHAT_FORWARDS_RESTRICTED":
+        return ErrorRoute(NEXT, skip=SERVER_SIDE_STRATEGIES, enable=(REUPLOAD_STRATEGY,))
+    if eid in JOB_FATAL_ERRORS:
+        return ErrorRoute(FAIL_JOB)
+    if eid in MESSAGE_FATAL_ERRORS:
+        return ErrorRoute(FAIL_MESSAGE)
+    if eid in JUMP_ERRORS:
+        return ErrorRoute(JUMP, strategy=JUMP_ERRORS[eid])
+    return ErrorRoute(NEXT)
@@ -0,0 +1,127 @@
+import asyncio
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+
+# Quantas paginas um destino pode ficar atras do mais rapido antes de ser desligado
+FANOUT_MAX_LAG_PAGES = 8
+
+# FloodWait pendente acima disso desliga o destino na hora (nao vale segurar os outros)
+FANOUT_MAX_FLOOD_WAIT = 10.0
+
+
+class FanOutFeed:
+    """
+    Fila de paginas de UM destino num clone com varios destinos.
+    O leitor compartilhado espera espaco na fila de cada destino, entao a
+    leitura anda no ritmo dos destinos e a origem e lida uma vez so.
+    Um destino que fica mais de `max_lag` paginas atras do mais rapido, ou
+    preso num FloodWait longo, e desligado da leitura compartilhada e, ao
+    esvaziar a fila, passa a ler sozinho a partir da ultima pagina recebida.
+    """
+
+    def __init__(self, max_lag=FANOUT_MAX_LAG_PAGES, blocked_for=None):
+        # Uma pagina a mais que o atraso tolerado: fila cheia com o mais rapido ocioso = atrasado demais
+        self.queue = asyncio.Queue(maxsize=max(1, max_lag) + 1)
+        self.max_lag = max(1, max_lag)
+        self.blocked_for = blocked_for  # Segundos de FloodWait pendentes no destino
+        self.detached = False
+        self.finished = False
+        self.last_id = 0
+        self.consumed = 0  # Paginas ja entregues ao destino
+        # Setado quando o destino comeca a consumir (ou termina sem consumir)
+        self.started = asyncio.Event()
+        self._taken = asyncio.Event()
+
+    async def put(self, page, feeds):
+        """
+        Entrega a pagina, esperando espaco na fila. Retorna False se o destino
+        foi desligado (atrasado demais ou em FloodWait longo).
+        """
+        while not self.detached:
+            try:
+                self.queue.put_nowait(page)
+                return True
+            except asyncio.QueueFull:
+                pass
+            lead = max(feed.consumed for feed in feeds if not feed.detached)
+            if lead - self.consumed > self.max_lag:
+                logger.info(f"Destino {lead - self.consumed} paginas atras do mais rapido, desligado da leitura compartilhada")
+                self.detached = True
+                break
+            if self.blocked_for and self.blocked_for() > FANOUT_MAX_FLOOD_WAIT:
+                logger.info("Destino em FloodWait longo, desligado da leitura compartilhada")
+                self.detached = True
+                break
+            self._taken.clear()
+            try:
+                # Timeout para reavaliar o FloodWait mesmo sem consumo
+                await asyncio.wait_for(self._taken.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+        return False
+
+    def detach(self):
+        """Desliga o destino da leitura compartilhada (ex: erro no leitor ou destino encerrado)."""
+        self.detached = True
+        self.started.set()
+        self._taken.set()
+        self._wake()
+
+    def close(self):
+        """Fim do historico na leitura compartilhada."""
+        self.finished = True
+        self._wake()
+
+    def _wake(self):
+        # Acorda o consumidor se ele estiver esperando numa fila vazia
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def pages(self, reader, prefetch_pages=4):
+        """Paginas para o destino; cai para o proprio reader se foi desligado."""
+        self.started.set()
+        while True:
+            if self.queue.empty():
+                if self.detached:
+                    reader.min_id = max(reader.min_id, self.last_id)
+                    logger.info(f"Destino atrasado, lendo a origem por conta propria apos {reader.min_id}")
+                    async for page in reader.prefetch(prefetch_pages):
+                        yield page
+                    return
+                if self.finished:
+                    return
+            page = await self.queue.get()
+            if page is None:
+                continue
+            self.last_id = page[-1].id
+            self.consumed += 1
+            self._taken.set()
+            yield page
+
+
+async def feed_pages(reader, feeds, prefetch_pages=4):
+    """
+    Le a origem uma unica vez e distribui cada pagina para todas as filas,
+    no ritmo dos destinos (a leitura espera espaco nas filas).
+    """
+    # Espera todos os destinos prepararem o job, senao as filas enchem antes
+    # de alguem consumir e todos seriam desligados logo de cara
+    await asyncio.gather(*(feed.started.wait() for feed in feeds))
+    try:
+        async for page in reader.prefetch(prefetch_pages):
+            # Em paralelo: destino com espaco recebe ja, sem esperar o mais lento
+            await asyncio.gather(*(feed.put(page, feeds) for feed in feeds))
+            # Todos ficaram para tras: cada um ja segue com seu proprio leitor
+            if all(feed.detached for feed in feeds):
+                return
+    except Exception as e:
+        logger.error(f"Erro na leitura compartilhada, destinos seguem sozinhos: {e}")
+        for feed in feeds:
+            feed.detach()
+        return
+    for feed in feeds:
+        feed.close()
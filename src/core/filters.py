@@ -0,0 +1,173 @@
+import re
+from datetime import datetime
+
+# Tipos aceitos em media_types ("text" = mensagem sem midia)
+MEDIA_TYPES = (
+    "text", "photo", "video", "document", "audio", "voice",
+    "video_note", "animation", "sticker",
+)
+
+# Conjuntos de tipos que o messages.Search filtra no servidor sem sobrar nada
+# para o cliente (nome do InputMessagesFilter; sem importar o Pyrogram aqui,
+# para o CLI validar argumentos sem carrega-lo)
+SERVER_MEDIA_FILTERS = {
+    frozenset({"photo"}): "InputMessagesFilterPhotos",
+    frozenset({"video"}): "InputMessagesFilterVideo",
+    frozenset({"photo", "video"}): "InputMessagesFilterPhotoVideo",
+    frozenset({"document"}): "InputMessagesFilterDocument",
+    frozenset({"audio"}): "InputMessagesFilterMusic",
+    frozenset({"voice"}): "InputMessagesFilterVoice",
+    frozenset({"video_note"}): "InputMessagesFilterRoundVideo",
+    frozenset({"voice", "video_note"}): "InputMessagesFilterRoundVoice",
+    frozenset({"animation"}): "InputMessagesFilterGif",
+}
+
+
+def _timestamp(value):
+    if value is None:
+        return 0
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+
+def _media_type(msg):
+    for kind in MEDIA_TYPES[1:]:
+        if getattr(msg, kind, None) is not None:
+            return kind
+    # Texto com previa de link tambem conta como texto
+    return "text" if msg.text else None
+
+
+class ServerQuery:
+    """
+    Parte do filtro que vai para o servidor: limites de id e, se preciso,
+    um messages.Search (texto, tipo de midia, datas). Mensagens barradas
+    aqui nem chegam a ser baixadas. O HistoryReader monta as chamadas.
+    """
+
+    def __init__(self, min_id=0, max_id=0, q="", filter=None, min_date=0, max_date=0):
+        self.min_id = min_id  # Exclusivo, como no GetHistory
+        self.max_id = max_id  # Exclusivo (0 = sem limite)
+        self.q = q
+        self.filter = filter  # Nome do InputMessagesFilter ou None
+        self.min_date = min_date
+        self.max_date = max_date
+
+    @property
+    def uses_search(self):
+        """True se precisa do messages.Search; so limites de id cabem no GetHistory."""
+        return bool(self.q or self.filter or self.min_date or self.max_date)
+
+
+class CloneFilter:
+    """
+    Recorte do que clonar: faixa de ids (inclusiva), faixa de datas, tipos
+    de midia (MEDIA_TYPES), palavra-chave e/ou regex no texto/legenda.
+
+    plan() divide o filtro: o que o Telegram sabe filtrar vira ServerQuery
+    (as mensagens nem sao buscadas) e o resto vira um predicado compilado
+    uma vez por job, aplicado so no cliente.
+    """
+
+    def __init__(self, min_id=None, max_id=None, date_from=None, date_to=None,
+                 media_types=None, keyword=None, regex=None):
+        self.min_id = min_id
+        self.max_id = max_id
+        self.date_from = date_from
+        self.date_to = date_to
+        self.media_types = frozenset(media_types) if media_types else None
+        self.keyword = keyword or None
+        self.regex = regex or None
+        if self.media_types:
+            unknown = self.media_types - set(MEDIA_TYPES)
+            if unknown:
+                raise ValueError(f"Tipos de midia desconhecidos: {', '.join(sorted(unknown))}")
+        if self.regex:
+            # Regex invalida falha ja na configuracao, nao no meio do job
+            try:
+                re.compile(self.regex)
+            except re.error as e:
+                raise ValueError(f"Regex invalida: {e}") from e
+
+    @property
+    def active(self):
+        return any((
+            self.min_id, self.max_id, self.date_from, self.date_to,
+            self.media_types, self.keyword, self.regex,
+        ))
+
+    def signature(self):
+        """Identifica o recorte no diario: cada filtro tem seu proprio ponto de retomada."""
+        if not self.active:
+            return ""
+        return ";".join((
+            f"ids={self.min_id or ''}-{self.max_id or ''}",
+            f"datas={_timestamp(self.date_from)}-{_timestamp(self.date_to)}",
+            f"tipos={','.join(sorted(self.media_types or ()))}",
+            f"palavra={self.keyword or ''}",
+            f"regex={self.regex or ''}",
+        ))
+
+    def describe(self):
+        parts = []
+        if self.min_id or self.max_id:
+            parts.append(f"ids {self.min_id or 1}-{self.max_id or 'fim'}")
+        if self.date_from or self.date_to:
+            start = self.date_from.strftime("%Y-%m-%d") if self.date_from else "inicio"
+            end = self.date_to.strftime("%Y-%m-%d") if self.date_to else "hoje"
+            parts.append(f"datas {start} a {end}")
+        if self.media_types:
+            parts.append(f"tipos {','.join(sorted(self.media_types))}")
+        if self.keyword:
+            parts.append(f"palavra '{self.keyword}'")
+        if self.regex:
+            parts.append(f"regex /{self.regex}/")
+        return "; ".join(parts)
+
+    def plan(self):
+        """(ServerQuery, predicado residual ou None)."""
+        server_filter = SERVER_MEDIA_FILTERS.get(self.media_types) if self.media_types else None
+        query = ServerQuery(
+            min_id=max(0, (self.min_id or 1) - 1),
+            max_id=(self.max_id + 1) if self.max_id else 0,
+            q=self.keyword or "",
+            filter=server_filter,
+            min_date=_timestamp(self.date_from),
+            max_date=_timestamp(self.date_to),
+        )
+        residual = self._compile(media=self.media_types if not server_filter else None, keyword=None)
+        return query, residual
+
+    def compile(self):
+        """Predicado com TODAS as condicoes (ex: mensagens que chegam ao vivo no espelhamento)."""
+        return self._compile(
+            media=self.media_types,
+            keyword=self.keyword,
+            ids=(self.min_id, self.max_id),
+            dates=(self.date_from, self.date_to),
+        )
+
+    def _compile(self, media, keyword, ids=(None, None), dates=(None, None)):
+        checks = []
+        min_id, max_id = ids
+        if min_id:
+            checks.append(lambda msg: msg.id >= min_id)
+        if max_id:
+            checks.append(lambda msg: msg.id <= max_id)
+        date_from, date_to = (_timestamp(d) for d in dates)
+        if date_from:
+            checks.append(lambda msg: msg.date is not None and msg.date.timestamp() >= date_from)
+        if date_to:
+            checks.append(lambda msg: msg.date is not None and msg.date.timestamp() <= date_to)
+        if media:
+            checks.append(lambda msg: _media_type(msg) in media)
+        if keyword:
+            word = keyword.lower()
+            checks.append(lambda msg: word in (msg.text or msg.caption or "").lower())
+        if self.regex:
+            pattern = re.compile(self.regex)
+            checks.append(lambda msg: pattern.search(msg.text or msg.caption or "") is not None)
+        if not checks:
+            return None
+        return lambda msg: all(check(msg) for check in checks)
@@ -0,0 +1,108 @@
+import random
+from pyrogram import Client
+from pyrogram.errors import Flood, FloodWait, RPCError
+from pyrogram.raw import types as raw_types
+from src.core.albums import album_batches, album_split_point
+from src.core.errors import JOB_FATAL_ERRORS
+from src.core.ratelimit import RateLimiter
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+# Limite do messages.ForwardMessages por chamada
+MAX_BATCH_SIZE = 100
+
+# Erros que valem para o lote inteiro: dividir so gastaria mais chamadas
+BATCH_FATAL_ERRORS = JOB_FATAL_ERRORS | {"CHAT_FORWARDS_RESTRICTED"}
+
+
+def _random_id():
+    return random.randint(-(2**63), 2**63 - 1)
+
+
+def confirmed_ids(updates):
+    """random_id -> id no destino de cada mensagem confirmada (UpdateMessageID)."""
+    return {
+        u.random_id: u.id
+        for u in getattr(updates, "updates", [])
+        if isinstance(u, raw_types.UpdateMessageID)
+    }
+
+
+def sent_message_id(updates):
+    """Id da primeira mensagem criada no destino segundo os Updates, ou None."""
+    for u in getattr(updates, "updates", []):
+        if isinstance(u, raw_types.UpdateMessageID):
+            return u.id
+    return None
+
+
+class BatchForwarder:
+    """
+    Encaminha mensagens em lote via messages.ForwardMessages com drop_author=True.
+    Lotes que falham sao divididos ao meio ate isolar a mensagem problematica,
+    que e entregue ao fallback na mesma posicao para preservar a ordem.
+    Lotes e divisoes respeitam os albuns: encaminhados na mesma chamada, os
+    itens continuam agrupados no destino.
+    """
+
+    def __init__(self, client: Client, batch_size=MAX_BATCH_SIZE, rate_limiter=None):
+        self.client = client
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+
+    async def forward(self, job, messages, fallback, failover=None):
+        """
+        Encaminha as mensagens do job (JobContext ja preparado) na ordem recebida.
+        fallback(msg, erro) e chamado para cada mensagem que o lote nao conseguiu
+        encaminhar e deve retornar (sucesso, detalhe) como Cloner._copy_message.
+        failover(job, erro), se dado, e chamado em FloodWait e retorna o contexto
+        de outra sessao para repetir o lote (ou None para seguir ao fallback).
+        Retorna lista de (msg, sucesso, detalhe) na mesma ordem de entrada, onde
+        detalhe e o id no destino em caso de sucesso e o motivo em caso de falha.
+        """
+        results = []
+        for batch in album_batches(messages, self.batch_size):
+            await self._forward_batch(job, batch, fallback, results, failover)
+        return results
+
+    async def _forward_batch(self, job, batch, fallback, results, failover=None):
+        random_ids = [_random_id() for _ in batch]
+        kind = "media" if any(m.media for m in batch) else "text"
+        try:
+            # Envia pela sessao e limitador do contexto (pode ser outra conta do pool)
+            rate_limiter = job.rate_limiter or self.rate_limiter
+            updates = await rate_limiter.call(
+                kind,
+                job.client.invoke,
+                job.forward_request([m.id for m in batch], random_ids),
+            )
+        except Exception as e:
+            if failover and isinstance(e, FloodWait):
+                next_job = failover(job, e)
+                if next_job is not None:
+                    await self._forward_batch(next_job, batch, fallback, results, failover)
+                    return
+            # FloodWait aqui ja esgotou as retentativas do rate limiter (ou as sessoes do pool)
+            fatal = isinstance(e, Flood) or (isinstance(e, RPCError) and e.ID in BATCH_FATAL_ERRORS)
+            if len(batch) == 1 or fatal:
+                for msg in batch:
+                    success, reason = await fallback(msg, e)
+                    results.append((msg, success, reason))
+                return
+            # Falha parcial: divide o lote para isolar as mensagens problematicas
+            middle = album_split_point(batch)
+            await self._forward_batch(job, batch[:middle], fallback, results, failover)
+            await self._forward_batch(job, batch[middle:], fallback, results, failover)
+            return
+
+        # UpdateMessageID confirma cada random_id que virou mensagem no destino
+        confirmed = confirmed_ids(updates)
+        for msg, rid in zip(batch, random_ids):
+            # Sem nenhuma confirmacao nao ha como saber quem falhou: a chamada
+            # nao deu erro, entao o lote conta como entregue (evita duplicatas)
+            if rid in confirmed or not confirmed:
+                results.append((msg, True, confirmed.get(rid)))
+            else:
+                success, reason = await fallback(msg, None)
+                results.append((msg, success, reason))
@@ -0,0 +1,136 @@
+import asyncio
+from pyrogram import Client, utils
+from pyrogram.raw import functions as raw_functions
+from pyrogram.raw import types as raw_types
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+# Limite do messages.GetHistory por chamada
+MAX_PAGE_SIZE = 100
+
+
+class HistoryReader:
+    """
+    Le o historico de um chat da mensagem mais antiga para a mais recente,
+    pagina por pagina, sem carregar o canal inteiro na memoria.
+    Com um ServerQuery (filters.CloneFilter.plan) o recorte e feito no
+    servidor: limites de id no GetHistory, ou messages.Search quando ha
+    texto, tipo de midia ou datas.
+    """
+
+    def __init__(self, client: Client, chat_id, page_size=MAX_PAGE_SIZE, min_id=0, peer=None, query=None):
+        self.client = client
+        self.chat_id = chat_id
+        self.page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        self.query = query
+        self.min_id = max(min_id, query.min_id) if query else min_id
+        self._peer = peer  # InputPeer ja resolvido, se o chamador tiver
+
+    async def _get_peer(self):
+        if self._peer is None:
+            self._peer = await self.client.resolve_peer(self.chat_id)
+        return self._peer
+
+    async def count(self):
+        """Total de mensagens do chat (uma unica chamada, sem percorrer o historico)."""
+        if self.query and self.query.uses_search:
+            # O Search devolve o total do recorte junto com a primeira mensagem
+            r = await self.client.invoke(self._search(await self._get_peer(), 0, 0, 1, self.query.min_id))
+            return getattr(r, "count", len(r.messages))
+        total = await self.client.get_chat_history_count(self.chat_id)
+        if self.query and self.query.min_id:
+            # Estimativa: ids de canal sao sequenciais, com buracos das apagadas
+            total = max(0, total - self.query.min_id)
+        if self.query and self.query.max_id:
+            total = min(total, max(0, self.query.max_id - 1 - self.query.min_id))
+        return total
+
+    async def _fetch_page(self, after_id):
+        """Busca ate page_size mensagens com id > after_id, em ordem crescente."""
+        peer = await self._get_peer()
+        # offset_id + add_offset negativo faz o servidor devolver as mensagens
+        # MAIS NOVAS que after_id, em vez das mais antigas
+        if self.query and self.query.uses_search:
+            request = self._search(peer, after_id + 1, -self.page_size, self.page_size, after_id)
+        else:
+            request = raw_functions.messages.GetHistory(
+                peer=peer,
+                offset_id=after_id + 1,
+                offset_date=0,
+                add_offset=-self.page_size,
+                limit=self.page_size,
+                max_id=self.query.max_id if self.query else 0,
+                min_id=after_id,
+                hash=0,
+            )
+        r = await self.client.invoke(request)
+        if not r.messages:
+            return 0, []
+
+        last_id = max(m.id for m in r.messages)
+        messages = await utils.parse_messages(self.client, r, replies=0)
+        messages = [m for m in messages if not m.empty and m.id > after_id]
+        messages.sort(key=lambda m: m.id)
+        return last_id, messages
+
+    def _search(self, peer, offset_id, add_offset, limit, min_id):
+        query = self.query
+        return raw_functions.messages.Search(
+            peer=peer,
+            q=query.q,
+            filter=getattr(raw_types, query.filter or "InputMessagesFilterEmpty")(),
+            min_date=query.min_date,
+            max_date=query.max_date,
+            offset_id=offset_id,
+            add_offset=add_offset,
+            limit=limit,
+            max_id=query.max_id,
+            min_id=min_id,
+            hash=0,
+        )
+
+    async def pages(self):
+        """Gera paginas (listas de mensagens) da mais antiga para a mais recente."""
+        cursor = self.min_id
+        while True:
+            last_id, page = await self._fetch_page(cursor)
+            if last_id <= cursor:
+                return
+            cursor = last_id
+            if page:
+                yield page
+
+    async def prefetch(self, depth=4):
+        """
+        Como pages(), mas um produtor em background baixa ate `depth` paginas
+        a frente numa fila limitada. A leitura da origem acontece enquanto o
+        consumidor envia, e a memoria fica presa ao tamanho da fila.
+        """
+        queue = asyncio.Queue(maxsize=max(1, depth))
+
+        async def producer():
+            try:
+                async for page in self.pages():
+                    await queue.put(page)
+            except Exception as e:
+                await queue.put(e)
+                return
+            await queue.put(None)
+
+        task = asyncio.create_task(producer())
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            task.cancel()
+
+    async def __aiter__(self):
+        async for page in self.pages():
+            for msg in page:
+                yield msg
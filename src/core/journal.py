@@ -0,0 +1,213 @@
+import sqlite3
+import time
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+JOURNAL_FILE = "clone_journal.db"
+
+# Fila de mensagens que falharam: espera antes da 1a nova tentativa (dobra a cada falha)
+RETRY_BASE_DELAY = 30.0
+MAX_RETRY_ATTEMPTS = 5
+
+
+class CloneJournal:
+    """
+    Diario local das mensagens ja copiadas por tarefa (origem, destino).
+    Guarda o id de origem e o id gerado no destino, permitindo retomar uma
+    clonagem interrompida a partir do ultimo id gravado. Cada recorte
+    (assinatura do CloneFilter; "" = sem filtro) tem seu proprio ponto de
+    retomada, entao um clone filtrado nao faz o clone completo pular nada.
+    Mensagens que falharam vao para a tabela `failed` (dead-letter) com o
+    motivo, o numero de tentativas e quando podem ser tentadas de novo.
+    As escritas sao acumuladas e gravadas em lote (WAL) para nao pesar no envio.
+    """
+
+    def __init__(self, path=JOURNAL_FILE, commit_every=50, commit_interval=2.0):
+        self.path = path
+        self.commit_every = commit_every
+        self.commit_interval = commit_interval
+        self._conn = None
+        self._pending = []
+        self._last_commit = time.monotonic()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS copied (
+                    source_chat INTEGER NOT NULL,
+                    dest_chat INTEGER NOT NULL,
+                    source_id INTEGER NOT NULL,
+                    dest_id INTEGER,
+                    scope TEXT DEFAULT '',
+                    PRIMARY KEY (source_chat, dest_chat, source_id)
+                ) WITHOUT ROWID
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(copied)")}
+            if "scope" not in columns:
+                # Diario anterior aos filtros: tudo foi copiado sem recorte
+                self._conn.execute("ALTER TABLE copied ADD COLUMN scope TEXT DEFAULT ''")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS copied_scope ON copied (source_chat, dest_chat, scope, source_id)"
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS failed (
+                    source_chat INTEGER NOT NULL,
+                    dest_chat INTEGER NOT NULL,
+                    source_id INTEGER NOT NULL,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 1,
+                    next_retry_at REAL NOT NULL,
+                    PRIMARY KEY (source_chat, dest_chat, source_id)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _where(self, source_chat, dest_chat, scope):
+        if scope is None:
+            return "source_chat = ? AND dest_chat = ?", (source_chat, dest_chat)
+        return "source_chat = ? AND dest_chat = ? AND scope = ?", (source_chat, dest_chat, scope)
+
+    def last_id(self, source_chat, dest_chat, scope=""):
+        """
+        Ultimo id de origem gravado para a tarefa no recorte `scope` (0 se
+        nunca rodou). scope=None considera as copias de todos os recortes.
+        """
+        where, params = self._where(source_chat, dest_chat, scope)
+        row = self._connect().execute(f"SELECT MAX(source_id) FROM copied WHERE {where}", params).fetchone()
+        return row[0] or 0
+
+    def count(self, source_chat, dest_chat, scope=""):
+        """Quantidade de mensagens ja gravadas para a tarefa no recorte `scope` (None = todos)."""
+        where, params = self._where(source_chat, dest_chat, scope)
+        row = self._connect().execute(f"SELECT COUNT(*) FROM copied WHERE {where}", params).fetchone()
+        return row[0]
+
+    def copied_ids(self, source_chat, dest_chat, ids):
+        """Quais dos `ids` ja foram copiados para o destino, em qualquer recorte."""
+        ids = list(ids)
+        if not ids:
+            return set()
+        rows = self._connect().execute(
+            f"SELECT source_id FROM copied WHERE source_chat = ? AND dest_chat = ? "
+            f"AND source_id IN ({','.join('?' * len(ids))})",
+            (source_chat, dest_chat, *ids),
+        )
+        return {r[0] for r in rows}
+
+    def record(self, source_chat, dest_chat, source_id, dest_id=None, scope=""):
+        """
+        Registra uma copia feita no recorte `scope`. A gravacao em disco
+        acontece em lote. scope=None (ex: repescagem) nao move a retomada
+        de nenhum recorte.
+        """
+        self._pending.append((source_chat, dest_chat, source_id, dest_id, scope))
+        if (len(self._pending) >= self.commit_every
+                or time.monotonic() - self._last_commit >= self.commit_interval):
+            self.flush()
+
+    def flush(self):
+        """Grava as copias pendentes numa unica transacao."""
+        self._last_commit = time.monotonic()
+        if not self._pending:
+            return
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO copied (source_chat, dest_chat, source_id, dest_id, scope) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    self._pending,
+                )
+                # Copiada agora (retomada ou nova tentativa): sai da fila de falhas
+                conn.executemany(
+                    "DELETE FROM failed WHERE source_chat = ? AND dest_chat = ? AND source_id = ?",
+                    [p[:3] for p in self._pending],
+                )
+            self._pending = []
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao gravar diario de clonagem: {e}")
+
+    def reset(self, source_chat, dest_chat):
+        """Apaga o historico da tarefa para recomecar do zero."""
+        self._pending = [p for p in self._pending if (p[0], p[1]) != (source_chat, dest_chat)]
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "DELETE FROM copied WHERE source_chat = ? AND dest_chat = ?",
+                (source_chat, dest_chat),
+            )
+            conn.execute(
+                "DELETE FROM failed WHERE source_chat = ? AND dest_chat = ?",
+                (source_chat, dest_chat),
+            )
+
+    def record_failure(self, source_chat, dest_chat, source_id, error, final=False):
+        """
+        Registra (ou atualiza) uma mensagem que falhou. Gravado na hora: a fila
+        de falhas e pequena e nao pode se perder num fechamento abrupto.
+        A proxima tentativa fica para RETRY_BASE_DELAY * 2^(tentativas - 1);
+        final=True esgota as tentativas (ex: mensagem apagada na origem).
+        """
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT attempts FROM failed WHERE source_chat = ? AND dest_chat = ? AND source_id = ?",
+            (source_chat, dest_chat, source_id),
+        ).fetchone()
+        attempts = MAX_RETRY_ATTEMPTS if final else ((row[0] + 1) if row else 1)
+        next_retry_at = time.time() + RETRY_BASE_DELAY * 2 ** (attempts - 1)
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO failed (source_chat, dest_chat, source_id, error, attempts, next_retry_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (source_chat, dest_chat, source_id, str(error)[:500], attempts, next_retry_at),
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao gravar falha da mensagem {source_id}: {e}")
+        return attempts
+
+    def failures(self, source_chat, dest_chat, due_only=False, max_attempts=MAX_RETRY_ATTEMPTS):
+        """
+        Falhas da tarefa ainda com tentativas restantes, em ordem de id:
+        lista de (source_id, error, attempts, next_retry_at).
+        """
+        query = (
+            "SELECT source_id, error, attempts, next_retry_at FROM failed "
+            "WHERE source_chat = ? AND dest_chat = ? AND attempts < ?"
+        )
+        params = [source_chat, dest_chat, max_attempts]
+        if due_only:
+            query += " AND next_retry_at <= ?"
+            params.append(time.time())
+        return self._connect().execute(query + " ORDER BY source_id", params).fetchall()
+
+    def failed_ids(self, source_chat, dest_chat):
+        """Ids na fila de falhas da tarefa, inclusive os que esgotaram as tentativas."""
+        rows = self._connect().execute(
+            "SELECT source_id FROM failed WHERE source_chat = ? AND dest_chat = ?",
+            (source_chat, dest_chat),
+        )
+        return {r[0] for r in rows}
+
+    def failure_count(self, source_chat, dest_chat):
+        """Total na fila de falhas da tarefa, inclusive as que esgotaram as tentativas."""
+        row = self._connect().execute(
+            "SELECT COUNT(*) FROM failed WHERE source_chat = ? AND dest_chat = ?",
+            (source_chat, dest_chat),
+        ).fetchone()
+        return row[0]
+
+    def close(self):
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,209 @@
+import asyncio
+import os
+import shutil
+import sqlite3
+import time
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+MEDIA_CACHE_DIR = "media_cache"
+
+# Teto do cache em disco; acima disso os arquivos menos usados saem primeiro
+MEDIA_CACHE_MAX_BYTES = 2 * 2**30
+
+
+class MediaCache:
+    """
+    Cache local de midias baixadas, enderecado pelo file_unique_id (o mesmo
+    arquivo tem o mesmo id em qualquer mensagem/canal). Reexecucoes, a
+    repescagem e os varios destinos de um clone reaproveitam o download.
+
+    Em disco: <dir>/blobs/<id> (gravados em tmp/ e movidos com os.replace,
+    entao nunca ha arquivo pela metade com o nome final) e um indice SQLite
+    com tamanho e ultimo uso de cada arquivo, para o corte LRU.
+    O indice tambem guarda o file_id que cada conta recebeu ao subir o
+    arquivo: o proximo envio da mesma conta reaproveita, sem upload.
+    """
+
+    def __init__(self, path=MEDIA_CACHE_DIR, max_bytes=MEDIA_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.total = 0
+        self._conn = None
+        self._pins = {}  # file_unique_id -> envios usando o arquivo agora (nao pode sair no corte)
+        self._fetching = {}  # file_unique_id -> Future do download em andamento
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.join(self.path, "blobs"), exist_ok=True)
+            # Downloads interrompidos numa execucao anterior
+            shutil.rmtree(os.path.join(self.path, "tmp"), ignore_errors=True)
+            os.makedirs(os.path.join(self.path, "tmp"), exist_ok=True)
+            self._conn = sqlite3.connect(os.path.join(self.path, "index.db"))
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS blobs (
+                    unique_id TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS blobs_lru ON blobs (last_used)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS uploads (
+                    unique_id TEXT NOT NULL,
+                    account TEXT NOT NULL,
+                    file_id TEXT NOT NULL,
+                    PRIMARY KEY (unique_id, account)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.commit()
+            self.total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        return self._conn
+
+    def _blob_path(self, unique_id):
+        return os.path.join(self.path, "blobs", unique_id)
+
+    def contains(self, unique_id):
+        row = self._connect().execute("SELECT 1 FROM blobs WHERE unique_id = ?", (unique_id,)).fetchone()
+        return row is not None
+
+    def _lookup(self, unique_id):
+        """Caminho do arquivo em cache (atualiza o ultimo uso) ou None."""
+        conn = self._connect()
+        row = conn.execute("SELECT size FROM blobs WHERE unique_id = ?", (unique_id,)).fetchone()
+        if row is None:
+            return None
+        path = self._blob_path(unique_id)
+        with conn:
+            if not os.path.exists(path):
+                # Apagado por fora: o indice se corrige sozinho
+                conn.execute("DELETE FROM blobs WHERE unique_id = ?", (unique_id,))
+                self.total -= row[0]
+                return None
+            conn.execute("UPDATE blobs SET last_used = ? WHERE unique_id = ?", (time.time(), unique_id))
+        return path
+
+    async def fetch(self, unique_id, download):
+        """
+        Caminho do arquivo, baixando com `await download(caminho_tmp)` so se
+        ainda nao estiver em cache. Downloads simultaneos do mesmo arquivo
+        (ex: varios destinos) viram um so. O arquivo fica preso ate release().
+        """
+        while True:
+            path = self._lookup(unique_id)
+            if path is not None:
+                self._pin(unique_id)
+                return path
+            pending = self._fetching.get(unique_id)
+            if pending is None:
+                break
+            try:
+                await asyncio.shield(pending)
+            except Exception:
+                pass  # Quem baixava falhou: tenta por conta propria
+
+        future = asyncio.get_running_loop().create_future()
+        self._fetching[unique_id] = future
+        tmp = os.path.join(self.path, "tmp", f"{unique_id}.{id(future)}")
+        try:
+            await download(tmp)
+            path = self._store(unique_id, tmp)
+            future.set_result(path)
+            return path
+        except BaseException as e:
+            future.set_exception(e if isinstance(e, Exception) else RuntimeError("download cancelado"))
+            future.exception()  # Evita aviso de excecao nao lida sem outros interessados
+            try:
+                os.remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+        finally:
+            self._fetching.pop(unique_id, None)
+
+    def _store(self, unique_id, tmp):
+        conn = self._connect()
+        size = os.path.getsize(tmp)
+        path = self._blob_path(unique_id)
+        os.replace(tmp, path)
+        with conn:
+            row = conn.execute("SELECT size FROM blobs WHERE unique_id = ?", (unique_id,)).fetchone()
+            if row:
+                self.total -= row[0]
+            conn.execute(
+                "INSERT OR REPLACE INTO blobs (unique_id, size, last_used) VALUES (?, ?, ?)",
+                (unique_id, size, time.time()),
+            )
+        self.total += size
+        self._pin(unique_id)
+        self._evict()
+        return path
+
+    def _pin(self, unique_id):
+        self._pins[unique_id] = self._pins.get(unique_id, 0) + 1
+
+    def release(self, unique_id):
+        """O envio terminou de usar o arquivo: ele volta a poder sair no corte LRU."""
+        count = self._pins.get(unique_id, 0) - 1
+        if count > 0:
+            self._pins[unique_id] = count
+        else:
+            self._pins.pop(unique_id, None)
+            # O corte pode ter ficado pendente enquanto o arquivo estava preso
+            self._evict()
+
+    def _evict(self):
+        """Remove os arquivos menos usados (menos os presos) ate caber no teto."""
+        if self.total <= self.max_bytes:
+            return
+        conn = self._connect()
+        rows = conn.execute("SELECT unique_id, size FROM blobs ORDER BY last_used").fetchall()
+        evicted = []
+        for unique_id, size in rows:
+            if self.total <= self.max_bytes:
+                break
+            if unique_id in self._pins:
+                continue
+            try:
+                os.remove(self._blob_path(unique_id))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Nao foi possivel remover {unique_id} do cache de midia: {e}")
+                continue
+            evicted.append((unique_id,))
+            self.total -= size
+        if evicted:
+            with conn:
+                conn.executemany("DELETE FROM blobs WHERE unique_id = ?", evicted)
+
+    def uploaded_file_id(self, unique_id, account):
+        """file_id que `account` recebeu ao subir este arquivo, ou None."""
+        row = self._connect().execute(
+            "SELECT file_id FROM uploads WHERE unique_id = ? AND account = ?",
+            (unique_id, account),
+        ).fetchone()
+        return row[0] if row else None
+
+    def remember_upload(self, unique_id, account, file_id):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO uploads (unique_id, account, file_id) VALUES (?, ?, ?)",
+                (unique_id, account, file_id),
+            )
+
+    def forget_upload(self, unique_id, account):
+        """file_id recusado pelo Telegram: o proximo envio sobe o arquivo de novo."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM uploads WHERE unique_id = ? AND account = ?", (unique_id, account))
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
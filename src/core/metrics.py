@@ -0,0 +1,220 @@
+import asyncio
+import bisect
+import json
+import time
+from collections import deque
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+METRICS_SNAPSHOT_FILE = "darkogram_metrics.jsonl"
+
+# Limites (segundos) dos baldes de latencia das estrategias
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Janela usada para calcular mensagens por segundo
+THROUGHPUT_WINDOW = 60.0
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Histogram:
+    """Histograma cumulativo no formato do Prometheus (baldes fixos + soma + contagem)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # ultimo = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, n in zip(list(self.buckets) + ["+Inf"], self.counts):
+            total += n
+            yield bound, total
+
+
+class MetricsRegistry:
+    """
+    Contadores e histogramas da clonagem, com rotulos. Atualizado pelo
+    Cloner, pelo rate limiter e pelo pool; lido pelo MetricsExporter.
+    Tudo roda no mesmo event loop, entao nao ha travas.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.counters = {}  # nome -> {rotulos: valor}
+        self.histograms = {}  # nome -> {rotulos: Histogram}
+        self.help = {}
+        self._copied = deque()  # (instante, quantidade) para a vazao recente
+
+    def inc(self, name, value=1, help="", **labels):
+        series = self.counters.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0) + value
+        if help:
+            self.help.setdefault(name, help)
+
+    def observe(self, name, value, help="", **labels):
+        series = self.histograms.setdefault(name, {})
+        key = _label_key(labels)
+        if key not in series:
+            series[key] = Histogram()
+        series[key].observe(value)
+        if help:
+            self.help.setdefault(name, help)
+
+    def record_copied(self, count=1):
+        self.inc("darkogram_messages_copied_total", count, help="Mensagens copiadas")
+        now = time.monotonic()
+        self._copied.append((now, count))
+        while self._copied and now - self._copied[0][0] > THROUGHPUT_WINDOW:
+            self._copied.popleft()
+
+    def messages_per_second(self):
+        now = time.monotonic()
+        recent = sum(n for at, n in self._copied if now - at <= THROUGHPUT_WINDOW)
+        if not recent:
+            return 0.0
+        # Piso de 1s para o inicio da janela nao gerar taxas absurdas
+        elapsed = max(1.0, min(THROUGHPUT_WINDOW, now - self._copied[0][0]))
+        return recent / elapsed
+
+    def render_prometheus(self):
+        """Texto no formato de exposicao do Prometheus."""
+        lines = []
+        for name, series in sorted(self.counters.items()):
+            if name in self.help:
+                lines.append(f"# HELP {name} {self.help[name]}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in series.items():
+                lines.append(f"{name}{_format_labels(key)} {value}")
+
+        for name, series in sorted(self.histograms.items()):
+            if name in self.help:
+                lines.append(f"# HELP {name} {self.help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in series.items():
+                for bound, total in hist.cumulative():
+                    lines.append(f"{name}_bucket{_format_labels(key, [('le', bound)])} {total}")
+                lines.append(f"{name}_sum{_format_labels(key)} {hist.sum}")
+                lines.append(f"{name}_count{_format_labels(key)} {hist.count}")
+
+        lines.append("# TYPE darkogram_messages_per_second gauge")
+        lines.append(f"darkogram_messages_per_second {self.messages_per_second():.3f}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """Dicionario serializavel com o estado atual."""
+        return {
+            "time": round(time.time(), 3),
+            "uptime": round(time.time() - self.started, 1),
+            "messages_per_second": round(self.messages_per_second(), 3),
+            "counters": {
+                name: {",".join(f"{k}={v}" for k, v in key): value for key, value in series.items()}
+                for name, series in self.counters.items()
+            },
+            "histograms": {
+                name: {
+                    ",".join(f"{k}={v}" for k, v in key): {
+                        "count": hist.count,
+                        "sum": round(hist.sum, 3),
+                        "buckets": dict(hist.cumulative()),
+                    }
+                    for key, hist in series.items()
+                }
+                for name, series in self.histograms.items()
+            },
+        }
+
+
+class MetricsExporter:
+    """
+    Expoe o registro em http://127.0.0.1:<port>/metrics (Prometheus) e
+    /metrics.json, e grava um snapshot JSON por linha a cada `interval`
+    segundos. port=0 desliga o servidor; snapshot_path=None desliga os snapshots.
+    """
+
+    def __init__(self, registry, port=0, snapshot_path=METRICS_SNAPSHOT_FILE, interval=30.0):
+        self.registry = registry
+        self.port = port
+        self.snapshot_path = snapshot_path
+        self.interval = interval
+        self._server = None
+        self._snapshot_task = None
+
+    async def start(self):
+        if self.port:
+            try:
+                self._server = await asyncio.start_server(self._handle, "127.0.0.1", self.port)
+                logger.info(f"Metricas em http://127.0.0.1:{self.port}/metrics")
+            except OSError as e:
+                logger.warning(f"Nao foi possivel abrir a porta de metricas {self.port}: {e}")
+        if self.snapshot_path and self._snapshot_task is None:
+            self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+
+    async def stop(self):
+        if self._snapshot_task:
+            self._snapshot_task.cancel()
+            self._snapshot_task = None
+            self.write_snapshot()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def write_snapshot(self):
+        try:
+            with open(self.snapshot_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.registry.snapshot()) + "\n")
+        except Exception as e:
+            logger.error(f"Erro ao gravar snapshot de metricas: {e}")
+
+    async def _snapshot_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.write_snapshot()
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await reader.readline()
+            parts = request.decode("latin-1").split()
+            path = parts[1] if len(parts) > 1 else "/"
+            if path == "/metrics":
+                status, ctype, body = "200 OK", "text/plain; version=0.0.4", self.registry.render_prometheus()
+            elif path == "/metrics.json":
+                status, ctype, body = "200 OK", "application/json", json.dumps(self.registry.snapshot())
+            else:
+                status, ctype, body = "404 Not Found", "text/plain", "not found\n"
+            data = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.debug(f"Erro no endpoint de metricas: {e}")
+        finally:
+            writer.close()
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics():
+    """Registro de metricas do processo (um so, como o logger)."""
+    return _registry
@@ -0,0 +1,85 @@
+import time
+from pyrogram import Client
+from src.core.ratelimit import SendBudget
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+# Erros que invalidam a sessao inteira, nao so a mensagem
+SESSION_FATAL_ERRORS = {
+    "AUTH_KEY_UNREGISTERED",
+    "AUTH_KEY_DUPLICATED",
+    "SESSION_REVOKED",
+    "SESSION_EXPIRED",
+    "USER_DEACTIVATED",
+    "USER_DEACTIVATED_BAN",
+}
+
+
+class PoolMember:
+    """
+    Uma sessao autenticada do pool com seu proprio estado de flood e seu
+    proprio orcamento de envios (cada sessao e uma conta). Os limitadores de
+    cada job para esta sessao usam ela como gate, entao um FloodWait visto
+    por um job vale para todos.
+    """
+
+    def __init__(self, name, client: Client, budget=None):
+        self.name = name
+        self.client = client
+        # Orcamento da conta desta sessao, dividido entre os jobs pela chave/peso de cada um
+        self.budget = budget or SendBudget()
+        self.healthy = True
+        self.blocked_until = 0.0
+        self.sent = 0
+        self.last_used = 0.0
+
+    @property
+    def available(self):
+        return self.healthy and time.monotonic() >= self.blocked_until
+
+
+class SessionPool:
+    """
+    Varias contas usadas para ENVIAR (a leitura da origem fica numa so).
+    Distribui os envios entre as sessoes saudaveis, marca FloodWait por
+    sessao e tira do rodizio as que perderam autenticacao.
+    """
+
+    def __init__(self, members=None):
+        self.members = list(members or [])
+
+    def add(self, name, client: Client, budget=None):
+        self.members.append(PoolMember(name, client, budget))
+
+    def pick(self, names=None):
+        """
+        Sessao para o proximo envio: a disponivel usada ha mais tempo.
+        Se todas estao em FloodWait, a que libera primeiro (o rate limiter
+        do job espera o tempo restante).
+        """
+        candidates = [m for m in self.members if m.healthy and (names is None or m.name in names)]
+        if not candidates:
+            return None
+        available = [m for m in candidates if m.available]
+        if available:
+            member = min(available, key=lambda m: m.last_used)
+        else:
+            member = min(candidates, key=lambda m: m.blocked_until)
+        member.last_used = time.monotonic()
+        return member
+
+    def report_success(self, member):
+        member.sent += 1
+
+    def report_flood(self, member, seconds):
+        member.blocked_until = max(member.blocked_until, time.monotonic() + seconds)
+        logger.warning(f"Sessao {member.name} em FloodWait por {seconds}s, trocando de sessao")
+
+    def report_dead(self, member, error):
+        member.healthy = False
+        logger.error(f"Sessao {member.name} removida do pool: {error}")
+
+    @property
+    def healthy_count(self):
+        return sum(1 for m in self.members if m.healthy)
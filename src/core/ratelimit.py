@@ -0,0 +1,185 @@
+import asyncio
+import heapq
+import itertools
+import time
+from pyrogram.errors import FloodWait
+from src.core.metrics import get_metrics
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class TokenBucket:
+    """
+    Token bucket com taxa adaptativa.
+    Cada FloodWait bloqueia o bucket pelo tempo exato pedido pelo Telegram e
+    corta a taxa pela metade; cada envio bem-sucedido sobe a taxa aos poucos.
+    """
+
+    def __init__(self, name, rate, min_rate=0.05, max_rate=None, burst=1, recovery=0.02):
+        self.name = name
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate * 2
+        self.burst = burst
+        self.recovery = recovery
+        self.tokens = burst
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+
+    async def acquire(self):
+        """Espera ate haver um token disponivel e o consome."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.recovery)
+
+    def on_flood_wait(self, seconds):
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0
+        logger.warning(f"FloodWait de {seconds}s no bucket '{self.name}', taxa reduzida para {self.rate:.2f}/s")
+
+
+class SendBudget:
+    """
+    Orcamento global de envios por segundo da conta, dividido entre jobs
+    concorrentes por fila justa ponderada (start-time fair queuing): cada job
+    recebe envios na proporcao do seu peso, e um job ocioso nao acumula
+    credito para atropelar os outros depois.
+    """
+
+    def __init__(self, rate=5.0):
+        self.rate = rate
+        self._virtual = {}
+        self._global_virtual = 0.0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._next_slot = 0.0
+        self._dispatcher = None
+
+    async def acquire(self, key, weight=1):
+        """Espera a vez do job `key` no orcamento global."""
+        start = max(self._virtual.get(key, 0.0), self._global_virtual)
+        finish = start + 1.0 / max(weight, 1e-6)
+        self._virtual[key] = finish
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (finish, next(self._seq), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        while self._waiters:
+            now = time.monotonic()
+            if now < self._next_slot:
+                await asyncio.sleep(self._next_slot - now)
+                continue
+            finish, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue  # Job cancelado enquanto esperava
+            self._global_virtual = finish
+            self._next_slot = max(now, self._next_slot) + 1.0 / self.rate
+            future.set_result(None)
+
+    def forget(self, key):
+        """Remove o estado de um job encerrado."""
+        self._virtual.pop(key, None)
+
+
+class RateLimiter:
+    """
+    Limitador com buckets separados para envios de texto e de midia.
+    Com um SendBudget, cada envio tambem consome do orcamento global da conta
+    sob a chave/peso do job. Com um `gate` (objeto com blocked_until, ex: a
+    sessao do pool), os envios tambem esperam o FloodWait dele.
+    """
+
+    def __init__(self, text_rate=2.0, media_rate=1.0, max_retries=3,
+                 budget=None, budget_key=None, weight=1, gate=None):
+        self.text_rate = text_rate
+        self.media_rate = media_rate
+        self.buckets = {
+            "text": TokenBucket("text", text_rate, max_rate=text_rate * 3),
+            "media": TokenBucket("media", media_rate, max_rate=media_rate * 3),
+        }
+        self.max_retries = max_retries
+        self.budget = budget
+        self.budget_key = budget_key
+        self.weight = weight
+        self.gate = gate
+
+    def spawn(self, max_retries=None, gate=None, budget=None):
+        """
+        Novo limitador com buckets proprios, mas nas mesmas taxas e no mesmo
+        orcamento global (ou em `budget`, ex: o da conta de outra sessao),
+        com a mesma chave/peso do job.
+        """
+        return RateLimiter(
+            self.text_rate,
+            self.media_rate,
+            self.max_retries if max_retries is None else max_retries,
+            budget=budget or self.budget,
+            budget_key=self.budget_key,
+            weight=self.weight,
+            gate=gate,
+        )
+
+    def blocked_for(self):
+        """Segundos ate acabar o FloodWait mais longo em andamento (0 se nenhum)."""
+        blocked_until = max(bucket.blocked_until for bucket in self.buckets.values())
+        if self.gate:
+            blocked_until = max(blocked_until, self.gate.blocked_until)
+        return max(0.0, blocked_until - time.monotonic())
+
+    @staticmethod
+    def kind_for(msg):
+        """Bucket usado para enviar a mensagem."""
+        return "media" if msg.media else "text"
+
+    async def call(self, kind, func, *args, **kwargs):
+        """
+        Executa func respeitando o bucket. Em FloodWait, espera o tempo pedido e
+        repete a MESMA chamada (ate max_retries) em vez de desistir dela.
+        """
+        bucket = self.buckets[kind]
+        attempt = 0
+        while True:
+            await bucket.acquire()
+            if self.gate:
+                # FloodWait da sessao pode ter vindo de outro job
+                wait = self.gate.blocked_until - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            if self.budget:
+                await self.budget.acquire(self.budget_key, self.weight)
+            try:
+                result = await func(*args, **kwargs)
+            except FloodWait as e:
+                bucket.on_flood_wait(e.value)
+                metrics = get_metrics()
+                metrics.inc("darkogram_flood_waits_total", help="FloodWaits recebidos", kind=kind)
+                metrics.inc("darkogram_flood_wait_seconds_total", e.value, help="Segundos de FloodWait pedidos", kind=kind)
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                continue
+            bucket.on_success()
+            return result
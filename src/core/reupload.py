@@ -0,0 +1,195 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from collections import deque
+from src.core.dedup import MEDIA_ATTRS
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+# Espaco maximo em disco dos arquivos baixados e ainda nao reenviados
+SPOOL_MAX_BYTES = 512 * 2**20
+
+# Downloads simultaneos (cada um segura no maximo um pedaco de 1 MiB na memoria)
+MAX_DOWNLOADS = 2
+
+
+def media_of(msg):
+    """Objeto de midia da mensagem (photo, video, ...) ou None."""
+    for attr in MEDIA_ATTRS:
+        media = getattr(msg, attr, None)
+        if media is not None:
+            return media
+    return None
+
+
+class SpoolBudget:
+    """
+    Semaforo de bytes, atendido em ordem de chegada: um download so comeca
+    quando cabe no spool. Arquivo maior que o spool inteiro espera o spool
+    esvaziar e ocupa tudo sozinho (ex: video de 2 GB com spool de 512 MB).
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.used = 0
+        self._waiters = deque()  # (bytes, future)
+
+    async def acquire(self, size, urgent=False):
+        """
+        Reserva `size` bytes (limitado a capacidade). Retorna o que foi reservado.
+        urgent=True reserva na hora, mesmo estourando: e a mensagem que o envio
+        esta esperando, e o espaco ocupado pelas seguintes so volta depois dela.
+        """
+        size = min(size, self.capacity)
+        if urgent or (not self._waiters and self.used + size <= self.capacity):
+            self.used += size
+            return size
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((size, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(size)
+            raise
+        return size
+
+    def release(self, size):
+        self.used -= size
+        while self._waiters:
+            size, future = self._waiters[0]
+            if future.cancelled():
+                self._waiters.popleft()
+                continue
+            if self.used + size > self.capacity and self.used > 0:
+                break
+            self._waiters.popleft()
+            self.used += size
+            future.set_result(None)
+
+
+class MediaReuploader:
+    """
+    Spool de midia para reenviar conteudo protegido: baixa pedaco por pedaco
+    (stream_media) para arquivos temporarios, com limite de downloads
+    simultaneos e de bytes em disco. prefetch() adianta os downloads da
+    pagina, entao a mensagem N+1 baixa enquanto a N sobe.
+
+    Com um MediaCache os arquivos baixam direto para o cache (e saem dele
+    quando ja estao la); o spool continua limitando o que foi baixado e
+    ainda nao subiu.
+
+    Toda mensagem entregue ao prefetch precisa de um discard() no fim
+    (copiada ou nao), senao o arquivo segura espaco do spool.
+    """
+
+    def __init__(self, client, spool_dir=None, max_spool_bytes=SPOOL_MAX_BYTES, max_downloads=MAX_DOWNLOADS,
+                 cache=None):
+        self.client = client
+        self.cache = cache
+        self.spool_dir = spool_dir
+        self.budget = SpoolBudget(max_spool_bytes)
+        self._download_slots = asyncio.Semaphore(max_downloads)
+        self._downloads = {}  # (chat_id, msg_id) -> Task com (caminho, bytes reservados, id no cache)
+        self._own_dir = None
+
+    def _key(self, msg):
+        return (msg.chat.id, msg.id)
+
+    def _path(self, msg):
+        if self.spool_dir is None:
+            self.spool_dir = self._own_dir = tempfile.mkdtemp(prefix="darkogram_spool_")
+        os.makedirs(self.spool_dir, exist_ok=True)
+        return os.path.join(self.spool_dir, f"{msg.chat.id}_{msg.id}")
+
+    def prefetch(self, messages, account=None):
+        """
+        Agenda o download das midias, na ordem em que serao enviadas. Pula as
+        que `account` ja subiu antes (o envio reaproveita o file_id do cache).
+        """
+        for msg in messages:
+            media = media_of(msg)
+            if media is None or self._key(msg) in self._downloads:
+                continue
+            if self.cache and account and self.cache.uploaded_file_id(media.file_unique_id, account):
+                continue
+            self._downloads[self._key(msg)] = asyncio.create_task(self._download(msg))
+
+    async def take(self, msg):
+        """Caminho do arquivo da midia ja no spool (baixa agora se nao foi adiantada)."""
+        task = self._downloads.get(self._key(msg))
+        if task is not None and task.done() and (task.cancelled() or task.exception() is not None):
+            # Download anterior falhou (ex: file_reference vencida): baixa de novo
+            del self._downloads[self._key(msg)]
+        if self._key(msg) not in self._downloads:
+            self._downloads[self._key(msg)] = asyncio.create_task(self._download(msg, urgent=True))
+        path, _, _ = await asyncio.shield(self._downloads[self._key(msg)])
+        return path
+
+    def discard(self, msg):
+        """Apaga o arquivo da mensagem e devolve o espaco ao spool."""
+        task = self._downloads.pop(self._key(msg), None)
+        if task is None:
+            return
+        if not task.done():
+            task.cancel()
+            return
+        if task.cancelled() or task.exception() is not None:
+            return
+        path, reserved, cached = task.result()
+        if cached:
+            self.cache.release(cached)
+        else:
+            self._remove(path)
+        self.budget.release(reserved)
+
+    async def close(self):
+        """Cancela downloads pendentes e remove o spool."""
+        for task in self._downloads.values():
+            task.cancel()
+        for result in await asyncio.gather(*self._downloads.values(), return_exceptions=True):
+            if isinstance(result, tuple) and result[2]:
+                self.cache.release(result[2])
+        self._downloads = {}
+        if self._own_dir:
+            shutil.rmtree(self._own_dir, ignore_errors=True)
+            self._own_dir = self.spool_dir = None
+        self.budget = SpoolBudget(self.budget.capacity)
+
+    async def _download(self, msg, urgent=False):
+        media = media_of(msg)
+        unique_id = media.file_unique_id if self.cache else None
+        reserved = 0
+        if not (unique_id and self.cache.contains(unique_id)):
+            reserved = await self.budget.acquire(getattr(media, "file_size", 0) or 0, urgent=urgent)
+        try:
+            if unique_id:
+                path = await self.cache.fetch(unique_id, lambda tmp: self._stream_to(msg, tmp))
+            else:
+                path = self._path(msg)
+                try:
+                    await self._stream_to(msg, path)
+                except BaseException:
+                    self._remove(path)
+                    raise
+        except BaseException:
+            self.budget.release(reserved)
+            raise
+        return path, reserved, unique_id
+
+    async def _stream_to(self, msg, path):
+        async with self._download_slots:
+            with open(path, "wb") as f:
+                async for chunk in self.client.stream_media(msg):
+                    f.write(chunk)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Nao foi possivel apagar {path} do spool: {e}")
@@ -0,0 +1,203 @@
+import asyncio
+import heapq
+import itertools
+import traceback
+from pyrogram import Client
+from src.core.cloner import Cloner
+from src.core.dedup import DedupIndex
+from src.core.journal import CloneJournal
+from src.core.media_cache import MediaCache
+from src.core.ratelimit import RateLimiter, SendBudget
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+# Pesos de prioridade: fatia do orcamento global de envios de cada tarefa
+PRIORITIES = {
+    "Baixa": 1,
+    "Normal": 2,
+    "Alta": 4,
+}
+
+
+class CloneTask:
+    """Uma tarefa origem -> destino(s) na fila do agendador."""
+
+    def __init__(self, task_id, origin_chat_id, destination_chat_ids, priority=2, mirror=False,
+                 deduplicate=False, retry=False):
+        self.id = task_id
+        self.origin_chat_id = origin_chat_id
+        self.destination_chat_ids = list(destination_chat_ids)
+        self.priority = priority
+        self.mirror = mirror
+        self.deduplicate = deduplicate
+        self.retry = retry  # So reprocessa a fila de falhas dos destinos
+        self.status = "pendente"
+        self.cloner = None
+        self._runner = None
+
+
+class CloneScheduler:
+    """
+    Executa varias tarefas de clonagem ao mesmo tempo (ate max_concurrent).
+    Tarefas de maior prioridade saem da fila primeiro, e todas dividem um
+    unico SendBudget da conta na proporcao da prioridade.
+    """
+
+    def __init__(self, client: Client, max_concurrent=3, budget=None, journal=None,
+                 progress_callback=None, log_callback=None, on_change=None, pool=None):
+        self.client = client
+        self.pool = pool
+        self.max_concurrent = max_concurrent
+        self.budget = budget or SendBudget()
+        self.journal = journal or CloneJournal()
+        self.dedup_index = DedupIndex()
+        self.media_cache = MediaCache()
+        self.progress_callback = progress_callback
+        self.log_callback = log_callback
+        self.on_change = on_change
+        self.tasks = []
+        self._pending = []
+        self._seq = itertools.count(1)
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def pending_count(self):
+        return sum(1 for t in self.tasks if t.status == "pendente")
+
+    @property
+    def running_count(self):
+        return sum(1 for t in self.tasks if t.status == "executando")
+
+    @property
+    def active_count(self):
+        return self.pending_count + self.running_count
+
+    def submit(self, origin_chat_id, destination_chat_ids, priority=2, mirror=False, deduplicate=False, retry=False):
+        """Coloca uma tarefa na fila e retorna o CloneTask."""
+        task = CloneTask(next(self._seq), origin_chat_id, destination_chat_ids, priority, mirror, deduplicate, retry)
+        self.tasks.append(task)
+        heapq.heappush(self._pending, (-priority, task.id, task))
+        self._idle.clear()
+        self._kick()
+        self._changed()
+        return task
+
+    def _kick(self):
+        """Inicia tarefas pendentes enquanto houver vaga."""
+        while self._pending and self.running_count < self.max_concurrent:
+            _, _, task = heapq.heappop(self._pending)
+            if task.status != "pendente":
+                continue
+            task.status = "executando"
+            limiter = RateLimiter(budget=self.budget, budget_key=task.id, weight=task.priority)
+            task.cloner = Cloner(
+                self.client,
+                rate_limiter=limiter,
+                journal=self.journal,
+                pool=self.pool,
+                dedup_index=self.dedup_index,
+                media_cache=self.media_cache,
+            )
+            task.cloner.deduplicate = task.deduplicate
+            task._runner = asyncio.create_task(self._run(task))
+
+    async def _run(self, task):
+        log = self._task_log(task)
+
+        try:
+            if task.retry:
+                results = []
+                for destination_chat_id in task.destination_chat_ids:
+                    if task.cloner.stop_requested:
+                        break
+                    await task.cloner.retry_failed(task.origin_chat_id, destination_chat_id, log_callback=log)
+                    results.append(task.cloner.result)
+                task.cloner.result = task.cloner.merge_results(results)
+            elif len(task.destination_chat_ids) > 1:
+                await task.cloner.clone_to_many(
+                    task.origin_chat_id,
+                    task.destination_chat_ids,
+                    progress_callback=self._task_progress(task),
+                    log_callback=log,
+                )
+            else:
+                destination_chat_id = task.destination_chat_ids[0]
+                clone_fn = task.cloner.mirror_chat if task.mirror else task.cloner.clone_chat
+                await clone_fn(
+                    task.origin_chat_id,
+                    destination_chat_id,
+                    progress_callback=self._task_progress(task, destination_chat_id),
+                    log_callback=log,
+                )
+            # Os metodos do Cloner nao propagam erros: o desfecho vem do resumo
+            result = task.cloner.result or {}
+            if result.get("error"):
+                task.status = "falhou"
+                logger.error(f"Tarefa #{task.id} falhou: {result['error']}")
+            elif result.get("cancelled") or task.cloner.stop_requested:
+                task.status = "cancelada"
+            else:
+                task.status = "concluida"
+        except Exception:
+            task.status = "falhou"
+            logger.error(f"Tarefa #{task.id} falhou: {traceback.format_exc()}")
+        finally:
+            self.budget.forget(task.id)
+            self._kick()
+            if self.active_count == 0:
+                self._idle.set()
+            self._changed()
+
+    def _task_log(self, task):
+        if not self.log_callback:
+            return None
+
+        async def log(msg, level="info"):
+            await self.log_callback(f"[#{task.id}] {msg}", level)
+
+        return log
+
+    def _task_progress(self, task, destination_chat_id=None):
+        """
+        Progresso com chave "tarefa:destino". Sem destino fixo, o callback
+        recebe o destino como terceiro argumento (formato do clone_to_many).
+        """
+        if not self.progress_callback:
+            return None
+
+        async def progress(current, total, destination=destination_chat_id):
+            await self.progress_callback(current, total, f"{task.id}:{destination}")
+
+        return progress
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
+
+    def pause_all(self):
+        for task in self.tasks:
+            if task.status == "executando" and task.cloner:
+                task.cloner.pause()
+
+    def resume_all(self):
+        for task in self.tasks:
+            if task.status == "executando" and task.cloner:
+                task.cloner.resume()
+
+    def stop_all(self):
+        """Cancela as tarefas em execucao e descarta as pendentes."""
+        for task in self.tasks:
+            if task.status == "pendente":
+                task.status = "cancelada"
+            elif task.status == "executando" and task.cloner:
+                task.cloner.stop()
+        self._pending = []
+        if self.running_count == 0:
+            self._idle.set()
+        self._changed()
+
+    async def wait(self):
+        """Espera todas as tarefas terminarem."""
+        await self._idle.wait()
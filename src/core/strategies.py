@@ -0,0 +1,74 @@
+import time
+
+# Retorno de uma estrategia que nao se aplica a mensagem (ex: texto puro sem texto)
+NOT_APPLICABLE = object()
+
+# Latencia assumida para estrategias ainda nao tentadas no job
+DEFAULT_LATENCY = 1.0
+
+
+class StrategyStats:
+    """Tentativas, sucessos e latencia acumulada de uma estrategia no job atual."""
+
+    def __init__(self):
+        self.attempts = 0
+        self.successes = 0
+        self.latency_total = 0.0
+
+    def cost(self):
+        """Custo esperado por sucesso: latencia media / taxa de sucesso (suavizada)."""
+        success_rate = (self.successes + 1) / (self.attempts + 2)
+        avg_latency = self.latency_total / self.attempts if self.attempts else DEFAULT_LATENCY
+        return avg_latency / success_rate
+
+
+class StrategyChain:
+    """
+    Lista ordenavel de estrategias de copia.
+    Estrategias sem perda (copy, resend, reupload, raw_forward) sao ordenadas pelo custo
+    observado; as com perda (sem markup, texto puro) ficam sempre no fim, na
+    ordem original, para nunca trocar fidelidade por velocidade.
+    Estrategias marcadas com skip() nao sao tentadas no job (allow() desfaz).
+    """
+
+    def __init__(self):
+        self._strategies = []
+        self.stats = {}
+        self.skipped = set()
+
+    def add(self, name, func, lossy=False):
+        """Registra uma estrategia. func(msg, destino) retorna o id no destino ou NOT_APPLICABLE."""
+        self._strategies.append((name, func, lossy))
+        self.stats[name] = StrategyStats()
+
+    def reset(self):
+        """Zera estatisticas e restricoes para um novo job."""
+        self.stats = {name: StrategyStats() for name, _, _ in self._strategies}
+        self.skipped = set()
+
+    def skip(self, name):
+        self.skipped.add(name)
+
+    def allow(self, name):
+        self.skipped.discard(name)
+
+    def ordered(self):
+        """Estrategias (nome, func) na ordem em que devem ser tentadas."""
+        active = [
+            (index, name, func, lossy)
+            for index, (name, func, lossy) in enumerate(self._strategies)
+            if name not in self.skipped
+        ]
+        lossless = sorted(
+            (s for s in active if not s[3]),
+            key=lambda s: (self.stats[s[1]].cost(), s[0]),
+        )
+        lossy = [s for s in active if s[3]]
+        return [(name, func) for _, name, func, _ in lossless + lossy]
+
+    def record(self, name, success, started):
+        stats = self.stats[name]
+        stats.attempts += 1
+        stats.latency_total += time.monotonic() - started
+        if success:
+            stats.successes += 1
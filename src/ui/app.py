@@ -2,10 +2,11 @@ import flet as ft
 from flet import Colors as colors, Icons as icons
 import asyncio
 import traceback
-from pyrogram import types as pyrogram_types
-from src.core.client import TelegramClient
-from src.core.cloner import Cloner
+from collections import deque
+from src.utils.activity_log import ActivityLog
 from src.utils.logger import get_logger
+from src.utils.startup import startup_timer
+from src.ui.render import RenderScheduler
 from src.ui.components import (
     BG_COLOR, SURFACE_COLOR, PRIMARY_ACCENT, WHITE, SECONDARY_TEXT,
     StatsCard, SelectionTile, PrimaryButton, LogItem,
@@ -13,6 +14,25 @@ from src.ui.components import (
 
 logger = get_logger()
 
+# Quantas entradas do feed viram controles na tela (o resto fica no arquivo)
+VISIBLE_LOG_ITEMS = 50
+
+# Quadros por segundo das atualizacoes de progresso/log
+RENDER_FPS = 10
+
+# Segundos entre gravacoes do buffer do log de atividades no arquivo
+ACTIVITY_FLUSH_INTERVAL = 2.0
+
+
+def _import_backend():
+    """
+    Importa Pyrogram e o nucleo, a parte mais pesada da abertura. Roda numa
+    thread enquanto a tela de carregamento ja esta visivel.
+    """
+    import src.core.client  # noqa: F401
+    import src.core.scheduler  # noqa: F401
+    import src.core.channel_cache  # noqa: F401
+
 
 class DarkoGramApp:
     def __init__(self, page: ft.Page):
@@ -26,61 +46,149 @@ class DarkoGramApp:
         self.page.window.width = 1100
         self.page.window.height = 750
 
-        self.client = TelegramClient()
-        self.cloner = None  # Criado apos conexao
+        self.client = None  # Criado apos importar o Pyrogram, fora da abertura da janela
+        self.scheduler = None  # Criado apos conexao
+        self.activity = ActivityLog()
+        self._pending_log = deque(maxlen=VISIBLE_LOG_ITEMS)
+
+        # Progresso, log e estatisticas viram um unico page.update() por quadro
+        self.renderer = RenderScheduler(self.page, fps=RENDER_FPS)
+        self.renderer.on_frame(self._render_pending_log)
+        self.renderer.on_frame(self._render_progress)
+        self.renderer.start()
+        self.page.run_task(self._flush_activity_loop)
+        self.page.on_disconnect = self.on_page_close
+        self.page.on_close = self.on_page_close
+        self.paused = False
 
         self.channels = []
         self.source_channel = None
-        self.dest_channel = None
+        self.dest_channels = []  # Varios destinos: origem lida uma vez so
+        self.dest_progress = {}
 
         self.init_ui()
 
-    def _ensure_cloner(self):
-        """Garante que o Cloner usa o Client atual."""
-        self.cloner = Cloner(self.client.app)
+    def _ensure_scheduler(self):
+        """Garante que o agendador de tarefas usa o Client atual."""
+        from src.core.scheduler import CloneScheduler
+
+        if self.scheduler is None or self.scheduler.client is not self.client.app:
+            self.scheduler = CloneScheduler(
+                self.client.app,
+                progress_callback=self.update_progress,
+                log_callback=self.log,
+                on_change=self.on_tasks_change,
+            )
 
     def init_ui(self):
         self.show_loading("Conectando ao Telegram...")
+        startup_timer.mark("tela de carregamento")
         self.page.run_task(self.check_connection)
 
     async def check_connection(self):
+        try:
+            await asyncio.to_thread(_import_backend)
+            startup_timer.mark("import do Pyrogram e do nucleo")
+            from src.core.client import TelegramClient
+            self.client = TelegramClient()
+            await self.start_metrics()
+        except Exception as e:
+            logger.error(f"Erro ao iniciar: {traceback.format_exc()}")
+            self.show_loading(f"Erro ao iniciar: {str(e)}")
+            return
+
         try:
             me = await self.client.try_connect()
+            startup_timer.mark("verificacao da sessao e conexao")
             if me:
                 # Mostra o dashboard IMEDIATAMENTE, canais carregam em background
-                self._ensure_cloner()
+                self._ensure_scheduler()
                 self.show_dashboard(me)
+                startup_timer.mark("dashboard")
+                startup_timer.report()
                 # Carrega canais em background
-                await self.load_channels_background()
+                await self.start_session_pool()
+                await self.load_channels_background(me)
             else:
                 # Cliente conectado via TCP mas nao autorizado
                 self.show_login()
+                startup_timer.mark("tela de login")
+                startup_timer.report()
         except Exception as e:
             self.show_error(f"Falha na conexao: {str(e)}")
             self.show_login()
 
-    async def load_channels_background(self):
-        """Carrega canais sem bloquear a UI."""
+    async def start_metrics(self):
+        """Endpoint Prometheus local e snapshots JSON das metricas de clonagem."""
+        from src.core.metrics import MetricsExporter, get_metrics
+        from src.utils.config import METRICS_PORT, METRICS_SNAPSHOT_INTERVAL
+
+        self.metrics_exporter = MetricsExporter(
+            get_metrics(),
+            port=METRICS_PORT,
+            interval=METRICS_SNAPSHOT_INTERVAL,
+        )
+        await self.metrics_exporter.start()
+
+    async def start_session_pool(self):
+        """Inicia as contas extras de envio, se configuradas."""
         try:
-            self.channels = await self.client.get_channels()
-            self.update_channel_dropdowns()
+            # A conta principal segue no orcamento do agendador; as extras tem o proprio
+            pool = await self.client.start_pool(budget=self.scheduler.budget if self.scheduler else None)
+        except Exception as e:
+            logger.error(f"Erro ao iniciar pool de sessoes: {e}")
+            return
+        # Com uma unica conta o pool so acrescentaria custo
+        if pool.healthy_count > 1 and self.scheduler:
+            self.scheduler.pool = pool
+            logger.info(f"Pool de envio com {pool.healthy_count} sessoes")
+
+    async def load_channels_background(self, user):
+        """
+        Preenche os dropdowns na hora com o cache da conta e atualiza a lista
+        em background, mesclando so os canais novos ou alterados e tirando
+        os que sairam da conta.
+        """
+        from src.core.channel_cache import ChannelCache
+
+        try:
+            cache = ChannelCache(user.id)
+            self.channels = cache.load()
+            if self.channels:
+                self.update_channel_dropdowns()
+            from_cache = bool(self.channels)
+            changed, removed = await self.client.refresh_channels(cache)
+            self.channels = list(cache.channels.values())
+            if from_cache:
+                self.update_channel_dropdowns(changed, removed)
+            else:
+                self.update_channel_dropdowns()
         except Exception as e:
             self.show_error(f"Erro ao carregar canais: {str(e)}")
 
-    def update_channel_dropdowns(self):
-        """Atualiza os dropdowns com os canais carregados."""
-        options = [
-            ft.dropdown.Option(
-                key=str(c["id"]),
-                text=f"{c['title']} ({c['type']})",
-            )
-            for c in self.channels
-        ]
+    @staticmethod
+    def _channel_option(c):
+        return ft.dropdown.Option(
+            key=str(c["id"]),
+            text=f"{c['title']} ({c['type']})",
+        )
 
-        if hasattr(self, "source_dd") and self.source_dd:
-            self.source_dd.options = options
-        if hasattr(self, "dest_dd") and self.dest_dd:
-            self.dest_dd.options = list(options)
+    def update_channel_dropdowns(self, changed=None, removed=()):
+        """
+        Atualiza os dropdowns com os canais carregados. Com `changed`, so
+        mescla esses canais nas opcoes existentes (novos entram no topo) e
+        tira os ids de `removed`.
+        """
+        if changed is None:
+            options = [self._channel_option(c) for c in self.channels]
+            if hasattr(self, "source_dd") and self.source_dd:
+                self.source_dd.options = options
+            if hasattr(self, "dest_dd") and self.dest_dd:
+                self.dest_dd.options = list(options)
+        else:
+            for dd in (getattr(self, "source_dd", None), getattr(self, "dest_dd", None)):
+                if dd:
+                    self._merge_options(dd, changed, removed)
 
         # Atualiza o card de estatisticas
         if hasattr(self, "channels_stat") and self.channels_stat:
@@ -90,7 +198,23 @@ class DarkoGramApp:
         if hasattr(self, "channels_loading_text") and self.channels_loading_text:
             self.channels_loading_text.visible = False
 
-        self.page.update()
+        if changed is None or changed or removed:
+            self.page.update()
+
+    def _merge_options(self, dropdown, changed, removed=()):
+        if removed:
+            gone = {str(i) for i in removed}
+            dropdown.options = [o for o in dropdown.options if o.key not in gone]
+        by_key = {o.key: o for o in dropdown.options}
+        new = []
+        for c in changed:
+            option = by_key.get(str(c["id"]))
+            if option is not None:
+                option.text = f"{c['title']} ({c['type']})"
+            else:
+                new.append(self._channel_option(c))
+        if new:
+            dropdown.options[0:0] = new
 
     def show_loading(self, mensagem):
         self.page.clean()
@@ -113,6 +237,8 @@ class DarkoGramApp:
         self.page.update()
 
     def show_dashboard(self, user):
+        from src.core.scheduler import PRIORITIES
+
         self.page.clean()
 
         first_name = user.first_name or "Usuario"
@@ -172,7 +298,7 @@ class DarkoGramApp:
         )
 
         self.dest_dd = ft.Dropdown(
-            text="Canal de Destino",
+            text="Adicionar Destino",
             width=350,
             options=[],
             on_select=self.on_dest_change,
@@ -184,27 +310,71 @@ class DarkoGramApp:
             border_color=PRIMARY_ACCENT,
         )
 
+        self.dest_chips = ft.Row([], wrap=True, spacing=8, alignment=ft.MainAxisAlignment.CENTER)
+
         self.channels_loading_text = ft.Row([
             ft.ProgressRing(width=16, height=16, color=PRIMARY_ACCENT, stroke_width=2),
             ft.Text("Carregando canais...", size=12, color=SECONDARY_TEXT),
         ], spacing=8)
 
         self.log_view = ft.ListView(expand=True, spacing=5, auto_scroll=True)
+        self.log_search = ft.TextField(
+            hint_text="Buscar no log (Enter)",
+            width=220,
+            height=36,
+            text_size=12,
+            content_padding=ft.padding.symmetric(horizontal=10),
+            bgcolor=SURFACE_COLOR,
+            color=WHITE,
+            border_color=SURFACE_COLOR,
+            border_radius=8,
+            on_submit=self.search_log,
+        )
+        self.log_search_active = False
 
         self.progress_bar = ft.ProgressBar(color=PRIMARY_ACCENT, bgcolor=SURFACE_COLOR, value=0)
         self.progress_text = ft.Text("Pronto", color=SECONDARY_TEXT, size=13)
 
         self.channels_stat = StatsCard("Canais", "...", icons.LIST_ROUNDED, colors.BLUE_400)
+        active_tasks = self.scheduler.active_count if self.scheduler else 0
+        self.tasks_stat = StatsCard("Tarefas", str(active_tasks), icons.TASK_ROUNDED, colors.ORANGE_400)
 
         # Botoes de acao da clonagem
-        self.start_btn = PrimaryButton("INICIAR CLONAGEM", self.start_cloning, icon=icons.PLAY_ARROW_ROUNDED, width=220)
+        self.start_btn = PrimaryButton("ADICIONAR TAREFA", self.start_cloning, icon=icons.PLAY_ARROW_ROUNDED, width=220)
         self.pause_btn = PrimaryButton("PAUSAR", self.pause_cloning, icon=icons.PAUSE_ROUNDED, width=150)
         self.pause_btn.visible = False
         self.cancel_btn = PrimaryButton("CANCELAR", self.cancel_cloning, icon=icons.STOP_ROUNDED, width=150)
         self.cancel_btn.visible = False
+        self.retry_btn = PrimaryButton("REPROCESSAR FALHAS", self.retry_failed, icon=icons.REPLAY_ROUNDED, width=220)
+
+        self.mirror_switch = ft.Switch(
+            label="Manter espelhado (copiar novas mensagens continuamente)",
+            value=False,
+            active_color=PRIMARY_ACCENT,
+            label_style=ft.TextStyle(color=SECONDARY_TEXT, size=13),
+        )
+
+        self.dedup_switch = ft.Switch(
+            label="Pular duplicadas",
+            value=False,
+            active_color=PRIMARY_ACCENT,
+            label_style=ft.TextStyle(color=SECONDARY_TEXT, size=13),
+        )
+
+        self.priority_dd = ft.Dropdown(
+            label="Prioridade",
+            width=150,
+            value="Normal",
+            options=[ft.dropdown.Option(key=name, text=name) for name in PRIORITIES],
+            bgcolor=SURFACE_COLOR,
+            color=WHITE,
+            border_radius=10,
+            border_color=PRIMARY_ACCENT,
+        )
 
         self.clone_actions_row = ft.Row([
             self.start_btn,
+            self.retry_btn,
             self.pause_btn,
             self.cancel_btn,
         ], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
@@ -224,7 +394,7 @@ class DarkoGramApp:
                     ft.Row([
                         StatsCard("Status", "Conectado", icons.WIFI_ROUNDED, colors.GREEN_400),
                         self.channels_stat,
-                        StatsCard("Tarefas", "0", icons.TASK_ROUNDED, colors.ORANGE_400),
+                        self.tasks_stat,
                     ], spacing=15),
 
                     ft.Container(height=20),
@@ -244,7 +414,11 @@ class DarkoGramApp:
                                 alignment=ft.MainAxisAlignment.CENTER,
                                 spacing=15,
                             ),
-                            ft.Container(height=15),
+                            ft.Container(height=5),
+                            self.dest_chips,
+                            ft.Container(height=10),
+                            ft.Row([self.mirror_switch, self.dedup_switch, self.priority_dd], alignment=ft.MainAxisAlignment.CENTER, spacing=20),
+                            ft.Container(height=10),
                             self.clone_actions_row,
                         ]),
                         padding=25,
@@ -254,7 +428,17 @@ class DarkoGramApp:
 
                     ft.Container(height=20),
 
-                    ft.Text("Feed de Atividades", size=16, weight=ft.FontWeight.BOLD, color=WHITE),
+                    ft.Row([
+                        ft.Text("Feed de Atividades", size=16, weight=ft.FontWeight.BOLD, color=WHITE),
+                        ft.Container(expand=True),
+                        self.log_search,
+                        ft.IconButton(
+                            icon=icons.DOWNLOAD_ROUNDED,
+                            icon_color=SECONDARY_TEXT,
+                            tooltip="Exportar log completo",
+                            on_click=self.export_log,
+                        ),
+                    ]),
                     ft.Container(height=5),
                     self.progress_bar,
                     self.progress_text,
@@ -285,7 +469,28 @@ class DarkoGramApp:
         self.source_channel = e.control.value
 
     def on_dest_change(self, e):
-        self.dest_channel = e.control.value
+        """Cada selecao no dropdown adiciona um destino a lista."""
+        value = e.control.value
+        if value and value not in self.dest_channels:
+            self.dest_channels.append(value)
+            self.refresh_dest_chips()
+
+    def remove_dest(self, value):
+        if value in self.dest_channels:
+            self.dest_channels.remove(value)
+            self.refresh_dest_chips()
+
+    def refresh_dest_chips(self):
+        titles = {str(c["id"]): c["title"] for c in self.channels}
+        self.dest_chips.controls = [
+            ft.Chip(
+                label=ft.Text(titles.get(value, value), color=WHITE, size=12),
+                bgcolor=BG_COLOR,
+                on_delete=lambda e, value=value: self.remove_dest(value),
+            )
+            for value in self.dest_channels
+        ]
+        self.page.update()
 
     def show_error(self, mensagem):
         self.page.snack_bar = ft.SnackBar(
@@ -304,73 +509,173 @@ class DarkoGramApp:
         self.page.update()
 
     async def log(self, mensagem, nivel="info"):
-        self.log_view.controls.append(LogItem(mensagem, nivel))
+        # Tudo vai para o arquivo; os controles so sao montados no proximo quadro
+        self.activity.append(mensagem, nivel)
+        if self.log_search_active:
+            return
+        self._pending_log.append((mensagem, nivel))
+        self.renderer.mark_dirty()
+
+    def _render_pending_log(self):
+        """Quadro: transforma as entradas pendentes em controles, mantendo a janela visivel."""
+        if not self._pending_log:
+            return
+        self.log_view.controls.extend(LogItem(m, n) for m, n in self._pending_log)
+        self._pending_log.clear()
+        excess = len(self.log_view.controls) - VISIBLE_LOG_ITEMS
+        if excess > 0:
+            del self.log_view.controls[:excess]
+
+    def render_recent_log(self):
+        """Redesenha o feed com as entradas mais recentes do buffer."""
+        recent = list(self.activity.entries)[-VISIBLE_LOG_ITEMS:]
+        self.log_view.controls = [LogItem(m, n) for m, n in recent]
+
+    async def _flush_activity_loop(self):
+        """Grava o buffer do log de atividades periodicamente, sem esperar busca/exportacao."""
+        while self.renderer.running:
+            await asyncio.sleep(ACTIVITY_FLUSH_INTERVAL)
+            try:
+                self.activity.flush()
+            except Exception as e:
+                logger.error(f"Erro ao gravar log de atividades: {e}")
+
+    def on_page_close(self, e):
+        """Janela/sessao fechada: para os quadros e fecha o arquivo do log."""
+        self.renderer.stop()
+        try:
+            self.activity.close()
+        except Exception as ex:
+            logger.error(f"Erro ao fechar log de atividades: {ex}")
+
+    async def search_log(self, e):
+        termo = (self.log_search.value or "").strip()
+        if not termo:
+            # Busca vazia volta ao feed ao vivo
+            self.log_search_active = False
+            self.render_recent_log()
+        else:
+            self.log_search_active = True
+            # O arquivo nunca e rotacionado: a leitura vai para uma thread
+            matches = await asyncio.to_thread(self.activity.search, termo, VISIBLE_LOG_ITEMS)
+            self.log_view.controls = [LogItem(line, "info") for line in matches] or [
+                LogItem(f"Nada encontrado para '{termo}'", "warning")
+            ]
         self.page.update()
 
-    async def update_progress(self, current, total):
+    async def export_log(self, e):
+        try:
+            path = await asyncio.to_thread(self.activity.export)
+            self.show_success(f"Log exportado para {path}")
+        except Exception as ex:
+            self.show_error(f"Erro ao exportar log: {str(ex)}")
+
+    async def update_progress(self, current, total, key=None):
+        # So guarda o estado; o texto e a barra sao montados no proximo quadro
+        self.dest_progress[key] = (current, total)
+        self.renderer.mark_dirty()
+
+    def _render_progress(self):
+        """Quadro: com varias tarefas/destinos, a barra mostra a soma do progresso de todos."""
+        if not self.dest_progress or not hasattr(self, "progress_bar"):
+            return
+        current = sum(c for c, _ in self.dest_progress.values())
+        total = sum(t for _, t in self.dest_progress.values())
         progress = current / total if total > 0 else 0
         percent = int(progress * 100)
         self.progress_bar.value = progress
-        self.progress_text.value = f"Clonando: {current}/{total} mensagens ({percent}%)"
-        self.page.update()
+        prefix = f"Clonando ({len(self.dest_progress)} destinos)" if len(self.dest_progress) > 1 else "Clonando"
+        self.progress_text.value = f"{prefix}: {current}/{total} mensagens ({percent}%)"
 
     async def start_cloning(self, e):
-        if not self.source_channel or not self.dest_channel:
+        from src.core.scheduler import PRIORITIES
+
+        if not self.source_channel or not self.dest_channels:
             self.show_error("Selecione o canal de origem e o de destino")
             return
 
-        if self.source_channel == self.dest_channel:
+        if self.source_channel in self.dest_channels:
             self.show_error("Origem e destino nao podem ser iguais!")
             return
 
-        self.progress_bar.value = 0
-        self.progress_text.value = "Iniciando..."
-        self.log_view.controls.clear()
+        if self.mirror_switch.value and len(self.dest_channels) > 1:
+            self.show_error("O espelhamento continuo aceita apenas um destino")
+            return
 
-        # Mostrar botoes de pausa/cancelar
-        self.start_btn.visible = False
-        self.pause_btn.visible = True
-        self.cancel_btn.visible = True
-        self.page.update()
+        self._ensure_scheduler()
 
-        self._ensure_cloner()
-        await self.log("Inicializando processo de clonagem...", "info")
+        # Primeira tarefa de uma rodada limpa o feed e o progresso
+        if self.scheduler.active_count == 0:
+            self.progress_bar.value = 0
+            self.progress_text.value = "Iniciando..."
+            self.log_view.controls.clear()
+            self.activity.clear()
+            self._pending_log.clear()
+            self.dest_progress = {}
+            self.paused = False
 
-        await self.cloner.clone_chat(
+        task = self.scheduler.submit(
             int(self.source_channel),
-            int(self.dest_channel),
-            progress_callback=self.update_progress,
-            log_callback=self.log,
+            [int(d) for d in self.dest_channels],
+            priority=PRIORITIES[self.priority_dd.value or "Normal"],
+            mirror=bool(self.mirror_switch.value),
+            deduplicate=bool(self.dedup_switch.value),
         )
+        await self.log(f"Tarefa #{task.id} adicionada a fila (prioridade {self.priority_dd.value or 'Normal'})", "info")
 
-        # Restaurar botoes
-        self.start_btn.visible = True
-        self.pause_btn.visible = False
-        self.cancel_btn.visible = False
-        self.pause_btn.content.controls[-1].value = "PAUSAR"
-        self.page.update()
+    async def retry_failed(self, e):
+        """Tarefa que so reprocessa a fila de falhas da origem/destinos selecionados."""
+        if not self.source_channel or not self.dest_channels:
+            self.show_error("Selecione o canal de origem e o de destino")
+            return
+
+        self._ensure_scheduler()
+        origin = int(self.source_channel)
+        destinations = [int(d) for d in self.dest_channels]
+        pending = sum(self.scheduler.journal.failure_count(origin, d) for d in destinations)
+        if pending == 0:
+            self.show_success("Nenhuma mensagem na fila de falhas")
+            return
+
+        task = self.scheduler.submit(origin, destinations, retry=True)
+        await self.log(f"Tarefa #{task.id}: reprocessando {pending} falhas", "info")
+
+    def on_tasks_change(self):
+        """Atualiza o card de tarefas e os botoes conforme a fila do agendador."""
+        active = self.scheduler.active_count
+        self.tasks_stat.content.controls[1].controls[0].value = str(active)
+
+        # Pausar/cancelar so fazem sentido com tarefas ativas
+        self.pause_btn.visible = active > 0
+        self.cancel_btn.visible = active > 0
+        if active == 0:
+            self.paused = False
+            self.pause_btn.content.controls[-1].value = "PAUSAR"
+        self.renderer.mark_dirty()
 
     async def pause_cloning(self, e):
-        if not self.cloner or not self.cloner.is_running:
+        if not self.scheduler or self.scheduler.running_count == 0:
             return
-        if self.cloner.pause_requested:
-            self.cloner.resume()
+        if self.paused:
+            self.scheduler.resume_all()
+            self.paused = False
             self.pause_btn.content.controls[-1].value = "PAUSAR"
             self.progress_text.value = "Retomando..."
             await self.log("Clonagem retomada", "info")
         else:
-            self.cloner.pause()
+            self.scheduler.pause_all()
+            self.paused = True
             self.pause_btn.content.controls[-1].value = "RETOMAR"
             self.progress_text.value = "Pausado"
             await self.log("Clonagem pausada", "warning")
         self.page.update()
 
     async def cancel_cloning(self, e):
-        if not self.cloner or not self.cloner.is_running:
+        if not self.scheduler or self.scheduler.active_count == 0:
             return
-        self.cloner.stop()
+        self.scheduler.stop_all()
         self.progress_text.value = "Cancelando..."
-        await self.log("Cancelando clonagem...", "warning")
+        await self.log("Cancelando todas as tarefas...", "warning")
         self.page.update()
 
     # ========================
@@ -499,6 +804,8 @@ class DarkoGramApp:
             self.page.update()
 
             try:
+                from pyrogram.types import TermsOfService
+
                 result = await self.client.app.sign_in(
                     phone_number=self.phone_number,
                     phone_code_hash=self.phone_code_hash,
@@ -506,7 +813,7 @@ class DarkoGramApp:
                 )
 
                 # sign_in pode retornar User ou TermsOfService
-                if isinstance(result, pyrogram_types.TermsOfService):
+                if isinstance(result, TermsOfService):
                     logger.info("Termos de servico recebidos, aceitando automaticamente...")
                     await self.client.app.accept_terms_of_service(result.id)
 
@@ -517,13 +824,14 @@ class DarkoGramApp:
                 logger.info(f"Login realizado com sucesso como {me.first_name}")
 
                 self.show_success("Login realizado com sucesso!")
-                self._ensure_cloner()
+                self._ensure_scheduler()
                 try:
                     self.show_dashboard(me)
                 except Exception as dash_err:
                     logger.error(f"Erro ao exibir dashboard: {traceback.format_exc()}")
                     self.show_error(f"Erro ao exibir dashboard: {str(dash_err)}")
-                await self.load_channels_background()
+                await self.start_session_pool()
+                await self.load_channels_background(me)
 
             except Exception as ex:
                 error_msg = str(ex)
@@ -557,13 +865,14 @@ class DarkoGramApp:
                 logger.info(f"Login 2FA realizado com sucesso como {me.first_name}")
 
                 self.show_success("Login realizado com sucesso!")
-                self._ensure_cloner()
+                self._ensure_scheduler()
                 try:
                     self.show_dashboard(me)
                 except Exception as dash_err:
                     logger.error(f"Erro ao exibir dashboard: {traceback.format_exc()}")
                     self.show_error(f"Erro ao exibir dashboard: {str(dash_err)}")
-                await self.load_channels_background()
+                await self.start_session_pool()
+                await self.load_channels_background(me)
 
             except Exception as ex:
                 logger.error(f"Erro no 2FA: {traceback.format_exc()}")
@@ -0,0 +1,53 @@
+import asyncio
+import flet as ft
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class RenderScheduler:
+    """
+    Agrupa as atualizacoes da tela em quadros. Callbacks de progresso, log e
+    estatisticas so marcam a tela como suja; uma tarefa em background chama
+    page.update() no maximo `fps` vezes por segundo, tirando a serializacao
+    da UI do caminho critico da clonagem.
+    """
+
+    def __init__(self, page: ft.Page, fps=10):
+        self.page = page
+        self.fps = fps
+        self.dirty = False
+        self.running = False
+        self._before_frame = []
+
+    def on_frame(self, callback):
+        """Registra callback(): executado antes de cada quadro sujo (ex: montar controles pendentes)."""
+        self._before_frame.append(callback)
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            self.page.run_task(self._loop)
+
+    def stop(self):
+        self.running = False
+
+    def flush(self):
+        """Desenha o quadro agora, se houver mudancas."""
+        if not self.dirty:
+            return
+        self.dirty = False
+        for callback in self._before_frame:
+            callback()
+        self.page.update()
+
+    async def _loop(self):
+        while self.running:
+            await asyncio.sleep(1 / self.fps)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Erro ao desenhar quadro: {e}")
@@ -0,0 +1,69 @@
+import os
+import shutil
+import time
+from collections import deque
+
+ACTIVITY_LOG_FILE = "darkogram_activity.log"
+
+
+class ActivityLog:
+    """
+    Feed de atividades com memoria limitada: so as ultimas `capacity`
+    entradas ficam em memoria (ring buffer); todas vao para um arquivo de
+    log que pode ser pesquisado ou exportado depois. search/export leem o
+    arquivo inteiro: na interface, rodam numa thread (asyncio.to_thread).
+    """
+
+    def __init__(self, path=ACTIVITY_LOG_FILE, capacity=200):
+        self.path = path
+        self.entries = deque(maxlen=capacity)
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8", buffering=64 * 1024)
+        return self._file
+
+    def append(self, mensagem, nivel="info"):
+        """Adiciona uma entrada. Retorna a entrada descartada do buffer, ou None."""
+        dropped = self.entries[0] if len(self.entries) == self.entries.maxlen else None
+        self.entries.append((mensagem, nivel))
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._open().write(f"{stamp} [{nivel.upper()}] {mensagem}\n")
+        return dropped
+
+    def clear(self):
+        """Limpa o que esta em memoria; o arquivo continua com o historico."""
+        self.entries.clear()
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def search(self, termo, limit=100):
+        """Ultimas `limit` linhas do arquivo que contem o termo (sem diferenciar maiusculas)."""
+        self.flush()
+        if not os.path.exists(self.path):
+            return []
+        termo = termo.lower()
+        matches = deque(maxlen=limit)
+        with open(self.path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if termo in line.lower():
+                    matches.append(line.rstrip("\n"))
+        return list(matches)
+
+    def export(self, destino=None):
+        """Copia o arquivo de log completo. Retorna o caminho gerado."""
+        self.flush()
+        destino = destino or time.strftime("darkogram_log_%Y%m%d_%H%M%S.txt")
+        if os.path.exists(self.path):
+            shutil.copyfile(self.path, destino)
+        else:
+            open(destino, "w").close()
+        return destino
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
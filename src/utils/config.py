@@ -12,13 +12,26 @@ API_ID = os.getenv("API_ID")
 API_HASH = os.getenv("API_HASH")
 BOT_TOKEN = os.getenv("BOT_TOKEN")  # Opcional
 
-# Validação
-if not API_ID or not API_HASH:
-    raise ValueError(
-        "❌ API_ID e API_HASH são obrigatórios!\n"
-        "   1. Acesse https://my.telegram.org\n"
-        "   2. Crie uma aplicação\n"
-        "   3. Copie o .env.example para .env e preencha os valores"
-    )
+# Sessoes extras (ja autenticadas) usadas para dividir os envios, separadas por virgula
+EXTRA_SESSIONS = [s.strip() for s in os.getenv("EXTRA_SESSIONS", "").split(",") if s.strip()]
 
-API_ID = int(API_ID)
+# Metricas da clonagem em http://127.0.0.1:<porta>/metrics (0 desliga)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464") or 0)
+# Intervalo (segundos) dos snapshots JSON em darkogram_metrics.jsonl
+METRICS_SNAPSHOT_INTERVAL = float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "30") or 30)
+
+API_ID = int(API_ID) if API_ID and API_ID.isdigit() else None
+
+
+def require_credentials():
+    """
+    Validação das credenciais. Chamada por quem vai conectar, e não no import,
+    para que módulos sem rede (CLI --help, ferramentas) carreguem sem o .env.
+    """
+    if not API_ID or not API_HASH:
+        raise ValueError(
+            "❌ API_ID e API_HASH são obrigatórios!\n"
+            "   1. Acesse https://my.telegram.org\n"
+            "   2. Crie uma aplicação\n"
+            "   3. Copie o .env.example para .env e preencha os valores"
+        )
@@ -0,0 +1,35 @@
+import time
+from src.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class StartupTimer:
+    """
+    Marca as fases da abertura do app e registra no log quanto cada uma
+    custou, para ver para onde vai o tempo de cold start.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks = []
+        self.reported = False
+
+    def mark(self, fase):
+        self.marks.append((fase, time.perf_counter()))
+
+    def report(self):
+        """Escreve o relatorio uma unica vez (na primeira tela util)."""
+        if self.reported:
+            return
+        self.reported = True
+        previous = self.started
+        lines = []
+        for fase, at in self.marks:
+            lines.append(f"  {fase}: +{(at - previous) * 1000:.0f} ms ({(at - self.started) * 1000:.0f} ms)")
+            previous = at
+        logger.info("Tempo de abertura:\n" + "\n".join(lines))
+
+
+# Criado no primeiro import (main.py importa antes de tudo) para medir desde o inicio
+startup_timer = StartupTimer()
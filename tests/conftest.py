@@ -0,0 +1,32 @@
+import os
+import pytest
+from bench.run_benchmarks import UNLIMITED_RATE
+from src.core.cloner import Cloner
+from src.core.dedup import DedupIndex
+from src.core.journal import CloneJournal
+from src.core.media_cache import MediaCache
+from src.core.ratelimit import RateLimiter
+
+
+@pytest.fixture
+def make_cloner(tmp_path):
+    """Cloner contra o FakeTelegram com diario, indice e cache em tmp_path."""
+    created = []
+
+    def make(client, journal=None, **kwargs):
+        cloner = Cloner(
+            client,
+            rate_limiter=RateLimiter(text_rate=UNLIMITED_RATE, media_rate=UNLIMITED_RATE),
+            journal=journal or CloneJournal(os.path.join(tmp_path, "journal.db")),
+            dedup_index=DedupIndex(os.path.join(tmp_path, "dedup.db")),
+            media_cache=MediaCache(os.path.join(tmp_path, "media_cache")),
+            **kwargs,
+        )
+        created.append(cloner)
+        return cloner
+
+    yield make
+    for cloner in created:
+        cloner.journal.close()
+        cloner.dedup_index.close()
+        cloner.media_cache.close()
@@ -0,0 +1,16 @@
+import asyncio
+import functools
+
+
+def async_test(func):
+    """Roda o teste async num loop proprio (o Client do Pyrogram precisa de um loop ao ser criado)."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(func(*args, **kwargs))
+
+    return wrapper
+
+
+def source_ids(channel):
+    """Ids de origem das mensagens recebidas pelo canal, na ordem de chegada."""
+    return [int(text.split()[1]) for text, *_ in channel.received]
@@ -0,0 +1,155 @@
+import os
+import time
+from pyrogram.errors import MediaInvalid, MessageIdInvalid
+import src.core.cloner as cloner_module
+from bench.fake_telegram import FakeTelegram
+from src.core.filters import CloneFilter
+from src.core.journal import CloneJournal
+from src.core.pool import SessionPool
+from src.core.ratelimit import SendBudget
+from tests.support import async_test, source_ids
+
+
+@async_test
+async def test_batch_bisects_to_bad_message_and_keeps_order(make_cloner):
+    fake = FakeTelegram()
+    origin = fake.add_channel("origem", size=100, media_ratio=0.0)
+    dest = fake.add_channel("destino")
+    # Recusada so no lote: a copia individual funciona
+    origin.forward_errors = {37: MediaInvalid}
+    cloner = make_cloner(fake)
+
+    await cloner.clone_chat(origin.chat_id, dest.chat_id)
+
+    assert cloner.result["copied"] == 100
+    assert cloner.result["failed"] == 0
+    # A mensagem isolada sai pelo fallback na mesma posicao
+    assert source_ids(dest) == list(range(1, 101))
+    assert fake.calls["SendMessage"] == 1
+    # Divisao ao meio: 1 lote inteiro + 2 chamadas por nivel ate isolar (100 -> 1 em 7 niveis)
+    assert fake.calls["ForwardMessages"] <= 1 + 2 * 7
+
+
+@async_test
+async def test_resume_after_restart(make_cloner, tmp_path):
+    fake = FakeTelegram()
+    origin = fake.add_channel("origem", size=500, media_ratio=0.0)
+    dest = fake.add_channel("destino")
+    journal_path = os.path.join(tmp_path, "journal.db")
+    cloner = make_cloner(fake, journal=CloneJournal(journal_path))
+
+    async def progress(current, total):
+        if current >= 200:
+            cloner.stop()
+
+    await cloner.clone_chat(origin.chat_id, dest.chat_id, progress_callback=progress)
+    assert cloner.result["cancelled"]
+    interrupted = len(dest.received)
+    assert 200 <= interrupted < 500
+    cloner.journal.close()
+
+    # Processo novo: so o diario em disco sabe onde parou
+    restarted = make_cloner(fake, journal=CloneJournal(journal_path))
+    await restarted.clone_chat(origin.chat_id, dest.chat_id)
+
+    assert restarted.result["copied"] == 500 - interrupted
+    assert source_ids(dest) == list(range(1, 501))
+
+
+@async_test
+async def test_failed_message_is_dead_lettered_and_retried(make_cloner, monkeypatch):
+    fake = FakeTelegram()
+    # Sem esperar o backoff da repescagem automatica
+    monkeypatch.setattr(cloner_module, "RETRY_MAX_WAIT", 0.0)
+    origin = fake.add_channel("origem", size=50, media_ratio=0.0)
+    dest = fake.add_channel("destino")
+    origin.forward_errors = {20: MessageIdInvalid}
+    cloner = make_cloner(fake)
+
+    await cloner.clone_chat(origin.chat_id, dest.chat_id)
+
+    assert cloner.result["copied"] == 49
+    assert cloner.result["failed"] == 1
+    assert cloner.journal.failed_ids(origin.chat_id, dest.chat_id) == {20}
+    assert 20 not in source_ids(dest)
+
+    origin.forward_errors = {}
+    await cloner.retry_failed(origin.chat_id, dest.chat_id)
+
+    assert cloner.result["copied"] == 1
+    assert cloner.journal.failure_count(origin.chat_id, dest.chat_id) == 0
+    assert sorted(source_ids(dest)) == list(range(1, 51))
+
+
+@async_test
+async def test_pool_fails_batch_over_to_next_session(make_cloner, monkeypatch):
+    monkeypatch.setattr(cloner_module, "RETRY_MAX_WAIT", 0.0)
+    fake = FakeTelegram(flood_every=3, flood_seconds=1)
+    origin = fake.add_channel("origem", size=600, media_ratio=0.0)
+    dest = fake.add_channel("destino")
+    pool = SessionPool()
+    pool.add("a", fake)
+    pool.add("b", fake)
+    cloner = make_cloner(fake, pool=pool)
+    budget = SendBudget(rate=cloner.rate_limiter.text_rate)
+    cloner.rate_limiter.budget = budget
+    cloner.rate_limiter.budget_key = 1
+    cloner.rate_limiter.weight = 4
+
+    await cloner.clone_chat(origin.chat_id, dest.chat_id)
+
+    assert cloner.result["copied"] == 600
+    assert cloner.result["failed"] == 0
+    assert cloner.journal.failure_count(origin.chat_id, dest.chat_id) == 0
+    assert source_ids(dest) == list(range(1, 601))
+    # O FloodWait do lote marcou a sessao no pool
+    assert any(m.blocked_until for m in pool.members)
+    # Envios pelo pool seguem a chave, o peso e as taxas do job, no orcamento de cada sessao
+    for sender in cloner.sender_jobs.values():
+        assert sender.rate_limiter.budget is sender.member.budget
+        assert sender.rate_limiter.budget_key == 1
+        assert sender.rate_limiter.weight == 4
+        assert sender.rate_limiter.text_rate == cloner.rate_limiter.text_rate
+
+
+@async_test
+async def test_pool_sessions_add_send_throughput(make_cloner, tmp_path):
+    async def clone_with(sessions):
+        fake = FakeTelegram()
+        origin = fake.add_channel("origem", size=40, media_ratio=0.0)
+        dest = fake.add_channel("destino")
+        pool = SessionPool()
+        for i in range(sessions):
+            pool.add(f"s{i}", fake, SendBudget(rate=20))
+        journal = CloneJournal(os.path.join(tmp_path, f"journal_{sessions}.db"))
+        cloner = make_cloner(fake, journal=journal, pool=pool)
+        cloner.use_batch_forward = False
+        cloner.rate_limiter.budget = SendBudget(rate=20)
+        cloner.rate_limiter.budget_key = 1
+        started = time.monotonic()
+        await cloner.clone_chat(origin.chat_id, dest.chat_id)
+        assert cloner.result["copied"] == 40
+        return time.monotonic() - started
+
+    # Cada sessao e uma conta com o proprio orcamento: 4 sessoes enviam bem mais rapido que 1
+    assert await clone_with(4) < await clone_with(1) / 2
+
+
+@async_test
+async def test_filtered_clone_does_not_move_full_resume_point(make_cloner):
+    fake = FakeTelegram()
+    origin = fake.add_channel("origem", size=300, media_ratio=0.0)
+    dest = fake.add_channel("destino")
+    cloner = make_cloner(fake)
+    cloner.filters = CloneFilter(min_id=200, max_id=250)
+
+    await cloner.clone_chat(origin.chat_id, dest.chat_id)
+    assert cloner.result["copied"] == 51
+
+    # Clone completo depois do filtrado: copia o resto, sem repetir 200-250
+    cloner.filters = None
+    await cloner.clone_chat(origin.chat_id, dest.chat_id)
+
+    assert cloner.result["copied"] == 249
+    assert sorted(source_ids(dest)) == list(range(1, 301))
+    assert len(dest.received) == 300
@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+from bench.fake_telegram import FakeTelegram
+from src.core.fanout import FanOutFeed, feed_pages
+from tests.support import async_test, source_ids
+
+
+class PageReader:
+    """Leitor de historico em memoria; conta as paginas entregues."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.min_id = 0
+        self.read = 0
+
+    async def prefetch(self, depth=4):
+        for page in self.pages:
+            self.read += 1
+            yield page
+
+
+def make_pages(count, size=10):
+    return [[SimpleNamespace(id=p * size + i + 1) for i in range(size)] for p in range(count)]
+
+
+@async_test
+async def test_clone_to_many_reads_source_once(make_cloner):
+    # Com latencia, ler uma pagina e bem mais rapido que enviar as 100 mensagens dela
+    fake = FakeTelegram(latency=0.0005)
+    origin = fake.add_channel("origem", size=1000, media_ratio=0.3)
+    dests = [fake.add_channel(f"destino_{i}") for i in range(3)]
+    cloner = make_cloner(fake)
+    cloner.use_batch_forward = False
+
+    await cloner.clone_to_many(origin.chat_id, [d.chat_id for d in dests])
+
+    assert cloner.result["copied"] == 3000
+    for dest in dests:
+        assert source_ids(dest) == list(range(1, 1001))
+    # 10 paginas de 100 + a pagina vazia que encerra a leitura
+    assert fake.calls["GetHistory"] <= 11
+
+
+@async_test
+async def test_reader_waits_for_destinations_at_same_pace():
+    reader = PageReader(make_pages(30))
+    feeds = [FanOutFeed(max_lag=2) for _ in range(3)]
+    backlog = []
+
+    async def consume(feed):
+        pages = []
+        async for page in feed.pages(PageReader([])):
+            # Backpressure: a leitura nunca passa muito da frente do destino
+            backlog.append(reader.read - feed.consumed)
+            await asyncio.sleep(0.001)
+            pages.append(page)
+        return pages
+
+    consumers = [asyncio.create_task(consume(feed)) for feed in feeds]
+    await feed_pages(reader, feeds)
+    results = await asyncio.gather(*consumers)
+
+    assert not any(feed.detached for feed in feeds)
+    assert all(pages == reader.pages for pages in results)
+    assert reader.read == 30
+    assert max(backlog) <= 2 + 2
+
+
+@async_test
+async def test_stalled_destination_is_detached():
+    reader = PageReader(make_pages(20))
+    fast, slow = FanOutFeed(max_lag=2), FanOutFeed(max_lag=2)
+    stalled = asyncio.Event()
+
+    async def consume_all(feed):
+        return [page async for page in feed.pages(PageReader([]))]
+
+    async def consume_one(feed):
+        async for _ in feed.pages(PageReader([])):
+            await stalled.wait()
+
+    fast_task = asyncio.create_task(consume_all(fast))
+    slow_task = asyncio.create_task(consume_one(slow))
+    await asyncio.wait_for(feed_pages(reader, [fast, slow]), timeout=5)
+    slow_task.cancel()
+    pages = await fast_task
+
+    assert slow.detached
+    assert not fast.detached
+    assert pages == reader.pages
+
+
+@async_test
+async def test_destination_in_long_flood_wait_is_detached():
+    reader = PageReader(make_pages(20))
+    feed = FanOutFeed(max_lag=2, blocked_for=lambda: 60.0)
+
+    feed.started.set()  # Comecou a consumir e travou no FloodWait
+    await asyncio.wait_for(feed_pages(reader, [feed]), timeout=5)
+
+    assert feed.detached
+    # A leitura parou ao encher a fila, sem drenar a origem
+    assert reader.read < 20
@@ -0,0 +1,100 @@
+from datetime import datetime
+from types import SimpleNamespace
+import pytest
+from bench.fake_telegram import BASE_DATE, DATE_STEP, FakeTelegram
+from src.core.filters import CloneFilter
+from src.core.history import HistoryReader
+from tests.support import async_test, source_ids
+
+
+def message(msg_id=1, text=None, caption=None, date=None, **media):
+    fields = dict.fromkeys(
+        ("photo", "video", "document", "audio", "voice", "video_note", "animation", "sticker")
+    )
+    fields.update(media)
+    return SimpleNamespace(id=msg_id, text=text, caption=caption, date=date, **fields)
+
+
+def test_id_range_goes_to_history_bounds():
+    query, residual = CloneFilter(min_id=101, max_id=250).plan()
+
+    # Limites exclusivos, como no GetHistory
+    assert (query.min_id, query.max_id) == (100, 251)
+    assert not query.uses_search
+    assert residual is None
+
+
+def test_single_media_type_goes_to_search():
+    query, residual = CloneFilter(media_types={"video"}).plan()
+
+    assert query.filter == "InputMessagesFilterVideo"
+    assert query.uses_search
+    assert residual is None
+
+
+def test_type_set_without_server_filter_stays_on_client():
+    query, residual = CloneFilter(media_types={"photo", "text"}).plan()
+
+    assert query.filter is None
+    assert not query.uses_search
+    assert residual(message(text="oi"))
+    assert residual(message(photo=object()))
+    assert not residual(message(video=object()))
+
+
+def test_keyword_and_dates_go_to_search_regex_stays_on_client():
+    date_from, date_to = datetime(2024, 1, 1), datetime(2024, 1, 31)
+    query, residual = CloneFilter(date_from=date_from, date_to=date_to, keyword="promo", regex=r"\d{3}").plan()
+
+    assert query.q == "promo"
+    assert (query.min_date, query.max_date) == (int(date_from.timestamp()), int(date_to.timestamp()))
+    # So a regex sobra para o cliente (a palavra-chave ja veio filtrada)
+    assert residual(message(text="sem palavra, codigo 123"))
+    assert not residual(message(text="promo sem numero"))
+
+
+def test_compile_checks_everything():
+    matches = CloneFilter(min_id=10, media_types={"video"}, keyword="promo").compile()
+
+    assert matches(message(10, caption="Promo", video=object()))
+    assert not matches(message(9, caption="promo", video=object()))
+    assert not matches(message(10, caption="promo", photo=object()))
+    assert not matches(message(10, caption="outra", video=object()))
+
+
+def test_invalid_filters_fail_on_construction():
+    with pytest.raises(ValueError):
+        CloneFilter(media_types={"foto"})
+    with pytest.raises(ValueError):
+        CloneFilter(regex="(")
+
+
+@async_test
+async def test_filtered_clone_only_fetches_matching_messages(make_cloner):
+    fake = FakeTelegram()
+    origin = fake.add_channel("origem", size=1000, media_ratio=0.4)
+    dest = fake.add_channel("destino")
+    cloner = make_cloner(fake)
+    cloner.filters = CloneFilter(
+        media_types={"video"},
+        date_from=datetime.fromtimestamp(BASE_DATE + 101 * DATE_STEP),
+    )
+    expected = [i for i in range(101, 1001) if origin.kind_of(i) == "video"]
+
+    await cloner.clone_chat(origin.chat_id, dest.chat_id)
+
+    assert source_ids(dest) == expected
+    assert fake.calls["GetHistory"] == 0
+    assert fake.calls["Search"] > 0
+
+
+@async_test
+async def test_history_count_respects_id_bounds():
+    fake = FakeTelegram()
+    origin = fake.add_channel("origem", size=400)
+
+    async def count(clone_filter):
+        return await HistoryReader(fake, origin.chat_id, query=clone_filter.plan()[0]).count()
+
+    assert await count(CloneFilter(min_id=391)) == 10
+    assert await count(CloneFilter(min_id=101, max_id=200)) == 100